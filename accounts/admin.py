@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import User, University, UserProfile
+from .models import User, University, UserProfile, Skill, Interest
 
 @admin.register(User)
 class CustomUserAdmin(UserAdmin):
@@ -27,6 +27,16 @@ class UserProfileAdmin(admin.ModelAdmin):
     list_filter = ('is_mentor', 'is_looking_for_mentor', 'graduation_year')
     search_fields = ('user__username', 'user__email', 'current_company', 'degree')
 
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug')
+    search_fields = ('name', 'slug')
+
+@admin.register(Interest)
+class InterestAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug')
+    search_fields = ('name', 'slug')
+
 from django.contrib import admin
 
 admin.site.site_header = "gradLINK ADMIN"
@@ -0,0 +1,50 @@
+from django.db import migrations
+
+
+def _parse(raw):
+    tags = {}
+    for part in (raw or '').split(','):
+        name = ' '.join(part.split())[:100]
+        if name:
+            tags.setdefault(name.lower(), name)
+    return tags
+
+
+def _split(apps, text_field, tag_model_name, through_model_name, fk_name):
+    UserProfile = apps.get_model('accounts', 'UserProfile')
+    Tag = apps.get_model('accounts', tag_model_name)
+    Through = apps.get_model('accounts', through_model_name)
+
+    parsed = {
+        profile_id: _parse(raw)
+        for profile_id, raw in UserProfile.objects.exclude(**{text_field: ''}).values_list('id', text_field).iterator()
+    }
+    names = {}
+    for tags in parsed.values():
+        for slug, name in tags.items():
+            names.setdefault(slug, name)
+    Tag.objects.bulk_create([Tag(name=name, slug=slug) for slug, name in names.items()], batch_size=1000, ignore_conflicts=True)
+
+    tag_ids = dict(Tag.objects.values_list('slug', 'id'))
+    Through.objects.bulk_create(
+        [Through(profile_id=profile_id, **{f'{fk_name}_id': tag_ids[slug]})
+         for profile_id, tags in parsed.items() for slug in tags],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+def split_tags(apps, schema_editor):
+    _split(apps, 'skills', 'Skill', 'ProfileSkill', 'skill')
+    _split(apps, 'interests', 'Interest', 'ProfileInterest', 'interest')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_skill_interest_tags'),
+    ]
+
+    operations = [
+        migrations.RunPython(split_tags, migrations.RunPython.noop),
+    ]
@@ -14,6 +14,8 @@ class User(AbstractUser):
     
     user_type = models.CharField(max_length=20, choices=USER_TYPES, default='student')
     profile_picture = models.ImageField(upload_to='profile_pics/', blank=True, null=True)
+    # Resized and WebP copies of profile_picture, written by core.images
+    profile_picture_variants = models.JSONField(default=dict, blank=True, editable=False)
     bio = models.TextField(max_length=500, blank=True)
     phone = models.CharField(max_length=15, blank=True)
     location = models.CharField(max_length=100, blank=True)
@@ -32,6 +34,8 @@ class University(models.Model):
     location = models.CharField(max_length=100)
     website = models.URLField(blank=True)
     logo = models.ImageField(upload_to='university_logos/', blank=True, null=True)
+    # Resized and WebP copies of logo, written by core.images
+    logo_variants = models.JSONField(default=dict, blank=True, editable=False)
     description = models.TextField(blank=True)
     established_year = models.IntegerField(blank=True, null=True)
     created_at = models.DateTimeField(default=timezone.now)
@@ -58,12 +62,66 @@ class UserProfile(models.Model):
     is_mentor = models.BooleanField(default=False)
     is_looking_for_mentor = models.BooleanField(default=False)
     is_open_to_networking = models.BooleanField(default=True)
+    # Normalized copies of skills/interests, kept in sync by accounts.signals
+    skill_tags = models.ManyToManyField('Skill', through='ProfileSkill', blank=True, related_name='profiles')
+    interest_tags = models.ManyToManyField('Interest', through='ProfileInterest', blank=True, related_name='profiles')
 
     def __str__(self):
         return f"{self.user.username}'s Profile"
 
+    # Both helpers read the normalized tags; prefetch 'skill_tags' / 'interest_tags' in list views
     def get_skills_list(self):
-        return [skill.strip() for skill in self.skills.split(',') if skill.strip()]
+        return [skill.name for skill in self.skill_tags.all()]
 
     def get_interests_list(self):
-        return [interest.strip() for interest in self.interests.split(',') if interest.strip()]
+        return [interest.name for interest in self.interest_tags.all()]
+
+class Skill(models.Model):
+    """Normalized skill tag"""
+    name = models.CharField(max_length=100)
+    slug = models.CharField(max_length=100, unique=True, help_text="Lowercased, whitespace-collapsed name")
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+class Interest(models.Model):
+    """Normalized interest tag"""
+    name = models.CharField(max_length=100)
+    slug = models.CharField(max_length=100, unique=True, help_text="Lowercased, whitespace-collapsed name")
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+class ProfileSkill(models.Model):
+    """Through model linking profiles to skills"""
+    profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE)
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE)
+
+    class Meta:
+        unique_together = ('profile', 'skill')
+        indexes = [
+            models.Index(fields=['skill', 'profile'], name='accounts_skill_profile_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.profile.user.username}: {self.skill.name}"
+
+class ProfileInterest(models.Model):
+    """Through model linking profiles to interests"""
+    profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE)
+    interest = models.ForeignKey(Interest, on_delete=models.CASCADE)
+
+    class Meta:
+        unique_together = ('profile', 'interest')
+        indexes = [
+            models.Index(fields=['interest', 'profile'], name='accounts_interest_profile_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.profile.user.username}: {self.interest.name}"
@@ -0,0 +1,8 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from .models import UserProfile
+from .tags import sync_profile_tags
+
+@receiver(post_save, sender=UserProfile)
+def sync_tags_on_save(sender, instance, **kwargs):
+    sync_profile_tags(instance)
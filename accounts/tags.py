@@ -0,0 +1,54 @@
+"""
+Helpers for the normalized skill/interest tags on UserProfile.
+
+Users still edit skills and interests as comma-separated text; these helpers
+split that text into Skill/Interest rows so filtering is an exact, indexed
+join instead of a substring match over every profile.
+"""
+from .models import Skill, Interest, ProfileSkill, ProfileInterest
+
+MAX_TAG_LENGTH = 100
+
+
+def normalize_tag(name):
+    """Lowercase and collapse whitespace so 'Machine  Learning' == 'machine learning'"""
+    return ' '.join(name.split()).lower()[:MAX_TAG_LENGTH]
+
+
+def parse_tags(raw):
+    """Return an ordered {slug: display name} mapping for comma-separated text"""
+    tags = {}
+    for part in (raw or '').split(','):
+        name = ' '.join(part.split())[:MAX_TAG_LENGTH]
+        if name:
+            tags.setdefault(normalize_tag(name), name)
+    return tags
+
+
+def _sync(profile, raw, tag_model, through_model, field):
+    wanted = parse_tags(raw)
+    current = set(
+        through_model.objects.filter(profile=profile).values_list(f'{field}__slug', flat=True)
+    )
+
+    stale = current - wanted.keys()
+    if stale:
+        through_model.objects.filter(profile=profile, **{f'{field}__slug__in': stale}).delete()
+
+    missing = [slug for slug in wanted if slug not in current]
+    if missing:
+        tag_model.objects.bulk_create(
+            [tag_model(name=wanted[slug], slug=slug) for slug in missing],
+            ignore_conflicts=True,
+        )
+        through_model.objects.bulk_create(
+            [through_model(profile=profile, **{field: tag})
+             for tag in tag_model.objects.filter(slug__in=missing)],
+            ignore_conflicts=True,
+        )
+
+
+def sync_profile_tags(profile):
+    """Bring a profile's skill/interest tags in line with its text fields"""
+    _sync(profile, profile.skills, Skill, ProfileSkill, 'skill')
+    _sync(profile, profile.interests, Interest, ProfileInterest, 'interest')
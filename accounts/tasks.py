@@ -0,0 +1,19 @@
+from django.core.mail import send_mail
+from core.taskqueue import task
+from .models import User
+
+WELCOME_SUBJECT = 'Welcome to GRADLINK'
+WELCOME_BODY = (
+    'Hi {name},\n\n'
+    'Your GRADLINK account is ready. Complete your profile so classmates, mentors '
+    'and recruiters can find you, then browse the alumni directory, job board and '
+    'upcoming events.\n'
+)
+
+@task()
+def send_welcome_email(user_id):
+    """Welcome a newly signed-up user by email"""
+    user = User.objects.filter(pk=user_id).exclude(email='').first()
+    if user is None:
+        return
+    send_mail(WELCOME_SUBJECT, WELCOME_BODY.format(name=user.first_name or user.username), None, [user.email])
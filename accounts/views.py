@@ -6,7 +6,9 @@ from django.urls import reverse_lazy
 from django.views.generic import CreateView
 from django.contrib.auth.views import LoginView, LogoutView
 from .forms import SignUpForm, LoginForm, UserProfileForm, UserUpdateForm, DeleteProfileForm
+from alumni.graph import connection_statuses, degrees_of_separation, mutual_counts
 from .models import User, UserProfile
+from .tasks import send_welcome_email
 
 class CustomLoginView(LoginView):
     form_class = LoginForm
@@ -29,6 +31,7 @@ def signup_view(request):
         form = SignUpForm(request.POST)
         if form.is_valid():
             user = form.save()
+            send_welcome_email.enqueue(user.pk, idempotency_key=f'welcome:{user.pk}')
             username = form.cleaned_data.get('username')
             messages.success(request, f'Account created for {username}! You can now log in.')
             return redirect('accounts:login')
@@ -53,6 +56,10 @@ def profile_view(request, username=None):
         'profile': profile,
         'is_own_profile': user == request.user,
     }
+    if request.user.is_authenticated and user != request.user:
+        context['degree'] = degrees_of_separation(request.user, user)
+        context['mutual_count'] = mutual_counts(request.user, [user.pk]).get(user.pk, 0)
+        context['connection_status'] = connection_statuses(request.user, [user.pk]).get(user.pk)
     return render(request, 'accounts/profile.html', context)
 
 @login_required
@@ -83,11 +90,8 @@ def edit_profile_view(request):
 
 @login_required
 def dashboard_view(request):
-    """User dashboard view"""
-    context = {
-        'user': request.user,
-    }
-    return render(request, 'accounts/dashboard.html', context)
+    """Legacy dashboard URL; the dashboard itself is served by core"""
+    return redirect('core:dashboard')
 
 @login_required
 def delete_profile(request):
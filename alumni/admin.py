@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Connection, MentorshipRequest, AlumniDirectory
+from .models import Connection, ConnectionEdge, MentorMatch, MentorshipRequest, AlumniDirectory
 
 @admin.register(Connection)
 class ConnectionAdmin(admin.ModelAdmin):
@@ -8,6 +8,13 @@ class ConnectionAdmin(admin.ModelAdmin):
     search_fields = ('sender__username', 'receiver__username', 'sender__email', 'receiver__email')
     readonly_fields = ('created_at', 'updated_at')
 
+@admin.register(ConnectionEdge)
+class ConnectionEdgeAdmin(admin.ModelAdmin):
+    list_display = ('user', 'neighbor', 'created_at')
+    search_fields = ('user__username', 'neighbor__username')
+    raw_id_fields = ('user', 'neighbor')
+    readonly_fields = ('created_at',)
+
 @admin.register(MentorshipRequest)
 class MentorshipRequestAdmin(admin.ModelAdmin):
     list_display = ('mentee', 'mentor', 'subject', 'status', 'created_at')
@@ -15,6 +22,13 @@ class MentorshipRequestAdmin(admin.ModelAdmin):
     search_fields = ('mentee__username', 'mentor__username', 'subject')
     readonly_fields = ('created_at', 'updated_at')
 
+@admin.register(MentorMatch)
+class MentorMatchAdmin(admin.ModelAdmin):
+    list_display = ('mentee', 'rank', 'mentor', 'score', 'computed_at')
+    search_fields = ('mentee__username', 'mentor__username')
+    raw_id_fields = ('mentee', 'mentor')
+    readonly_fields = ('computed_at',)
+
 @admin.register(AlumniDirectory)
 class AlumniDirectoryAdmin(admin.ModelAdmin):
     list_display = ('user', 'is_public', 'allow_contact', 'featured', 'created_at')
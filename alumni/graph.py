@@ -0,0 +1,189 @@
+"""
+Connection graph queries.
+
+Connection rows are directed (sender -> receiver), so "who is connected to X"
+needs an OR over both columns, which cannot be answered from one index and
+cannot be joined back onto itself for friends-of-friends. Accepted
+connections are therefore mirrored into ConnectionEdge, an undirected edge
+table holding one row per direction: X's neighbours are simply the rows
+where user = X, and every graph question becomes an indexed self-join.
+
+The edges are kept in step by the Connection signals (sync_pair) and can be
+rebuilt from scratch with `manage.py rebuild_connection_graph`.
+"""
+from django.db.models import Count, Q
+from accounts.models import User
+from .models import Connection, ConnectionEdge
+
+SUGGESTION_LIMIT = 10
+
+# Where the viewing user stands with someone, as shown on directory cards
+CONNECTED = 'connected'
+PENDING_SENT = 'pending_sent'
+PENDING_RECEIVED = 'pending_received'
+DECLINED = 'declined'
+
+# Degrees of separation are only searched this far out; past three hops the
+# answer stops being useful and the frontier covers most of the network
+MAX_SEPARATION = 3
+# Give up on a search whose next frontier would hold more users than this
+MAX_FRONTIER = 20000
+FRONTIER_CHUNK = 1000
+
+
+def _between(user_a_id, user_b_id):
+    return Q(sender_id=user_a_id, receiver_id=user_b_id) | Q(sender_id=user_b_id, receiver_id=user_a_id)
+
+
+def sync_pair(user_a_id, user_b_id):
+    """Create or drop the two edges between a pair to match their connection status"""
+    accepted = Connection.objects.filter(_between(user_a_id, user_b_id), status='accepted').order_by('updated_at')
+    since = accepted.values_list('updated_at', flat=True).first()
+    edges = ConnectionEdge.objects.filter(
+        Q(user_id=user_a_id, neighbor_id=user_b_id) | Q(user_id=user_b_id, neighbor_id=user_a_id)
+    )
+    if since is None:
+        edges.delete()
+        return
+    ConnectionEdge.objects.bulk_create([
+        ConnectionEdge(user_id=user_a_id, neighbor_id=user_b_id, created_at=since),
+        ConnectionEdge(user_id=user_b_id, neighbor_id=user_a_id, created_at=since),
+    ], ignore_conflicts=True)
+
+
+def neighbor_ids(user):
+    """Subquery of the ids of everyone `user` is connected to"""
+    return ConnectionEdge.objects.filter(user=user).values('neighbor_id')
+
+
+def connection_edges(user):
+    """Edge rows for `user`, newest first, with the neighbour and profile joined"""
+    return (
+        ConnectionEdge.objects.filter(user=user)
+        .select_related('neighbor__profile')
+        .order_by('-created_at', '-pk')
+    )
+
+
+def connection_statuses(user, user_ids):
+    """
+    {user id: CONNECTED / PENDING_SENT / PENDING_RECEIVED / DECLINED} for every
+    user in `user_ids` that `user` has a connection row with, in one query.
+    A request the other side declined still reads as PENDING_SENT, so the
+    sender is not told; DECLINED means `user` declined it.
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return {}
+    rows = Connection.objects.filter(
+        Q(sender=user, receiver_id__in=user_ids) | Q(receiver=user, sender_id__in=user_ids)
+    ).values_list('sender_id', 'receiver_id', 'status')
+    statuses = {}
+    for sender_id, receiver_id, status in rows:
+        sent = sender_id == user.pk
+        other_id = receiver_id if sent else sender_id
+        if status == 'accepted':
+            statuses[other_id] = CONNECTED
+        elif statuses.get(other_id) != CONNECTED:
+            if sent:
+                statuses[other_id] = PENDING_SENT
+            else:
+                statuses[other_id] = PENDING_RECEIVED if status == 'pending' else DECLINED
+    return statuses
+
+
+def mutual_counts(user, user_ids):
+    """{user id: number of connections shared with `user`} for `user_ids`, in one query"""
+    user_ids = list(user_ids)
+    if not user_ids:
+        return {}
+    rows = (
+        ConnectionEdge.objects.filter(user_id__in=user_ids, neighbor_id__in=neighbor_ids(user))
+        .order_by()
+        .values_list('user_id')
+        .annotate(total=Count('pk'))
+    )
+    return dict(rows)
+
+
+def mutual_connections(user, other):
+    """Users connected to both `user` and `other`"""
+    return (
+        User.objects.filter(pk__in=neighbor_ids(user))
+        .filter(pk__in=neighbor_ids(other))
+        .select_related('profile')
+        .order_by('first_name', 'last_name', 'pk')
+    )
+
+
+def suggestions(user, limit=SUGGESTION_LIMIT):
+    """
+    Second-degree connections ("people you may know"), ranked by how many
+    mutual connections they share with `user`. Anyone `user` already has a
+    connection row with, in any state, is left out. Each returned user
+    carries a `mutual_count` attribute.
+    """
+    mine = neighbor_ids(user)
+    requested = Connection.objects.filter(sender=user).values('receiver_id')
+    received = Connection.objects.filter(receiver=user).values('sender_id')
+    ranked = list(
+        ConnectionEdge.objects.filter(user_id__in=mine)
+        .exclude(neighbor_id=user.pk)
+        .exclude(neighbor_id__in=mine)
+        .exclude(neighbor_id__in=requested)
+        .exclude(neighbor_id__in=received)
+        .order_by()
+        .values('neighbor_id')
+        .annotate(mutual_count=Count('pk'))
+        .order_by('-mutual_count', 'neighbor_id')[:limit]
+    )
+    users = User.objects.filter(is_active=True).select_related('profile').in_bulk(
+        [row['neighbor_id'] for row in ranked]
+    )
+    suggested = []
+    for row in ranked:
+        candidate = users.get(row['neighbor_id'])
+        if candidate is not None:
+            candidate.mutual_count = row['mutual_count']
+            suggested.append(candidate)
+    return suggested
+
+
+def _expand(frontier):
+    """Neighbours of every user in `frontier`, one query per chunk"""
+    found = set()
+    frontier = list(frontier)
+    for start in range(0, len(frontier), FRONTIER_CHUNK):
+        found.update(
+            ConnectionEdge.objects.filter(user_id__in=frontier[start:start + FRONTIER_CHUNK])
+            .values_list('neighbor_id', flat=True)
+        )
+    return found
+
+
+def degrees_of_separation(user, other, max_depth=MAX_SEPARATION):
+    """
+    Length of the shortest connection path between two users: 1 for a direct
+    connection, 2 for a friend of a friend, and so on. None when there is no
+    path within `max_depth` hops or the search outgrows MAX_FRONTIER.
+
+    The search runs breadth-first from both ends and always grows the smaller
+    frontier, so it touches roughly the square root of the users a one-sided
+    search would.
+    """
+    if user.pk == other.pk:
+        return 0
+    near, far = {user.pk}, {other.pk}
+    near_seen, far_seen = {user.pk}, {other.pk}
+    for depth in range(1, max_depth + 1):
+        if len(near) > len(far):
+            near, far = far, near
+            near_seen, far_seen = far_seen, near_seen
+        reached = _expand(near)
+        if reached & far_seen:
+            return depth
+        near = reached - near_seen
+        if not near or len(near) > MAX_FRONTIER:
+            return None
+        near_seen |= near
+    return None
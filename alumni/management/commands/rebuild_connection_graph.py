@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from alumni.models import Connection, ConnectionEdge
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the undirected connection edge table from accepted connections'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many accepted connections are missing their edges',
+        )
+
+    def handle(self, *args, **options):
+        accepted = Connection.objects.filter(status='accepted')
+
+        if options['dry_run']:
+            mirrored = ConnectionEdge.objects.filter(user_id=OuterRef('sender_id'), neighbor_id=OuterRef('receiver_id'))
+            backing = accepted.filter(
+                Q(sender_id=OuterRef('user_id'), receiver_id=OuterRef('neighbor_id'))
+                | Q(sender_id=OuterRef('neighbor_id'), receiver_id=OuterRef('user_id'))
+            )
+            missing = accepted.filter(~Exists(mirrored)).count()
+            stale = ConnectionEdge.objects.filter(~Exists(backing)).count()
+            self.stdout.write(f'{missing} accepted connection(s) lack edges; {stale} edge(s) are stale.')
+            return
+
+        batch_size = options['batch_size']
+        pairs = accepted.values_list('sender_id', 'receiver_id', 'updated_at').order_by('pk')
+        with transaction.atomic():
+            ConnectionEdge.objects.all().delete()
+            pending = []
+            for sender_id, receiver_id, updated_at in pairs.iterator(chunk_size=batch_size):
+                pending.append(ConnectionEdge(user_id=sender_id, neighbor_id=receiver_id, created_at=updated_at))
+                pending.append(ConnectionEdge(user_id=receiver_id, neighbor_id=sender_id, created_at=updated_at))
+                if len(pending) >= batch_size:
+                    ConnectionEdge.objects.bulk_create(pending, ignore_conflicts=True)
+                    pending = []
+            ConnectionEdge.objects.bulk_create(pending, ignore_conflicts=True)
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {ConnectionEdge.objects.count()} connection edge(s).'))
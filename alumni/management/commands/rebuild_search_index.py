@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from accounts.models import User
+from alumni.models import SearchToken
+from alumni.search import build_tokens
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the alumni directory search index from scratch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        users = User.objects.select_related('profile').order_by('pk')
+
+        with transaction.atomic():
+            SearchToken.objects.all().delete()
+            pending = []
+            indexed = 0
+            for user in users.iterator(chunk_size=batch_size):
+                profile = getattr(user, 'profile', None)
+                pending.extend(
+                    SearchToken(user=user, token=token, weight=weight)
+                    for token, weight in build_tokens(user, profile).items()
+                )
+                indexed += 1
+                if len(pending) >= batch_size:
+                    SearchToken.objects.bulk_create(pending)
+                    pending = []
+            SearchToken.objects.bulk_create(pending)
+
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} user(s).'))
@@ -0,0 +1,25 @@
+import time
+from django.core.management.base import BaseCommand
+from alumni.matching import np, process_queue, refresh_matches
+
+
+class Command(BaseCommand):
+    help = (
+        'Refresh the stored mentor recommendations for mentees affected by queued '
+        'profile changes. Run it every few minutes; --full rebuilds every mentee.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Rescore every mentee instead of draining the queue')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        log = self.stdout.write if options['verbosity'] > 1 else None
+        if options['full']:
+            rescored = refresh_matches(log=log)
+        else:
+            rescored = process_queue(log=log)
+        engine = 'NumPy' if np is not None else 'pure Python'
+        self.stdout.write(self.style.SUCCESS(
+            f'Rescored {rescored} mentee(s) in {time.monotonic() - started:.1f}s ({engine}).'
+        ))
@@ -0,0 +1,299 @@
+"""
+Mentor matching.
+
+Mentors (is_mentor) and mentees (is_looking_for_mentor) are turned into
+sparse feature vectors over their skill and interest tags, industry and
+university. Each feature is weighted by its kind (FEATURE_WEIGHTS) and by how
+rare it is among mentors (IDF), and every vector is L2-normalised, so the dot
+product of two vectors is their cosine similarity. A mentor who did not
+graduate before the mentee is scaled down by PEER_PENALTY.
+
+Nothing is scored per request. Each mentee's TOP_K mentors are stored in
+MentorMatch; profile saves only queue the user in PendingMatchRefresh, and
+`manage.py refresh_mentor_matches` drains that queue in batch:
+
+- a changed mentee is rescored against every mentor;
+- a changed mentor is scored against every mentee, and only the mentees whose
+  list it would enter, or already sits in, are rescored.
+
+Scoring walks posting lists (feature -> vectors having it) instead of
+comparing every pair. The scatter-add and top-K selection run on NumPy
+arrays (a pinned dependency); the dict fallback, for development
+environments without it, gives the same results more slowly. IDF
+weights drift as mentors come and go between refreshes; `--full` rebuilds
+every mentee's list from scratch.
+"""
+import heapq
+import math
+from collections import Counter, defaultdict
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+from accounts.models import ProfileInterest, ProfileSkill, UserProfile
+from accounts.tags import normalize_tag
+from .models import MentorMatch, PendingMatchRefresh
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TOP_K = 10
+
+# How much one shared feature of each kind counts, before IDF
+FEATURE_WEIGHTS = {
+    'skill': 3.0,
+    'interest': 1.5,
+    'industry': 2.0,
+    'university': 1.0,
+}
+
+# Multiplier for mentors who graduated the same year as the mentee or later
+PEER_PENALTY = 0.5
+
+# Mentees rescored and written per transaction
+MENTEE_BATCH = 500
+
+
+def mentor_profiles():
+    return UserProfile.objects.filter(is_mentor=True, user__is_active=True)
+
+
+def mentee_profiles():
+    return UserProfile.objects.filter(is_looking_for_mentor=True, user__is_active=True)
+
+
+def load_features(profiles):
+    """{user id: (feature set, graduation year)} for a UserProfile queryset"""
+    by_profile = {}
+    features = {}
+    rows = profiles.values_list('pk', 'user_id', 'industry', 'university_id', 'graduation_year')
+    for profile_id, user_id, industry, university_id, graduation_year in rows.iterator():
+        found = set()
+        if industry.strip():
+            found.add(('industry', normalize_tag(industry)))
+        if university_id:
+            found.add(('university', university_id))
+        by_profile[profile_id] = found
+        features[user_id] = (found, graduation_year)
+
+    tag_links = (
+        ('skill', ProfileSkill.objects.values_list('profile_id', 'skill_id')),
+        ('interest', ProfileInterest.objects.values_list('profile_id', 'interest_id')),
+    )
+    for kind, links in tag_links:
+        for profile_id, tag_id in links.filter(profile__in=profiles.values('pk')).iterator():
+            found = by_profile.get(profile_id)
+            if found is not None:
+                found.add((kind, tag_id))
+    return features
+
+
+def idf_weights(mentor_features):
+    """Inverse document frequency of every feature over the mentor population"""
+    total = len(mentor_features)
+    frequencies = Counter(feature for found, _ in mentor_features.values() for feature in found)
+    return {feature: math.log((total + 1) / (count + 1)) + 1 for feature, count in frequencies.items()}
+
+
+def vectorize(found, idf):
+    """Weighted, L2-normalised sparse vector for a feature set"""
+    unseen = math.log(len(idf) + 1) + 1
+    vector = {feature: FEATURE_WEIGHTS[feature[0]] * idf.get(feature, unseen) for feature in found}
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    return {feature: weight / norm for feature, weight in vector.items()} if norm else {}
+
+
+class MatchIndex:
+    """Posting lists over one side's vectors, for scoring a vector from the other side against all of them"""
+
+    def __init__(self, vectors, years, mentors_indexed):
+        self.user_ids = list(vectors)
+        self.position = {user_id: i for i, user_id in enumerate(self.user_ids)}
+        self.mentors_indexed = mentors_indexed
+        postings = defaultdict(lambda: ([], []))
+        for i, user_id in enumerate(self.user_ids):
+            for feature, weight in vectors[user_id].items():
+                positions, weights = postings[feature]
+                positions.append(i)
+                weights.append(weight)
+        if np is not None:
+            self.postings = {
+                feature: (np.array(positions, dtype=np.int64), np.array(weights))
+                for feature, (positions, weights) in postings.items()
+            }
+            self.years = np.array([years[user_id] if years[user_id] is not None else np.nan
+                                   for user_id in self.user_ids])
+        else:
+            self.postings = dict(postings)
+            self.years = [years[user_id] for user_id in self.user_ids]
+
+    def _is_peer(self, indexed_year, year):
+        # The indexed side is the mentor side or the mentee side; either way the
+        # mentor must have graduated strictly before the mentee
+        return indexed_year >= year if self.mentors_indexed else indexed_year <= year
+
+    def _scores(self, vector, year, exclude):
+        if np is not None:
+            scores = np.zeros(len(self.user_ids))
+            for feature, weight in vector.items():
+                posting = self.postings.get(feature)
+                if posting is not None:
+                    # Positions within one posting list are unique, so += is a true scatter-add
+                    scores[posting[0]] += weight * posting[1]
+            if year is not None:
+                with np.errstate(invalid='ignore'):
+                    scores[self._is_peer(self.years, year)] *= PEER_PENALTY
+            if exclude in self.position:
+                scores[self.position[exclude]] = 0
+            return scores
+
+        scores = defaultdict(float)
+        for feature, weight in vector.items():
+            for position, indexed_weight in zip(*self.postings.get(feature, ((), ()))):
+                scores[position] += weight * indexed_weight
+        if year is not None:
+            for position in scores:
+                indexed_year = self.years[position]
+                if indexed_year is not None and self._is_peer(indexed_year, year):
+                    scores[position] *= PEER_PENALTY
+        scores.pop(self.position.get(exclude), None)
+        return scores
+
+    def score(self, vector, year, exclude=None):
+        """(user id, score) for every indexed vector sharing a feature with `vector`"""
+        scores = self._scores(vector, year, exclude)
+        if np is not None:
+            return [(self.user_ids[i], float(scores[i])) for i in np.flatnonzero(scores > 0)]
+        return [(self.user_ids[i], score) for i, score in scores.items() if score > 0]
+
+    def top(self, vector, year, k=TOP_K, exclude=None):
+        """The k best (user id, score) pairs, best first"""
+        scores = self._scores(vector, year, exclude)
+        if np is not None:
+            candidates = np.flatnonzero(scores > 0)
+            if len(candidates) > k:
+                # Keep everything tied with the k-th score: argpartition would
+                # pick among the ties arbitrarily, the fallback by position
+                kth = np.partition(-scores[candidates], k - 1)[k - 1]
+                candidates = candidates[-scores[candidates] <= kth]
+            ordered = candidates[np.lexsort((candidates, -scores[candidates]))][:k]
+            return [(self.user_ids[i], float(scores[i])) for i in ordered]
+        best = heapq.nsmallest(k, ((-score, i) for i, score in scores.items() if score > 0))
+        return [(self.user_ids[i], -negated) for negated, i in best]
+
+
+def _chunks(ids, size=MENTEE_BATCH):
+    ids = list(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def _store(ranked):
+    now = timezone.now()
+    with transaction.atomic():
+        MentorMatch.objects.filter(mentee_id__in=list(ranked)).delete()
+        MentorMatch.objects.bulk_create([
+            MentorMatch(mentee_id=mentee_id, mentor_id=mentor_id, score=score, rank=rank, computed_at=now)
+            for mentee_id, matches in ranked.items()
+            for rank, (mentor_id, score) in enumerate(matches, start=1)
+        ], batch_size=1000)
+
+
+def _affected_mentees(user_ids, mentors, mentor_vectors, idf):
+    """Mentees whose stored list can change because of the users in `user_ids`"""
+    affected = set()
+    for chunk in _chunks(user_ids):
+        affected.update(mentee_profiles().filter(user_id__in=chunk).values_list('user_id', flat=True))
+        # Changed users who have a list but stopped looking for a mentor
+        affected.update(MentorMatch.objects.filter(mentee_id__in=chunk).values_list('mentee_id', flat=True))
+        # Every list a changed user sits in, which covers mentors who stopped mentoring
+        affected.update(MentorMatch.objects.filter(mentor_id__in=chunk).values_list('mentee_id', flat=True))
+
+    changed_mentors = [user_id for user_id in user_ids if user_id in mentor_vectors]
+    if changed_mentors:
+        mentees = load_features(mentee_profiles())
+        mentee_index = MatchIndex(
+            {user_id: vectorize(found, idf) for user_id, (found, _) in mentees.items()},
+            {user_id: year for user_id, (_, year) in mentees.items()},
+            mentors_indexed=False,
+        )
+        floors = {
+            row['mentee_id']: (row['listed'], row['floor'])
+            for row in MentorMatch.objects.order_by().values('mentee_id').annotate(listed=Count('pk'), floor=Min('score'))
+        }
+        for mentor_id in changed_mentors:
+            year = mentors[mentor_id][1]
+            for mentee_id, score in mentee_index.score(mentor_vectors[mentor_id], year, exclude=mentor_id):
+                listed, floor = floors.get(mentee_id, (0, 0))
+                if listed < TOP_K or score > floor:
+                    affected.add(mentee_id)
+    return affected
+
+
+def refresh_matches(user_ids=None, log=None):
+    """
+    Recompute stored mentor matches and return how many mentees were rescored.
+    With user_ids=None every mentee is rebuilt; otherwise only the mentees
+    affected by changes to those users' profiles.
+    """
+    mentors = load_features(mentor_profiles())
+    idf = idf_weights(mentors)
+    mentor_vectors = {user_id: vectorize(found, idf) for user_id, (found, _) in mentors.items()}
+    mentor_index = MatchIndex(
+        mentor_vectors, {user_id: year for user_id, (_, year) in mentors.items()}, mentors_indexed=True,
+    )
+
+    current_mentees = mentee_profiles().values('user_id')
+    if user_ids is None:
+        MentorMatch.objects.exclude(mentee_id__in=current_mentees).delete()
+        groups = [mentee_profiles()]
+    else:
+        affected = sorted(_affected_mentees(set(user_ids), mentors, mentor_vectors, idf))
+        groups = []
+        for chunk in _chunks(affected):
+            # Users who stopped looking for a mentor keep no list
+            MentorMatch.objects.filter(mentee_id__in=chunk).exclude(mentee_id__in=current_mentees).delete()
+            groups.append(mentee_profiles().filter(user_id__in=chunk))
+
+    rescored = 0
+    for profiles in groups:
+        mentee_features = load_features(profiles)
+        for chunk in _chunks(mentee_features):
+            _store({
+                mentee_id: mentor_index.top(vectorize(mentee_features[mentee_id][0], idf),
+                                            mentee_features[mentee_id][1], exclude=mentee_id)
+                for mentee_id in chunk
+            })
+            rescored += len(chunk)
+            if log:
+                log(f'{rescored} mentee(s) rescored')
+    return rescored
+
+
+def queue_refresh(user_id):
+    """Mark a user's profile as changed since matches were last computed"""
+    # An upsert would need unique_fields, which MySQL's ON DUPLICATE KEY UPDATE cannot take
+    PendingMatchRefresh.objects.update_or_create(user_id=user_id, defaults={'requested_at': timezone.now()})
+
+
+def process_queue(log=None):
+    """Refresh the matches affected by every queued profile change"""
+    started = timezone.now()
+    queued = PendingMatchRefresh.objects.filter(requested_at__lte=started)
+    user_ids = list(queued.values_list('user_id', flat=True))
+    if not user_ids:
+        return 0
+    rescored = refresh_matches(user_ids, log=log)
+    # Users queued again while this ran stay in the queue for the next pass
+    queued.filter(user_id__in=user_ids).delete()
+    return rescored
+
+
+def recommended_mentors(user):
+    """A mentee's stored matches, best first, with mentor profiles joined"""
+    return (
+        MentorMatch.objects.filter(mentee=user)
+        .select_related('mentor__profile__university')
+        .order_by('rank')
+    )
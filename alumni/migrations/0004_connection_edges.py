@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:32
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def backfill_edges(apps, schema_editor):
+    Connection = apps.get_model('alumni', 'Connection')
+    ConnectionEdge = apps.get_model('alumni', 'ConnectionEdge')
+    accepted = Connection.objects.filter(status='accepted').values_list('sender_id', 'receiver_id', 'updated_at')
+    edges = []
+    for sender_id, receiver_id, updated_at in accepted.iterator():
+        edges.append(ConnectionEdge(user_id=sender_id, neighbor_id=receiver_id, created_at=updated_at))
+        edges.append(ConnectionEdge(user_id=receiver_id, neighbor_id=sender_id, created_at=updated_at))
+    ConnectionEdge.objects.bulk_create(edges, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('alumni', '0003_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConnectionEdge',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('neighbor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='connection_edges', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['neighbor', 'user'], name='alumni_edge_neighbor_idx')],
+                'unique_together': {('user', 'neighbor')},
+            },
+        ),
+        migrations.RunPython(backfill_edges, migrations.RunPython.noop),
+    ]
@@ -20,10 +20,29 @@ class Connection(models.Model):
 
     class Meta:
         unique_together = ('sender', 'receiver')
+        indexes = [
+            models.Index(fields=['receiver', 'status'], name='alumni_conn_receiver_idx'),
+            models.Index(fields=['sender', 'status'], name='alumni_conn_sender_idx'),
+        ]
 
     def __str__(self):
         return f"{self.sender.username} -> {self.receiver.username} ({self.status})"
 
+class ConnectionEdge(models.Model):
+    """One direction of an accepted connection; every accepted pair has two rows"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='connection_edges')
+    neighbor = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ('user', 'neighbor')
+        indexes = [
+            models.Index(fields=['neighbor', 'user'], name='alumni_edge_neighbor_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} <-> {self.neighbor.username}"
+
 class MentorshipRequest(models.Model):
     """Model for mentorship requests"""
     
@@ -45,6 +64,31 @@ class MentorshipRequest(models.Model):
     def __str__(self):
         return f"Mentorship: {self.mentee.username} -> {self.mentor.username}"
 
+class MentorMatch(models.Model):
+    """Precomputed mentor recommendation for a mentee, maintained by alumni.matching"""
+    mentee = models.ForeignKey(User, on_delete=models.CASCADE, related_name='mentor_matches')
+    mentor = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ('mentee', 'mentor')
+        indexes = [
+            models.Index(fields=['mentee', 'rank'], name='alumni_match_mentee_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.mentee.username} -> {self.mentor.username} ({self.score:.3f})"
+
+class PendingMatchRefresh(models.Model):
+    """A profile changed since its mentor matches were last computed"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='+')
+    requested_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Refresh matches for {self.user.username}"
+
 class AlumniDirectory(models.Model):
     """Model for alumni directory entries"""
     user = models.OneToOneField(User, on_delete=models.CASCADE)
@@ -59,3 +103,18 @@ class AlumniDirectory(models.Model):
 
     def __str__(self):
         return f"{self.user.username} - Alumni Directory"
+
+class SearchToken(models.Model):
+    """Inverted index entry used by the alumni directory search"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='search_tokens')
+    token = models.CharField(max_length=50)
+    weight = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        unique_together = ('user', 'token')
+        indexes = [
+            models.Index(fields=['token', 'user'], name='alumni_token_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.token} -> {self.user.username} ({self.weight})"
@@ -0,0 +1,93 @@
+"""
+Token-table search index for the alumni directory.
+
+Every indexed user gets one SearchToken row per distinct word found in their
+name, current company/position, industry and skills. Lookups are prefix
+matches on the indexed token column, so they use the index instead of the
+LIKE '%x%' scans the directory used to run.
+"""
+import re
+from django.db.models import IntegerField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from accounts.models import UserProfile
+from .models import SearchToken
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+MAX_TOKEN_LENGTH = 50
+MAX_QUERY_TERMS = 5
+
+# How much a match in each field contributes to the ranking
+USER_FIELD_WEIGHTS = {
+    'first_name': 5,
+    'last_name': 5,
+    'username': 4,
+}
+PROFILE_FIELD_WEIGHTS = {
+    'current_position': 3,
+    'current_company': 3,
+    'industry': 2,
+    'skills': 2,
+}
+
+
+def tokenize(text):
+    """Split text into lowercase index tokens"""
+    return [token[:MAX_TOKEN_LENGTH] for token in TOKEN_RE.findall((text or '').lower())]
+
+
+def build_tokens(user, profile=None):
+    """Return a {token: weight} mapping for a user and their profile"""
+    weights = {}
+    sources = [(user, USER_FIELD_WEIGHTS)]
+    if profile is not None:
+        sources.append((profile, PROFILE_FIELD_WEIGHTS))
+    for instance, field_weights in sources:
+        for field, weight in field_weights.items():
+            for token in tokenize(getattr(instance, field, '')):
+                weights[token] = weights.get(token, 0) + weight
+    return weights
+
+
+def _get_profile(user):
+    try:
+        return user.profile
+    except UserProfile.DoesNotExist:
+        return None
+
+
+def index_user(user):
+    """Rebuild the search tokens for a single user"""
+    SearchToken.objects.filter(user=user).delete()
+    SearchToken.objects.bulk_create([
+        SearchToken(user=user, token=token, weight=weight)
+        for token, weight in build_tokens(user, _get_profile(user)).items()
+    ])
+
+
+def search_users(queryset, query):
+    """
+    Filter a User queryset to those matching every term in query and order
+    them by relevance. Terms are matched as prefixes so results keep up with
+    search-as-you-type.
+    """
+    terms = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+    if not terms:
+        return queryset
+
+    any_term = Q()
+    for term in terms:
+        queryset = queryset.filter(
+            pk__in=SearchToken.objects.filter(token__startswith=term).values('user_id')
+        )
+        any_term |= Q(token__startswith=term)
+
+    rank = (
+        SearchToken.objects.filter(any_term, user=OuterRef('pk'))
+        .order_by()
+        .values('user')
+        .annotate(total=Sum('weight'))
+        .values('total')
+    )
+    return queryset.annotate(
+        search_rank=Coalesce(Subquery(rank, output_field=IntegerField()), 0)
+    ).order_by('-search_rank', 'pk')
@@ -0,0 +1,29 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from accounts.models import User, UserProfile
+from .graph import sync_pair
+from .matching import queue_refresh
+from .models import Connection
+from .search import USER_FIELD_WEIGHTS, index_user
+from .tasks import schedule_match_refresh
+
+@receiver(post_save, sender=User)
+def reindex_user(sender, instance, update_fields=None, **kwargs):
+    # Logins only touch last_login; skip the reindex unless a searched field changed
+    if update_fields is not None and not set(update_fields) & set(USER_FIELD_WEIGHTS):
+        return
+    index_user(instance)
+
+@receiver(post_save, sender=UserProfile)
+def reindex_profile(sender, instance, **kwargs):
+    index_user(instance.user)
+
+@receiver(post_save, sender=UserProfile)
+def queue_match_refresh(sender, instance, **kwargs):
+    queue_refresh(instance.user_id)
+    schedule_match_refresh()
+
+@receiver(post_save, sender=Connection)
+@receiver(post_delete, sender=Connection)
+def sync_connection_edges(sender, instance, **kwargs):
+    sync_pair(instance.sender_id, instance.receiver_id)
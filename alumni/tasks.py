@@ -0,0 +1,16 @@
+from datetime import timedelta
+from core.taskqueue import debounce_key, task
+from .matching import process_queue
+
+# Queued mentor match refreshes are drained at most once per window
+REFRESH_WINDOW = timedelta(minutes=2)
+
+@task()
+def refresh_mentor_matches():
+    """Apply queued profile changes to the stored mentor matches"""
+    process_queue()
+
+def schedule_match_refresh():
+    refresh_mentor_matches.enqueue(
+        idempotency_key=debounce_key(refresh_mentor_matches.name, REFRESH_WINDOW), delay=REFRESH_WINDOW,
+    )
@@ -2,11 +2,21 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.http import JsonResponse
-from django.db.models import Q
+from django.db.models import Q, Count
 from django.core.paginator import Paginator
-from accounts.models import User, UserProfile, University
+from accounts.models import User, UserProfile, University, Skill
 from .models import Connection, MentorshipRequest, AlumniDirectory
 from .forms import ConnectionRequestForm, MentorshipRequestForm
+from .graph import connection_edges, connection_statuses, mutual_counts, suggestions
+from .matching import recommended_mentors
+from .search import search_users
+
+def popular_skills(limit=30, mentors_only=False):
+    """Most common skill tags with a profile_count, counted on the indexed through table"""
+    profile_filter = Q(profiles__is_mentor=True) if mentors_only else Q()
+    return Skill.objects.annotate(
+        profile_count=Count('profiles', filter=profile_filter)
+    ).filter(profile_count__gt=0).order_by('-profile_count', 'name')[:limit]
 
 def directory_view(request):
     """Alumni directory with search and filtering"""
@@ -18,14 +28,7 @@ def directory_view(request):
     # Search functionality
     search_query = request.GET.get('search', '')
     if search_query:
-        users = users.filter(
-            Q(first_name__icontains=search_query) |
-            Q(last_name__icontains=search_query) |
-            Q(username__icontains=search_query) |
-            Q(profile__current_company__icontains=search_query) |
-            Q(profile__current_position__icontains=search_query) |
-            Q(profile__skills__icontains=search_query)
-        )
+        users = search_users(users, search_query)
     
     # Filter by university
     university_id = request.GET.get('university')
@@ -37,6 +40,11 @@ def directory_view(request):
     if graduation_year:
         users = users.filter(profile__graduation_year=graduation_year)
     
+    # Filter by skill (exact tag match)
+    skill = request.GET.get('skill')
+    if skill:
+        users = users.filter(profile__skill_tags__slug=skill)
+    
     # Filter by user type
     user_type = request.GET.get('user_type')
     if user_type:
@@ -56,6 +64,15 @@ def directory_view(request):
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
+    # Mutual connection counts and connection status for the whole page, one query each
+    if request.user.is_authenticated:
+        member_ids = [member.pk for member in page_obj]
+        mutual = mutual_counts(request.user, member_ids)
+        statuses = connection_statuses(request.user, member_ids)
+        for member in page_obj:
+            member.mutual_count = mutual.get(member.pk, 0)
+            member.connection_status = statuses.get(member.pk)
+    
     # Get filter options
     universities = University.objects.all().order_by('name')
     graduation_years = UserProfile.objects.exclude(graduation_year__isnull=True).values_list('graduation_year', flat=True).distinct().order_by('-graduation_year')
@@ -65,8 +82,10 @@ def directory_view(request):
         'search_query': search_query,
         'universities': universities,
         'graduation_years': graduation_years,
+        'skills': popular_skills(),
         'selected_university': university_id,
         'selected_graduation_year': graduation_year,
+        'selected_skill': skill,
         'selected_user_type': user_type,
         'is_mentor_filter': is_mentor,
     }
@@ -101,28 +120,26 @@ def send_connection_request(request, user_id):
 @login_required
 def my_connections(request):
     """View user's connections"""
-    # Accepted connections
-    connections = Connection.objects.filter(
-        Q(sender=request.user, status='accepted') |
-        Q(receiver=request.user, status='accepted')
-    ).select_related('sender', 'receiver')
+    # Accepted connections, one edge row per connected user
+    connections = connection_edges(request.user)
     
     # Pending requests sent by user
     sent_requests = Connection.objects.filter(
         sender=request.user,
         status='pending'
-    ).select_related('receiver')
+    ).select_related('receiver__profile')
     
     # Pending requests received by user
     received_requests = Connection.objects.filter(
         receiver=request.user,
         status='pending'
-    ).select_related('sender')
+    ).select_related('sender__profile')
     
     context = {
         'connections': connections,
         'sent_requests': sent_requests,
         'received_requests': received_requests,
+        'suggestions': suggestions(request.user),
     }
     return render(request, 'alumni/connections.html', context)
 
@@ -218,20 +235,18 @@ def mentors_view(request):
     # Search functionality
     search_query = request.GET.get('search', '')
     if search_query:
-        mentors = mentors.filter(
-            Q(first_name__icontains=search_query) |
-            Q(last_name__icontains=search_query) |
-            Q(profile__current_company__icontains=search_query) |
-            Q(profile__current_position__icontains=search_query) |
-            Q(profile__skills__icontains=search_query) |
-            Q(profile__industry__icontains=search_query)
-        )
+        mentors = search_users(mentors, search_query)
     
     # Filter by industry
     industry = request.GET.get('industry')
     if industry:
         mentors = mentors.filter(profile__industry__icontains=industry)
     
+    # Filter by skill (exact tag match)
+    skill = request.GET.get('skill')
+    if skill:
+        mentors = mentors.filter(profile__skill_tags__slug=skill)
+    
     # Pagination
     paginator = Paginator(mentors, 12)
     page_number = request.GET.get('page')
@@ -240,10 +255,16 @@ def mentors_view(request):
     # Get industries for filter
     industries = UserProfile.objects.exclude(industry='').values_list('industry', flat=True).distinct()
     
+    # Precomputed matches; empty unless the user is looking for a mentor
+    recommended = recommended_mentors(request.user) if request.user.is_authenticated else []
+    
     context = {
         'page_obj': page_obj,
+        'recommended_matches': recommended,
         'search_query': search_query,
         'industries': industries,
+        'skills': popular_skills(mentors_only=True),
         'selected_industry': industry,
+        'selected_skill': skill,
     }
     return render(request, 'alumni/mentors.html', context)
@@ -1,9 +1,9 @@
 from django.contrib import admin
-from .models import Post, PostLike, Comment, Message
+from .models import Post, PostLike, Comment, Message, Conversation
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
-    list_display = ('author', 'post_type', 'title', 'is_pinned', 'is_active', 'created_at')
+    list_display = ('author', 'post_type', 'title', 'like_count', 'comment_count', 'is_pinned', 'is_active', 'created_at')
     list_filter = ('post_type', 'is_pinned', 'is_active', 'created_at')
     search_fields = ('title', 'content', 'author__username', 'tags')
     readonly_fields = ('created_at', 'updated_at')
@@ -25,3 +25,9 @@ class MessageAdmin(admin.ModelAdmin):
     list_display = ('sender', 'receiver', 'subject', 'is_read', 'created_at')
     list_filter = ('is_read', 'created_at')
     search_fields = ('sender__username', 'receiver__username', 'subject', 'content')
+
+@admin.register(Conversation)
+class ConversationAdmin(admin.ModelAdmin):
+    list_display = ('user_one', 'user_two', 'last_message_at', 'created_at')
+    search_fields = ('user_one__username', 'user_two__username')
+    raw_id_fields = ('user_one', 'user_two', 'last_message')
@@ -0,0 +1,49 @@
+"""
+Comment trees for the post detail page.
+
+All active comments of a post are fetched in one query (authors joined in)
+and linked into a tree in memory, so the page costs the same number of
+queries however many replies a post has and however deeply they nest.
+"""
+from .models import Comment
+
+# Replies deeper than this are drawn at this indent so long chains stay readable
+MAX_INDENT = 5
+
+
+def load_comment_tree(post):
+    """Top-level comments of the post, oldest first, each with a .children list"""
+    comments = list(
+        Comment.objects.filter(post=post, is_active=True)
+        .select_related('author')
+        .order_by('created_at', 'pk')
+    )
+    by_id = {}
+    for comment in comments:
+        comment.children = []
+        by_id[comment.pk] = comment
+
+    roots = []
+    for comment in comments:
+        if comment.parent_id is None:
+            roots.append(comment)
+        elif comment.parent_id in by_id:
+            by_id[comment.parent_id].children.append(comment)
+        # Replies to a hidden comment are hidden along with it
+    return roots
+
+
+def flatten_thread(root):
+    """
+    The root and all of its replies in display order, each annotated with
+    .depth and .indent. Iterative, so arbitrarily deep threads are safe.
+    """
+    thread = []
+    stack = [(root, 0)]
+    while stack:
+        comment, depth = stack.pop()
+        comment.depth = depth
+        comment.indent = min(depth, MAX_INDENT)
+        thread.append(comment)
+        stack.extend((child, depth + 1) for child in reversed(comment.children))
+    return thread
@@ -0,0 +1,91 @@
+"""
+Conversation threads for private messages.
+
+Messages between the same two users share one Conversation. Each user has a
+ConversationParticipant row holding their unread count and the time of the
+thread's latest message, so the inbox is one index range scan over the
+user's participant rows and the unread badge is a SUM over them, rather than
+a pass over every Message the user ever sent or received.
+
+community.signals attaches new messages to their conversation and bumps the
+counters; marking messages read happens here, with UPDATE statements.
+"""
+from django.db import transaction
+from django.db.models import Sum
+from core.counters import decrement
+from core.panels import bump_user_panel
+from .models import Conversation, ConversationParticipant, Message
+
+# Inbox and thread orderings, both ending in pk for CursorPaginator
+INBOX_ORDERING = ('-last_message_at', '-pk')
+THREAD_ORDERING = ('-created_at', '-pk')
+
+
+def get_or_create_conversation(user_id, other_id):
+    """Conversation between two users, created along with its participant rows on first use"""
+    user_one_id, user_two_id = Conversation.ordered_pair(user_id, other_id)
+    with transaction.atomic():
+        conversation, created = Conversation.objects.get_or_create(
+            user_one_id=user_one_id, user_two_id=user_two_id
+        )
+        if created:
+            ConversationParticipant.objects.bulk_create([
+                ConversationParticipant(conversation=conversation, user_id=participant_id)
+                for participant_id in {user_one_id, user_two_id}
+            ])
+    return conversation
+
+
+def inbox(user):
+    """The user's conversations with everything the inbox card shows, newest activity first"""
+    return ConversationParticipant.objects.filter(user=user).select_related(
+        'conversation__user_one',
+        'conversation__user_two',
+        'conversation__last_message',
+    )
+
+
+def conversations_for(user):
+    return Conversation.objects.filter(participants__user=user)
+
+
+def unread_total(user):
+    """Unread messages across all of the user's conversations"""
+    total = ConversationParticipant.objects.filter(user=user).aggregate(total=Sum('unread_count'))['total']
+    return total or 0
+
+
+def mark_conversations_read(user, conversation_ids=None):
+    """
+    Mark every unread message the user received in the given conversations
+    (all of them when conversation_ids is None) as read, in two UPDATEs.
+    Returns the number of messages marked.
+    """
+    participants = ConversationParticipant.objects.filter(user=user, unread_count__gt=0)
+    if conversation_ids is not None:
+        participants = participants.filter(conversation_id__in=conversation_ids)
+
+    with transaction.atomic():
+        # Lock the counters so a message arriving mid-way is not zeroed away
+        locked = list(participants.select_for_update().values_list('conversation_id', flat=True))
+        if not locked:
+            return 0
+        marked = Message.objects.filter(
+            conversation_id__in=locked, receiver=user, is_read=False
+        ).update(is_read=True)
+        ConversationParticipant.objects.filter(user=user, conversation_id__in=locked).update(unread_count=0)
+
+    bump_user_panel(user.pk)
+    return marked
+
+
+def mark_message_read(message):
+    """Mark a single message read and take it off the receiver's unread count"""
+    if message.is_read:
+        return
+    if Message.objects.filter(pk=message.pk, is_read=False).update(is_read=True):
+        ConversationParticipant.objects.filter(
+            conversation_id=message.conversation_id, user_id=message.receiver_id
+        ).update(unread_count=decrement('unread_count'))
+        bump_user_panel(message.receiver_id)
+    message.is_read = True
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Exists, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from community.models import Conversation, ConversationParticipant, Message
+
+UPDATE_BATCH = 1000
+
+
+def _latest_message(field):
+    latest = Message.objects.filter(conversation=OuterRef('pk')).order_by('-created_at', '-pk')
+    return Subquery(latest.values(field)[:1])
+
+
+def _unread_subquery():
+    counts = (
+        Message.objects.filter(
+            conversation=OuterRef('conversation'), receiver=OuterRef('user'), is_read=False
+        )
+        .order_by()
+        .values('conversation')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+class Command(BaseCommand):
+    help = 'Reconcile conversation last-message pointers and per-participant unread counters'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many participant rows have drifted counters',
+        )
+
+    def handle(self, *args, **options):
+        drifted = (
+            ConversationParticipant.objects.annotate(actual=_unread_subquery())
+            .filter(~Q(unread_count=F('actual')) | ~Q(last_message_at=F('conversation__last_message_at')))
+            .order_by()
+        )
+
+        if options['dry_run']:
+            self.stdout.write(f'{drifted.count()} participant row(s) have drifted counters.')
+            return
+
+        has_messages = Exists(Message.objects.filter(conversation=OuterRef('pk')))
+        Conversation.objects.filter(has_messages).update(
+            last_message=_latest_message('pk'),
+            last_message_at=_latest_message('created_at'),
+        )
+        # The ids are read first: MySQL refuses an UPDATE whose WHERE selects
+        # from the table being updated (error 1093)
+        drifted_ids = list(drifted.values_list('pk', flat=True))
+        drift_count = len(drifted_ids)
+        last_message_at = Conversation.objects.filter(pk=OuterRef('conversation')).values('last_message_at')
+        for start in range(0, drift_count, UPDATE_BATCH):
+            ConversationParticipant.objects.filter(pk__in=drifted_ids[start:start + UPDATE_BATCH]).update(
+                unread_count=_unread_subquery(),
+                last_message_at=Subquery(last_message_at),
+            )
+        self.stdout.write(self.style.SUCCESS(f'Reconciled counters on {drift_count} participant row(s).'))
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from community.models import Post, PostLike, Comment
+
+UPDATE_BATCH = 1000
+
+
+def _count_subquery(model):
+    counts = (
+        model.objects.filter(post=OuterRef('pk'))
+        .order_by()
+        .values('post')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+class Command(BaseCommand):
+    help = 'Reconcile the denormalized like/comment counters on community posts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many posts have drifted counters',
+        )
+
+    def handle(self, *args, **options):
+        drifted = (
+            Post.objects.annotate(
+                actual_likes=_count_subquery(PostLike),
+                actual_comments=_count_subquery(Comment),
+            )
+            .filter(~Q(like_count=F('actual_likes')) | ~Q(comment_count=F('actual_comments')))
+            .order_by()
+        )
+
+        if options['dry_run']:
+            self.stdout.write(f'{drifted.count()} post(s) have drifted counters.')
+            return
+
+        # The ids are read first: MySQL refuses an UPDATE whose WHERE selects
+        # from the table being updated (error 1093)
+        drifted_ids = list(drifted.values_list('pk', flat=True))
+        drift_count = len(drifted_ids)
+        for start in range(0, drift_count, UPDATE_BATCH):
+            # UPDATE ... SET col = (SELECT COUNT(*) ...) over a batch of drifted rows
+            Post.objects.filter(pk__in=drifted_ids[start:start + UPDATE_BATCH]).update(
+                like_count=_count_subquery(PostLike),
+                comment_count=_count_subquery(Comment),
+            )
+        self.stdout.write(self.style.SUCCESS(f'Reconciled counters on {drift_count} post(s).'))
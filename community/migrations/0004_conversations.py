@@ -0,0 +1,116 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:18
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def backfill_conversations(apps, schema_editor):
+    Message = apps.get_model('community', 'Message')
+    Conversation = apps.get_model('community', 'Conversation')
+    ConversationParticipant = apps.get_model('community', 'ConversationParticipant')
+
+    pairs = set()
+    for sender_id, receiver_id in Message.objects.values_list('sender_id', 'receiver_id').distinct():
+        pairs.add((min(sender_id, receiver_id), max(sender_id, receiver_id)))
+
+    for user_one_id, user_two_id in sorted(pairs):
+        between = Q(sender_id=user_one_id, receiver_id=user_two_id) | Q(sender_id=user_two_id, receiver_id=user_one_id)
+        thread = Message.objects.filter(between)
+        last_message = thread.order_by('-created_at', '-pk').first()
+        conversation = Conversation.objects.create(
+            user_one_id=user_one_id,
+            user_two_id=user_two_id,
+            last_message=last_message,
+            last_message_at=last_message.created_at,
+            created_at=thread.order_by('created_at').values_list('created_at', flat=True).first(),
+        )
+        thread.update(conversation=conversation)
+        unread = dict(
+            thread.filter(is_read=False).order_by().values_list('receiver_id').annotate(total=Count('pk'))
+        )
+        ConversationParticipant.objects.bulk_create([
+            ConversationParticipant(
+                conversation=conversation,
+                user_id=user_id,
+                unread_count=unread.get(user_id, 0),
+                last_message_at=last_message.created_at,
+            )
+            for user_id in {user_one_id, user_two_id}
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('community', '0003_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Conversation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_message_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ConversationParticipant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unread_count', models.PositiveIntegerField(default=0, editable=False)),
+                ('last_message_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='conversationparticipant',
+            name='conversation',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participants', to='community.conversation'),
+        ),
+        migrations.AddField(
+            model_name='conversationparticipant',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='conversation_memberships', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='last_message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='community.message'),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='user_one',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='user_two',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='message',
+            name='conversation',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='messages', to='community.conversation'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation', '-created_at'], name='community_msg_thread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='conversationparticipant',
+            index=models.Index(fields=['user', '-last_message_at'], name='community_conv_inbox_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='conversationparticipant',
+            unique_together={('conversation', 'user')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='conversation',
+            unique_together={('user_one', 'user_two')},
+        ),
+        migrations.RunPython(backfill_conversations, migrations.RunPython.noop),
+    ]
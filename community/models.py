@@ -18,15 +18,23 @@ class Post(models.Model):
     title = models.CharField(max_length=200, blank=True)
     content = models.TextField()
     image = models.ImageField(upload_to='post_images/', blank=True, null=True)
+    # Resized and WebP copies of image, written by core.images
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     link_url = models.URLField(blank=True)
     tags = models.CharField(max_length=200, blank=True, help_text="Comma-separated tags")
     is_pinned = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
+    # Denormalized counters, maintained by community.signals
+    like_count = models.PositiveIntegerField(default=0, editable=False)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-is_pinned', '-created_at']
+        indexes = [
+            models.Index(fields=['is_active', '-is_pinned', '-created_at'], name='community_post_feed_idx'),
+        ]
 
     def __str__(self):
         return f"{self.author.username}: {self.title or self.content[:50]}"
@@ -34,14 +42,6 @@ class Post(models.Model):
     def get_tags_list(self):
         return [tag.strip() for tag in self.tags.split(',') if tag.strip()]
 
-    @property
-    def like_count(self):
-        return self.likes.count()
-
-    @property
-    def comment_count(self):
-        return self.comments.count()
-
 class PostLike(models.Model):
     """Post likes model"""
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='likes')
@@ -70,8 +70,51 @@ class Comment(models.Model):
     def __str__(self):
         return f"{self.author.username}: {self.content[:50]}"
 
+class Conversation(models.Model):
+    """Private message thread between two users"""
+    # The pair is stored lowest pk first, so each pair maps to one row
+    user_one = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    user_two = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    last_message = models.ForeignKey('Message', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    last_message_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ('user_one', 'user_two')
+
+    def __str__(self):
+        return f"{self.user_one.username} <-> {self.user_two.username}"
+
+    @staticmethod
+    def ordered_pair(user_id, other_id):
+        return (user_id, other_id) if user_id < other_id else (other_id, user_id)
+
+    def other_user(self, user):
+        return self.user_two if self.user_one_id == user.pk else self.user_one
+
+class ConversationParticipant(models.Model):
+    """One user's side of a conversation: inbox position and unread count"""
+    conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name='participants')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='conversation_memberships')
+    # Denormalized from the conversation so the inbox is one index range scan;
+    # both columns are maintained by community.signals and community.conversations
+    unread_count = models.PositiveIntegerField(default=0, editable=False)
+    last_message_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ('conversation', 'user')
+        indexes = [
+            models.Index(fields=['user', '-last_message_at'], name='community_conv_inbox_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} in {self.conversation}"
+
 class Message(models.Model):
     """Private messages model"""
+    conversation = models.ForeignKey(
+        Conversation, on_delete=models.CASCADE, null=True, blank=True, editable=False, related_name='messages'
+    )
     sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sent_messages')
     receiver = models.ForeignKey(User, on_delete=models.CASCADE, related_name='received_messages')
     subject = models.CharField(max_length=200, blank=True)
@@ -81,6 +124,12 @@ class Message(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['receiver', 'is_read'], name='community_msg_unread_idx'),
+            models.Index(fields=['receiver', '-created_at'], name='community_msg_inbox_idx'),
+            models.Index(fields=['sender', '-created_at'], name='community_msg_sent_idx'),
+            models.Index(fields=['conversation', '-created_at'], name='community_msg_thread_idx'),
+        ]
 
     def __str__(self):
         return f"{self.sender.username} -> {self.receiver.username}: {self.subject or 'Message'}"
@@ -0,0 +1,57 @@
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from core.counters import decrement
+from .conversations import get_or_create_conversation
+from .models import Post, PostLike, Comment, Message, Conversation, ConversationParticipant
+
+def _adjust_counter(post_id, field, delta):
+    """Atomically add delta to a Post counter column without loading the row"""
+    value = F(field) + delta if delta >= 0 else decrement(field, -delta)
+    Post.objects.filter(pk=post_id).update(**{field: value})
+
+@receiver(post_save, sender=PostLike)
+def post_like_created(sender, instance, created, **kwargs):
+    if created:
+        _adjust_counter(instance.post_id, 'like_count', 1)
+
+@receiver(post_delete, sender=PostLike)
+def post_like_deleted(sender, instance, **kwargs):
+    _adjust_counter(instance.post_id, 'like_count', -1)
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, **kwargs):
+    if created:
+        _adjust_counter(instance.post_id, 'comment_count', 1)
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    _adjust_counter(instance.post_id, 'comment_count', -1)
+
+@receiver(pre_save, sender=Message)
+def message_attach_conversation(sender, instance, **kwargs):
+    if instance.conversation_id is None:
+        instance.conversation = get_or_create_conversation(instance.sender_id, instance.receiver_id)
+
+@receiver(post_save, sender=Message)
+def message_created(sender, instance, created, **kwargs):
+    if not created:
+        return
+    conversation_id = instance.conversation_id
+    Conversation.objects.filter(pk=conversation_id).update(
+        last_message=instance, last_message_at=instance.created_at
+    )
+    ConversationParticipant.objects.filter(conversation_id=conversation_id).update(
+        last_message_at=instance.created_at
+    )
+    if not instance.is_read:
+        ConversationParticipant.objects.filter(
+            conversation_id=conversation_id, user_id=instance.receiver_id
+        ).update(unread_count=F('unread_count') + 1)
+
+@receiver(post_delete, sender=Message)
+def message_deleted(sender, instance, **kwargs):
+    if not instance.is_read:
+        ConversationParticipant.objects.filter(
+            conversation_id=instance.conversation_id, user_id=instance.receiver_id
+        ).update(unread_count=decrement('unread_count'))
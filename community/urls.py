@@ -10,6 +10,8 @@ urlpatterns = [
     path('like/<int:post_id>/', views.like_post, name='like_post'),
     path('comment/<int:post_id>/', views.add_comment, name='add_comment'),
     path('messages/', views.messages_inbox, name='messages_inbox'),
+    path('messages/read/', views.mark_messages_read, name='mark_messages_read'),
+    path('conversation/<int:conversation_id>/', views.conversation_detail, name='conversation_detail'),
     path('send-message/', views.send_message, name='send_message'),
     path('send-message/<int:user_id>/', views.send_message, name='send_message_to_user'),
     path('message/<int:message_id>/', views.message_detail, name='message_detail'),
@@ -4,13 +4,17 @@ from django.contrib import messages
 from django.http import JsonResponse
 from django.db.models import Q
 from django.core.paginator import Paginator
+from django.template.loader import render_to_string
 from accounts.models import User
+from core.pagination import CursorPaginator, POST_ORDERING, wants_cursor
+from . import conversations
+from .comments import load_comment_tree, flatten_thread
 from .models import Post, PostLike, Comment, Message
 from .forms import PostForm, CommentForm, MessageForm
 
 def community_feed(request):
     """Community feed with posts"""
-    posts = Post.objects.filter(is_active=True).select_related('author').prefetch_related('likes', 'comments').order_by('-is_pinned', '-created_at')
+    posts = Post.objects.filter(is_active=True).select_related('author').order_by('-is_pinned', '-created_at')
     
     # Search functionality
     search_query = request.GET.get('search', '')
@@ -26,10 +30,19 @@ def community_feed(request):
     if post_type:
         posts = posts.filter(post_type=post_type)
     
-    # Pagination
-    paginator = Paginator(posts, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Keyset pagination, so infinite scroll never runs COUNT(*) or OFFSET;
+    # old ?page= links still get numbered pages
+    if wants_cursor(request, default=True):
+        page_obj = CursorPaginator(posts, POST_ORDERING, 10).page(request.GET.get('cursor'), request.GET)
+        if request.headers.get('x-requested-with') == 'XMLHttpRequest':
+            return JsonResponse({
+                'html': render_to_string('community/post_list.html', {'posts': page_obj}, request=request),
+                'next_cursor': page_obj.next_cursor,
+            })
+    else:
+        paginator = Paginator(posts, 10)
+        page_number = request.GET.get('page')
+        page_obj = paginator.get_page(page_number)
     
     # Get post types for filter
     post_types = Post.POST_TYPES
@@ -44,8 +57,13 @@ def community_feed(request):
 
 def post_detail_view(request, post_id):
     """Post detail with comments"""
-    post = get_object_or_404(Post, id=post_id, is_active=True)
-    comments = Comment.objects.filter(post=post, is_active=True, parent__isnull=True).select_related('author').prefetch_related('replies').order_by('created_at')
+    post = get_object_or_404(Post.objects.select_related('author'), id=post_id, is_active=True)
+
+    # Paginate top-level threads; each thread on the page is shown in full
+    paginator = Paginator(load_comment_tree(post), 20)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    for comment in page_obj:
+        comment.thread = flatten_thread(comment)
     
     # Check if user has liked the post
     user_has_liked = False
@@ -54,7 +72,7 @@ def post_detail_view(request, post_id):
     
     context = {
         'post': post,
-        'comments': comments,
+        'page_obj': page_obj,
         'user_has_liked': user_has_liked,
     }
     return render(request, 'community/post_detail.html', context)
@@ -91,6 +109,8 @@ def like_post(request, post_id):
         else:
             liked = True
         
+        # Counter is maintained by signals; re-read just that column
+        post.refresh_from_db(fields=['like_count'])
         return JsonResponse({
             'success': True,
             'liked': liked,
@@ -126,21 +146,51 @@ def add_comment(request, post_id):
 
 @login_required
 def messages_inbox(request):
-    """User's message inbox"""
-    received_messages = Message.objects.filter(
-        receiver=request.user
-    ).select_related('sender').order_by('-created_at')
-    
-    sent_messages = Message.objects.filter(
-        sender=request.user
-    ).select_related('receiver').order_by('-created_at')
-    
+    """User's message inbox: one card per conversation, latest activity first"""
+    page_obj = CursorPaginator(
+        conversations.inbox(request.user), conversations.INBOX_ORDERING, per_page=20
+    ).page(request.GET.get('cursor'), request.GET)
+    for membership in page_obj:
+        membership.other_user = membership.conversation.other_user(request.user)
+
     context = {
-        'received_messages': received_messages,
-        'sent_messages': sent_messages,
+        'page_obj': page_obj,
+        'unread_total': conversations.unread_total(request.user),
     }
     return render(request, 'community/messages.html', context)
 
+@login_required
+def conversation_detail(request, conversation_id):
+    """Messages in one conversation, newest first; opening it marks them read"""
+    conversation = get_object_or_404(
+        conversations.conversations_for(request.user).select_related('user_one', 'user_two'),
+        id=conversation_id
+    )
+    page_obj = CursorPaginator(
+        conversation.messages.select_related('sender'), conversations.THREAD_ORDERING, per_page=20
+    ).page(request.GET.get('cursor'), request.GET)
+    # The page is already loaded, so its "New" badges still show on this visit
+    conversations.mark_conversations_read(request.user, [conversation.id])
+
+    context = {
+        'conversation': conversation,
+        'other_user': conversation.other_user(request.user),
+        'page_obj': page_obj,
+    }
+    return render(request, 'community/conversation_detail.html', context)
+
+@login_required
+def mark_messages_read(request):
+    """Bulk mark-as-read for the selected conversations, or all of them"""
+    if request.method == 'POST':
+        if request.POST.get('all'):
+            marked = conversations.mark_conversations_read(request.user)
+        else:
+            selected = [value for value in request.POST.getlist('conversation') if value.isdigit()]
+            marked = conversations.mark_conversations_read(request.user, selected) if selected else 0
+        messages.success(request, f'Marked {marked} message{"s" if marked != 1 else ""} as read.')
+    return redirect('community:messages_inbox')
+
 @login_required
 def send_message(request, user_id=None):
     """Send a message to another user"""
@@ -157,7 +207,7 @@ def send_message(request, user_id=None):
                 message.receiver = recipient
             message.save()
             messages.success(request, 'Message sent successfully!')
-            return redirect('community:messages_inbox')
+            return redirect('community:conversation_detail', conversation_id=message.conversation_id)
     else:
         initial_data = {}
         if recipient:
@@ -174,14 +224,13 @@ def send_message(request, user_id=None):
 def message_detail(request, message_id):
     """View a specific message"""
     message = get_object_or_404(
-        Message.objects.filter(Q(sender=request.user) | Q(receiver=request.user)),
+        Message.objects.filter(Q(sender=request.user) | Q(receiver=request.user)).select_related('sender'),
         id=message_id
     )
     
     # Mark as read if user is the receiver
-    if message.receiver == request.user and not message.is_read:
-        message.is_read = True
-        message.save()
+    if message.receiver_id == request.user.id:
+        conversations.mark_message_read(message)
     
     context = {
         'message': message,
@@ -0,0 +1,25 @@
+from django.contrib import admin
+from django.utils import timezone
+from .models import MediaFile, Task
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'max_attempts', 'run_after', 'created_at', 'finished_at')
+    list_filter = ('status', 'name', 'created_at')
+    search_fields = ('name', 'idempotency_key', 'last_error')
+    readonly_fields = ('created_at', 'finished_at', 'claimed_by', 'claimed_at', 'last_error')
+    actions = ['retry_now']
+
+    @admin.action(description='Retry selected tasks now')
+    def retry_now(self, request, queryset):
+        retried = queryset.exclude(status='running').update(
+            status='queued', run_after=timezone.now(), attempts=0, finished_at=None,
+        )
+        self.message_user(request, f'Requeued {retried} task(s).')
+
+@admin.register(MediaFile)
+class MediaFileAdmin(admin.ModelAdmin):
+    list_display = ('name', 'size', 'ref_count', 'stored_at')
+    list_filter = ('stored_at',)
+    search_fields = ('name',)
+    readonly_fields = ('name', 'size', 'ref_count', 'stored_at')
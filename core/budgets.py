@@ -0,0 +1,100 @@
+"""
+Per-view budgets checked by `manage.py check_view_budgets`.
+
+queries is the most SQL statements one request may run with a cold cache;
+ms is the median wall time allowed on the synthetic dataset at scale 1.
+Views not listed get DEFAULT_BUDGET, and listed ones inherit any key they
+leave out. A budget may also give the status the signed-in request must
+answer with, for views whose cheap error branch would otherwise pass for
+the real one. Tighten a budget when a view gets faster, so a regression
+shows up as a failure instead of drifting back in.
+"""
+
+DEFAULT_BUDGET = {'queries': 10, 'ms': 500}
+
+# Django's own admin is not ours to budget
+SKIPPED_NAMESPACES = {'admin'}
+
+VIEW_BUDGETS = {
+    'core:home': {'queries': 7},
+    'core:dashboard': {'queries': 9},
+
+    'accounts:login': {'queries': 4},
+    'accounts:logout': {'queries': 6},
+    'accounts:signup': {'queries': 4},
+    'accounts:profile': {'queries': 8},
+    # Up to MAX_SEPARATION frontier queries for the degree badge, plus mutual count and status
+    'accounts:user_profile': {'queries': 13},
+    'accounts:edit_profile': {'queries': 6},
+    'accounts:delete_profile': {'queries': 4},
+    'accounts:dashboard': {'queries': 4},
+    'accounts:password_reset': {'queries': 2},
+    'accounts:password_reset_done': {'queries': 2},
+    'accounts:password_reset_confirm': {'queries': 7},
+    'accounts:password_reset_complete': {'queries': 2},
+
+    'alumni:directory': {'queries': 10},
+    'alumni:my_connections': {'queries': 8},
+    'alumni:send_connection': {'queries': 4},
+    'alumni:respond_connection': {'queries': 4},
+    'alumni:mentorship_requests': {'queries': 4},
+    'alumni:mentors': {'queries': 8},
+    'alumni:send_mentorship_request': {'queries': 5},
+    'alumni:respond_mentorship': {'queries': 4},
+
+    'jobs:job_list': {'queries': 7},
+    'jobs:job_detail': {'queries': 8},
+    'jobs:apply_job': {'queries': 6},
+    'jobs:post_job': {'queries': 5},
+    'jobs:my_applications': {'queries': 5},
+    'jobs:my_posted_jobs': {'queries': 6},
+    'jobs:job_pipeline': {'queries': 6},
+    # The exports stream their rows after the response starts; this counts the setup
+    'jobs:export_resumes': {'queries': 4},
+    'jobs:export_applicants_csv': {'queries': 4},
+    # The seeded sample application has a stored resume; a 404 means the stream was not measured
+    'jobs:download_resume': {'queries': 4, 'status': 200},
+
+    'events:event_list': {'queries': 7},
+    'events:event_detail': {'queries': 8},
+    'events:register_event': {'queries': 9},
+    'events:create_event': {'queries': 5},
+    'events:my_events': {'queries': 8},
+    'events:register': {'queries': 9},
+    'events:unregister': {'queries': 12},
+    'events:edit_event': {'queries': 6},
+    'events:delete_event': {'queries': 5},
+
+    'community:feed': {'queries': 3},
+    'community:post_detail': {'queries': 7},
+    'community:create_post': {'queries': 4},
+    'community:like_post': {'queries': 4},
+    'community:add_comment': {'queries': 5},
+    'community:messages_inbox': {'queries': 6},
+    'community:mark_messages_read': {'queries': 4},
+    'community:conversation_detail': {'queries': 9},
+    'community:send_message': {'queries': 5},
+    'community:send_message_to_user': {'queries': 5},
+    'community:message_detail': {'queries': 8},
+    'community:my_posts': {'queries': 5},
+
+    'notifications:notification_list': {'queries': 5},
+    # The navbar polls this on every page; it must stay a cache hit or one primary-key lookup
+    'notifications:unread_count': {'queries': 3},
+    # Opens the seeded unread notification: lock the counter, mark read, decrement, in a savepoint
+    'notifications:open_notification': {'queries': 8},
+    'notifications:mark_all_read': {'queries': 5},
+}
+
+# Views that currently fail for reasons unrelated to performance. They are
+# still measured and reported, but do not fail the run; delete an entry
+# once the view is fixed.
+KNOWN_FAILURES = {
+    'accounts:password_reset': 'template accounts/password_reset.html is missing',
+    'accounts:password_reset_done': 'template accounts/password_reset_done.html is missing',
+    # Only when the member's login has invalidated the seeded reset token
+    'accounts:password_reset_confirm': 'template accounts/password_reset_confirm.html is missing',
+    'accounts:password_reset_complete': 'template accounts/password_reset_complete.html is missing',
+    'alumni:mentorship_requests': 'template alumni/mentorship.html is missing',
+    'alumni:send_mentorship_request': 'template alumni/send_mentorship_request.html is missing',
+}
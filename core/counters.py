@@ -0,0 +1,15 @@
+"""
+Expressions for denormalized counter columns.
+
+Counters are PositiveIntegerFields, which are unsigned on MySQL: an UPDATE
+that takes one below zero fails with an out-of-range error (1690) instead of
+storing a negative, and Greatest(F(col) - n, 0) still evaluates the
+subtraction first. A counter that has drifted low is therefore compared
+before it is decremented.
+"""
+from django.db.models import Case, F, Value, When
+
+
+def decrement(field, amount=1):
+    """field - amount, floored at 0, for use in .update()"""
+    return Case(When(**{f'{field}__gte': amount}, then=F(field) - amount), default=Value(0))
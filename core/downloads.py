@@ -0,0 +1,95 @@
+"""
+Access-controlled file downloads with HTTP range support.
+
+Views that guard a stored file (resumes, say) cannot hand out its /media/
+URL, so they stream it through Django instead. FileResponse reads the file
+in blocks rather than loading it, but Django does not answer Range
+requests, and browsers' PDF viewers and download managers rely on them to
+resume or page through large files. file_response() honours a single
+"bytes=" range and replies 206 with only that slice, 416 when the range
+lies outside the file, and the whole file otherwise, including when an
+If-Range validator no longer matches. Multi-range requests get the whole
+file, which RFC 9110 allows.
+
+Media names are content hashes (core.storage), so the name is a strong
+ETag: it changes exactly when the bytes do.
+"""
+import mimetypes
+import posixpath
+import re
+from django.http import FileResponse, HttpResponse
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class _Slice:
+    """Read at most `length` bytes of an open file, from its current position"""
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """(start, end) inclusive for a single satisfiable byte range; None to send everything; False if unsatisfiable"""
+    match = RANGE_RE.match(header.replace(' ', ''))
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first == '':
+        # "bytes=-500" is the last 500 bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size:
+        return False
+    if end < start:
+        return None
+    return start, end
+
+
+def file_response(request, field_file, filename, as_attachment=False):
+    """Stream a stored file, or the byte range the request asks for"""
+    size = field_file.size
+    etag = '"%s"' % posixpath.splitext(posixpath.basename(field_file.name))[0]
+    content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+    byte_range = None
+    if request.method == 'GET' and 'HTTP_RANGE' in request.META:
+        if request.META.get('HTTP_IF_RANGE', etag) == etag:
+            byte_range = parse_range(request.META['HTTP_RANGE'], size)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    file = field_file.open('rb')
+    if byte_range is None:
+        response = FileResponse(file, as_attachment=as_attachment, filename=filename, content_type=content_type)
+    else:
+        start, end = byte_range
+        file.seek(start)
+        response = FileResponse(
+            _Slice(file, end - start + 1), as_attachment=as_attachment, filename=filename,
+            content_type=content_type, status=206,
+        )
+        response['Content-Length'] = end - start + 1
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    # Guarded content: browsers may keep it, shared caches must not
+    response['Cache-Control'] = 'private, max-age=3600'
+    return response
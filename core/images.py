@@ -0,0 +1,194 @@
+"""
+Resized and WebP variants of uploaded images.
+
+Uploads are stored as-is, and serving them full-size into 80px avatars and
+200px event cards is most of a directory page's weight. After an image
+field changes, core.signals queues a core.tasks.process_image task, which
+renders every size listed in IMAGE_SPECS for that field twice: as WebP and
+as a JPEG (PNG when the image has transparency) fallback. Variants go
+through the default storage like the original (core.storage), so they get
+content-hashed names next to it, identical uploads share variant files and
+the files can be cached forever. A size whose dimensions change in
+IMAGE_SPECS is regenerated by the next save or `manage.py process_images`.
+
+The names are recorded in the model's <field>_variants JSON column along
+with the original they were made from, so picking a variant in a template
+costs no query or storage call, and core.media counts them as references of
+the row. Templates wrap images in <picture>: {% webp_source %} offers the
+WebP variant and the <img> takes the fallback ({% image_url ... 'fallback' %},
+core.templatetags.images), so browsers without WebP still get a resized
+image. Until the task has run, or if the original has changed since, there
+is no <source> and the <img> falls back to the original file.
+`manage.py process_images` backfills existing uploads.
+"""
+import io
+import logging
+import posixpath
+from PIL import Image, ImageOps, UnidentifiedImageError
+from django.core.files.base import ContentFile
+from django.db import transaction
+
+logger = logging.getLogger('gradlink.images')
+
+# (width, height, crop): crop fills the box exactly, otherwise the image is
+# scaled down to fit inside it. Changing a size produces new file names.
+IMAGE_SPECS = {
+    ('accounts.User', 'profile_picture'): {
+        'sm': (64, 64, True),
+        'md': (160, 160, True),
+        'lg': (400, 400, True),
+    },
+    ('accounts.University', 'logo'): {
+        'sm': (64, 64, False),
+        'md': (200, 200, False),
+    },
+    ('events.Event', 'image'): {
+        'card': (640, 400, True),
+        'lg': (1200, 600, True),
+    },
+    ('community.Post', 'image'): {
+        'md': (800, 800, False),
+        'lg': (1600, 1600, False),
+    },
+}
+
+WEBP_QUALITY = 80
+JPEG_QUALITY = 85
+
+
+def variants_field(field_name):
+    return f'{field_name}_variants'
+
+
+def image_fields(model):
+    """The names of `model`'s image fields that have variants"""
+    label = model._meta.label
+    return [field_name for model_label, field_name in IMAGE_SPECS if model_label == label]
+
+
+def is_current(instance, field_name):
+    """Whether the recorded variants were made from the field's current file with the current sizes"""
+    name = getattr(instance, field_name).name
+    if not name:
+        return True
+    variants = getattr(instance, variants_field(field_name)) or {}
+    if variants.get('source') != name:
+        return False
+    if variants.get('unreadable'):
+        return True
+    specs = IMAGE_SPECS[(instance._meta.label, field_name)]
+    boxes = {size: variant.get('box') for size, variant in variants.get('sizes', {}).items()}
+    return boxes == {size: list(box) for size, box in specs.items()}
+
+
+def variant_names(variants):
+    """Every file name in a <field>_variants record"""
+    return [
+        name for variant in (variants or {}).get('sizes', {}).values()
+        for name in (variant['webp'], variant['fallback'])
+    ]
+
+
+def ready_variant(field_file, size):
+    """The variants record entry for one size of `field_file`, or None if it is not ready"""
+    if not field_file:
+        return None
+    variants = getattr(field_file.instance, variants_field(field_file.field.name), None) or {}
+    return variants.get('sizes', {}).get(size) if variants.get('source') == field_file.name else None
+
+
+def variant_url(field_file, size, fmt='webp'):
+    """URL of one variant of `field_file`, or of the original if that variant is not ready"""
+    if not field_file:
+        return ''
+    variant = ready_variant(field_file, size)
+    if variant is None:
+        return field_file.url
+    return field_file.storage.url(variant[fmt])
+
+
+def _has_alpha(image):
+    return image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+
+
+def _render(image, width, height, crop):
+    if crop:
+        return ImageOps.fit(image, (width, height), Image.LANCZOS)
+    image = image.copy()
+    image.thumbnail((width, height), Image.LANCZOS)
+    return image
+
+
+def _encode(image, fmt):
+    buffer = io.BytesIO()
+    if fmt == 'WEBP':
+        image.save(buffer, 'WEBP', quality=WEBP_QUALITY, method=6)
+    elif fmt == 'PNG':
+        image.save(buffer, 'PNG', optimize=True)
+    else:
+        image.save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def _store(field_file, filename, data):
+    # Saved like an upload to the same field, so variants land in its upload_to directory
+    name = field_file.field.generate_filename(field_file.instance, filename)
+    return field_file.storage.save(name, ContentFile(data))
+
+
+def generate_variants(field_file, specs):
+    """Render and store every size in `specs` for `field_file`; returns the variants record"""
+    stem = posixpath.splitext(posixpath.basename(field_file.name))[0]
+    with field_file.open('rb') as source:
+        image = Image.open(source)
+        image.load()
+    # Phones store rotation in EXIF; apply it since the variants drop the metadata
+    image = ImageOps.exif_transpose(image)
+    alpha = _has_alpha(image)
+    image = image.convert('RGBA' if alpha else 'RGB')
+    fallback_format, fallback_ext = ('PNG', 'png') if alpha else ('JPEG', 'jpg')
+
+    sizes = {}
+    for size, (width, height, crop) in specs.items():
+        rendered = _render(image, width, height, crop)
+        name = f'{stem}_{width}x{height}'
+        sizes[size] = {
+            'webp': _store(field_file, f'{name}.webp', _encode(rendered, 'WEBP')),
+            'fallback': _store(field_file, f'{name}.{fallback_ext}', _encode(rendered, fallback_format)),
+            'width': rendered.width,
+            'height': rendered.height,
+            'box': [width, height, crop],
+        }
+    return {'source': field_file.name, 'sizes': sizes}
+
+
+def process(instance, field_name, force=False):
+    """
+    Generate the variants for one image field and record them on the row.
+    Returns False when there was nothing to do (no image, already current,
+    the file is missing, or the image was replaced meanwhile).
+    """
+    from .media import replace_refs
+    field_file = getattr(instance, field_name)
+    if not field_file or (is_current(instance, field_name) and not force):
+        return False
+    specs = IMAGE_SPECS[(instance._meta.label, field_name)]
+    try:
+        variants = generate_variants(field_file, specs)
+    except FileNotFoundError:
+        logger.warning('%s #%s: %s is missing', instance._meta.label, instance.pk, field_file.name)
+        return False
+    except (UnidentifiedImageError, Image.DecompressionBombError) as exc:
+        # Record the attempt so it is not retried; templates keep the original
+        logger.warning('%s #%s: cannot process %s: %s', instance._meta.label, instance.pk, field_file.name, exc)
+        variants = {'source': field_file.name, 'sizes': {}, 'unreadable': True}
+    with transaction.atomic():
+        # Only record the variants if the image was not replaced while they were being made
+        row = type(instance)._base_manager.select_for_update().filter(pk=instance.pk, **{field_name: field_file.name})
+        previous = list(row.values_list(variants_field(field_name), flat=True))
+        if not previous:
+            return False
+        row.update(**{variants_field(field_name): variants})
+        replace_refs(variant_names(previous[0]), variant_names(variants))
+    setattr(instance, variants_field(field_name), variants)
+    return True
@@ -0,0 +1,95 @@
+import re
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count, Q
+from django.utils import timezone
+from alumni.graph import neighbor_ids
+from alumni.models import Connection, ConnectionEdge, MentorMatch
+from community.models import Post, Message, ConversationParticipant
+from core.media import collectable
+from core.models import Task
+from events.models import Event
+from jobs import pipeline
+from jobs.models import Job, JobApplication, JobRecommendation, JobTerm
+from notifications.digest import DIGEST_DELAY, pending
+from notifications.models import Notification
+
+# Plan fragments that mean a table is read end to end, per database vendor
+FULL_SCAN_PATTERNS = {
+    'sqlite': re.compile(r'\bSCAN (?!.*\bUSING\b)\w+'),
+    'mysql': re.compile(r'"access_type":\s*"ALL"'),
+    'postgresql': re.compile(r'\bSeq Scan\b'),
+}
+
+
+# Queries whose index starts with a boolean column. Django renders
+# is_active=True as a bare `WHERE is_active` on SQLite, which SQLite cannot
+# match against an index prefix, so there these only warn. MySQL gets
+# `is_active = 1` and PostgreSQL treats both forms alike.
+BOOLEAN_PREFIXED = {'jobs.job_list', 'events.event_list', 'community.feed'}
+
+
+def hot_queries(user_id):
+    """The WHERE/ORDER BY shapes the busiest views run, keyed by a readable name"""
+    now = timezone.now()
+    return {
+        'core.task_claim': Task.objects.filter(status='queued', run_after__lte=now).order_by('run_after', 'pk')[:10],
+        'core.media_collectable': collectable().order_by('pk')[:500],
+        'notifications.recent': Notification.objects.filter(recipient_id=user_id).order_by('-created_at', '-pk')[:20],
+        'notifications.digest_pending': pending(now - DIGEST_DELAY).order_by().values('recipient_id').distinct(),
+        'jobs.recommended': JobRecommendation.objects.filter(user_id=user_id, job__is_active=True).order_by('rank')[:5],
+        'jobs.term_frequencies': JobTerm.objects.filter(term__in=['python']).order_by().values('term').annotate(jobs=Count('job_id')),
+        'jobs.pipeline_counts': pipeline.posted_jobs(user_id)[:20],
+        'jobs.pipeline_applicants': JobApplication.objects.filter(job_id=1, status='applied').order_by('-applied_at')[:25],
+        'jobs.job_list': Job.objects.filter(is_active=True).order_by('-created_at')[:10],
+        'events.event_list': Event.objects.filter(is_active=True, start_datetime__gt=now).order_by('start_datetime')[:12],
+        'community.feed': Post.objects.filter(is_active=True).order_by('-is_pinned', '-created_at')[:10],
+        'community.inbox': ConversationParticipant.objects.filter(user_id=user_id).order_by('-last_message_at', '-pk')[:20],
+        'community.thread': Message.objects.filter(conversation_id=1).order_by('-created_at', '-pk')[:20],
+        'community.sent': Message.objects.filter(sender_id=user_id).order_by('-created_at')[:20],
+        'community.unread_count': ConversationParticipant.objects.filter(user_id=user_id),
+        'alumni.received_requests': Connection.objects.filter(receiver_id=user_id, status='pending'),
+        'alumni.sent_requests': Connection.objects.filter(sender_id=user_id, status='pending'),
+        'alumni.connections': ConnectionEdge.objects.filter(user_id=user_id).order_by('-created_at', '-pk'),
+        'alumni.connection_statuses': Connection.objects.filter(
+            Q(sender_id=user_id, receiver_id__in=[user_id]) | Q(receiver_id=user_id, sender_id__in=[user_id])
+        ),
+        'alumni.mentor_matches': MentorMatch.objects.filter(mentee_id=user_id).order_by('rank'),
+        'alumni.mutual_counts': ConnectionEdge.objects.filter(
+            user_id__in=[user_id], neighbor_id__in=neighbor_ids(user_id)
+        ).order_by().values('user_id').annotate(total=Count('pk')),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'EXPLAIN the hot list/inbox queries and fail if any of them falls back to a '
+        'full table scan. Run it against a realistically sized database: on tiny '
+        'tables MySQL may legitimately prefer a scan.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user-id', type=int, default=1, help='User id to plug into per-user queries')
+        parser.add_argument('--verbose-plans', action='store_true', help='Print every plan, not just failures')
+
+    def handle(self, *args, **options):
+        pattern = FULL_SCAN_PATTERNS.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(f'No full-scan detection for the {connection.vendor} backend.')
+        explain_options = {'format': 'json'} if connection.vendor == 'mysql' else {}
+
+        failures = []
+        for name, queryset in hot_queries(options['user_id']).items():
+            plan = queryset.explain(**explain_options)
+            if not pattern.search(plan):
+                self.stdout.write(f'{name}: {self.style.SUCCESS("ok")}')
+                if options['verbose_plans']:
+                    self.stdout.write(f'{plan}\n')
+            elif connection.vendor == 'sqlite' and name in BOOLEAN_PREFIXED:
+                self.stdout.write(f'{name}: {self.style.WARNING("full scan (expected on SQLite)")}\n{plan}\n')
+            else:
+                failures.append(name)
+                self.stdout.write(f'{name}: {self.style.ERROR("FULL SCAN")}\n{plan}\n')
+
+        if failures:
+            raise CommandError(f'Full table scans in: {", ".join(failures)}')
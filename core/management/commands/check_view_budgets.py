@@ -0,0 +1,203 @@
+import json
+import logging
+import statistics
+import tempfile
+import time
+from collections import Counter
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext, override_settings, setup_test_environment, teardown_test_environment,
+)
+from django.urls import URLResolver, get_resolver, reverse
+from django.utils import timezone
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from core.budgets import DEFAULT_BUDGET, KNOWN_FAILURES, SKIPPED_NAMESPACES, VIEW_BUDGETS
+from core.profiling import query_shape
+from core.synthetic import seed_dataset
+
+
+def iter_routes(patterns=None, namespace=None):
+    """(url name, route pattern) for every named route, in urls.py order"""
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            nested = pattern.namespace
+            if nested in SKIPPED_NAMESPACES:
+                continue
+            if namespace and nested:
+                nested = f'{namespace}:{nested}'
+            yield from iter_routes(pattern.url_patterns, nested or namespace)
+        elif pattern.name:
+            yield (f'{namespace}:{pattern.name}' if namespace else pattern.name), pattern.pattern
+
+
+def route_kwargs(route, seeded):
+    """Fill a route's parameters from the seeded dataset; None if one is unknown"""
+    samples = seeded.samples
+    primary = seeded.primary_user
+    sources = {
+        'post_id': lambda: samples['post'].pk,
+        'job_id': lambda: samples['job'].pk,
+        'application_id': lambda: samples['application'].pk,
+        'event_id': lambda: samples['event'].pk,
+        'user_id': lambda: samples['user'].pk,
+        'mentor_id': lambda: samples['user'].pk,
+        'username': lambda: samples['user'].username,
+        'connection_id': lambda: samples['connection'].pk,
+        'conversation_id': lambda: samples['conversation'].pk,
+        'message_id': lambda: samples['message'].pk,
+        'request_id': lambda: samples['mentorship_request'].pk,
+        'notification_id': lambda: samples['notification'].pk,
+        'uidb64': lambda: urlsafe_base64_encode(force_bytes(primary.pk)),
+        'token': lambda: default_token_generator.make_token(primary),
+    }
+    params = getattr(route, 'converters', {})
+    if any(name not in sources for name in params):
+        return None
+    return {name: sources[name]() for name in params}
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a synthetic dataset into a throwaway test database, request every named '
+        'URL as an anonymous and a logged-in user, check each view against its '
+        'query-count and wall-time budget (core.budgets), and write a JSON report. '
+        'Set GRADLINK_SQLITE=1 to run it without MySQL.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0, help='Dataset size multiplier')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the dataset')
+        parser.add_argument('--repeat', type=int, default=3, help='Timed runs per view; the median is reported')
+        parser.add_argument('--time-factor', type=float, default=1.0,
+                            help='Multiply every time budget, e.g. for a slow CI machine')
+        parser.add_argument('--output', default='view_budgets.json', help='Where to write the JSON report')
+        parser.add_argument('--report-only', action='store_true', help='Do not fail when a budget is exceeded')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        request_logger = logging.getLogger('django.request')
+        old_level = request_logger.level
+        # Server errors are recorded in the report; keep their tracebacks off the console
+        request_logger.setLevel(logging.CRITICAL)
+        # Files the seed stores (the sample resume) are as disposable as the test database
+        media_root = tempfile.TemporaryDirectory()
+        try:
+            with override_settings(MEDIA_ROOT=media_root.name):
+                seeded = seed_dataset(scale=options['scale'], seed=options['seed'])
+                results = self.measure_all(seeded, options)
+        finally:
+            media_root.cleanup()
+            request_logger.setLevel(old_level)
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        failures = [result for result in results if result['failures']]
+        report = {
+            'generated_at': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'scale': options['scale'],
+            'seed': options['seed'],
+            'dataset': seeded.counts,
+            'results': results,
+            'failed': len(failures),
+        }
+        with open(options['output'], 'w') as fh:
+            json.dump(report, fh, indent=2, sort_keys=True)
+
+        self.print_summary(results)
+        self.stdout.write(f"Report written to {options['output']}")
+        if failures and not options['report_only']:
+            raise CommandError(f'{len(failures)} view(s) exceeded their budget.')
+
+    def measure_all(self, seeded, options):
+        results = []
+        seen = set()
+        for name, route in iter_routes():
+            if name in seen:
+                continue
+            seen.add(name)
+            kwargs = route_kwargs(route, seeded)
+            if kwargs is None:
+                results.append({'name': name, 'skipped': 'unresolvable URL parameters', 'failures': []})
+                continue
+            url = reverse(name, kwargs=kwargs)
+            budget = dict(DEFAULT_BUDGET, **VIEW_BUDGETS.get(name, {}))
+            for role, user in (('anonymous', None), ('member', seeded.primary_user)):
+                results.append(self.measure(name, url, role, user, budget, options))
+        return results
+
+    def request(self, url, user, clear_cache):
+        client = Client(raise_request_exception=False)
+        if user is not None:
+            client.force_login(user)
+        if clear_cache:
+            cache.clear()
+        # Roll back whatever the view writes so every run sees the same data
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = client.get(url)
+                elapsed = (time.perf_counter() - started) * 1000
+            transaction.set_rollback(True)
+        return response, [query['sql'] for query in queries.captured_queries], elapsed
+
+    def measure(self, name, url, role, user, budget, options):
+        timings = []
+        for _ in range(max(1, options['repeat'])):
+            response, queries, elapsed = self.request(url, user, clear_cache=True)
+            timings.append(elapsed)
+        _, warm_queries, _ = self.request(url, user, clear_cache=False)
+
+        shapes = Counter(query_shape(sql) for sql in queries)
+        time_budget = budget['ms'] * options['time_factor']
+        result = {
+            'name': name,
+            'url': url,
+            'user': role,
+            'status': response.status_code,
+            'queries': len(queries),
+            'warm_queries': len(warm_queries),
+            'max_repeated_query': max(shapes.values(), default=0),
+            'time_ms': round(statistics.median(timings), 2),
+            'budget': {'queries': budget['queries'], 'ms': time_budget},
+            'failures': [],
+        }
+        if getattr(response, 'exc_info', None):
+            result['error'] = repr(response.exc_info[1])
+        if response.status_code >= 500:
+            result['failures'].append(f'status {response.status_code}')
+        elif user is not None and 'status' in budget and response.status_code != budget['status']:
+            result['failures'].append(f"status {response.status_code} != {budget['status']}")
+        if len(queries) > budget['queries']:
+            result['failures'].append(f"{len(queries)} queries > {budget['queries']}")
+        if result['time_ms'] > time_budget:
+            result['failures'].append(f"{result['time_ms']}ms > {time_budget}ms")
+        if result['failures'] and name in KNOWN_FAILURES:
+            result['known_failure'] = KNOWN_FAILURES[name]
+            result['failures'] = []
+        return result
+
+    def print_summary(self, results):
+        for result in results:
+            if 'skipped' in result:
+                self.stdout.write(f"{result['name']}: skipped ({result['skipped']})")
+                continue
+            line = (
+                f"{result['name']} [{result['user']}] {result['status']} "
+                f"{result['queries']}q (warm {result['warm_queries']}q, max repeat "
+                f"{result['max_repeated_query']}) {result['time_ms']}ms"
+            )
+            if result.get('known_failure'):
+                self.stdout.write(self.style.WARNING(f"{line}  known failure: {result['known_failure']}"))
+            elif result['failures']:
+                self.stdout.write(self.style.ERROR(f"{line}  FAIL: {'; '.join(result['failures'])}"))
+            else:
+                self.stdout.write(line)
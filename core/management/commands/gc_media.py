@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from core.media import GC_GRACE, collect_garbage, collectable_totals, recount
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete media files that no database row references (core.media). Files '
+        f'stored within the last {GC_GRACE} are kept. --recount first rebuilds '
+        'every reference count from the rows, e.g. after bulk updates or when '
+        'adopting the content-addressed storage.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recount', action='store_true', help='Rebuild reference counts before collecting')
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would change')
+
+    def handle(self, *args, **options):
+        if options['recount']:
+            wrong = recount(dry_run=options['dry_run'])
+            verb = 'are wrong' if options['dry_run'] else 'were corrected'
+            self.stdout.write(f'{wrong} reference count(s) {verb}.')
+        if options['dry_run']:
+            files, size = collectable_totals()
+            self.stdout.write(f'{files} unreferenced file(s), {size} bytes, can be deleted.')
+            return
+        files, size = collect_garbage()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {files} unreferenced file(s), freeing {size} bytes.'))
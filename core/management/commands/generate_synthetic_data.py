@@ -0,0 +1,53 @@
+import os
+import time
+from django.core.management.base import BaseCommand, CommandError
+from accounts.models import User
+from core.synthetic import DEFAULT_BATCH_SIZE, DEFAULT_VOLUMES, SYNTHETIC_PASSWORD, SYNTHETIC_PREFIX, generate
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate a synthetic dataset for load testing: users, profiles, connections, jobs, '
+        'events, posts, comments, likes and messages with heavy-tailed activity. Volumes '
+        'are row totals, e.g. --users 500000 --connections 5000000 --posts 1000000 --likes 10000000.'
+    )
+
+    def add_arguments(self, parser):
+        for name, default in DEFAULT_VOLUMES.items():
+            parser.add_argument(
+                f"--{name.replace('_', '-')}", type=int, default=default, dest=name,
+                help=f'Number of {name.replace("_", " ")} (default {default})',
+            )
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; the same seed gives the same dataset')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Worker processes generating and inserting chunks; 0 means one per CPU')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help='Rows per chunk and per INSERT')
+        parser.add_argument('--no-rebuild', action='store_true',
+                            help='Skip rebuilding counters and the search index afterwards')
+
+    def handle(self, *args, **options):
+        if User.objects.filter(username__startswith=SYNTHETIC_PREFIX).exists():
+            raise CommandError(f'The database already has synthetic users ({SYNTHETIC_PREFIX}*); use a fresh database.')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1.')
+
+        volumes = {name: options[name] for name in DEFAULT_VOLUMES}
+        if volumes['users'] < 2:
+            raise CommandError('--users must be at least 2.')
+        workers = options['workers'] or os.cpu_count() or 1
+
+        started = time.monotonic()
+        created = generate(
+            volumes,
+            seed=options['seed'],
+            workers=workers,
+            batch_size=options['batch_size'],
+            rebuild=not options['no_rebuild'],
+            log=self.stdout.write,
+        )
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {sum(created.values())} row(s) in {elapsed:.1f}s. '
+            f'Log in as {SYNTHETIC_PREFIX}0 / {SYNTHETIC_PASSWORD}.'
+        ))
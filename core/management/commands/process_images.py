@@ -0,0 +1,32 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from core.images import IMAGE_SPECS, is_current, process
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate resized and WebP variants (core.images) for uploaded images '
+        'that do not have current ones yet, e.g. uploads from before the pipeline.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenerate variants that are already current')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many images need processing')
+
+    def handle(self, *args, **options):
+        total = 0
+        for model_label, field_name in IMAGE_SPECS:
+            model = apps.get_model(model_label)
+            instances = model._default_manager.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+            pending = [
+                instance for instance in instances.iterator()
+                if options['force'] or not is_current(instance, field_name)
+            ]
+            if options['dry_run']:
+                self.stdout.write(f'{model_label}.{field_name}: {len(pending)} image(s) to process.')
+                continue
+            done = sum(process(instance, field_name, force=options['force']) for instance in pending)
+            self.stdout.write(f'{model_label}.{field_name}: processed {done} of {len(pending)} image(s).')
+            total += done
+        if not options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'Processed {total} image(s).'))
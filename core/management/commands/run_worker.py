@@ -0,0 +1,102 @@
+import os
+import signal
+import socket
+import threading
+import time
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, close_old_connections, connections
+from core.taskqueue import claim, heartbeat, prune_finished, reclaim_stale, registered_tasks, run_task
+
+# Seconds between heartbeats, stale-claim and pruning sweeps; well under CLAIM_TIMEOUT
+MAINTENANCE_INTERVAL = 60 * 5
+
+
+class Command(BaseCommand):
+    help = (
+        'Run queued background tasks (core.taskqueue). Each of --concurrency threads '
+        'claims due tasks from the database and runs them; start as many workers as '
+        'you like. Stops cleanly on SIGINT/SIGTERM after the tasks in hand finish.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=2, help='Worker threads in this process')
+        parser.add_argument('--batch', type=int, default=10, help='Tasks each thread claims at a time')
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds to sleep when the queue is empty')
+        parser.add_argument('--once', action='store_true', help='Exit once no task is due instead of polling')
+
+    def handle(self, *args, **options):
+        self.stopping = threading.Event()
+        self.worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        self.processed = 0
+        self.lock = threading.Lock()
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, self.stop)
+            signal.signal(signal.SIGTERM, self.stop)
+
+        self.stdout.write(
+            f'Worker {self.worker_id}: {options["concurrency"]} thread(s), '
+            f'{len(registered_tasks())} registered task(s).'
+        )
+        self.maintain()
+        threads = [
+            threading.Thread(target=self.work, args=(n, options), name=f'worker-{n}', daemon=True)
+            for n in range(options['concurrency'])
+        ]
+        for thread in threads:
+            thread.start()
+        last_maintenance = time.monotonic()
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=1)
+            if time.monotonic() - last_maintenance > MAINTENANCE_INTERVAL and not self.stopping.is_set():
+                self.maintain()
+                last_maintenance = time.monotonic()
+        connections.close_all()
+        self.stdout.write(self.style.SUCCESS(f'Worker stopped after {self.processed} task(s).'))
+
+    def stop(self, signum, frame):
+        self.stdout.write('Stopping after the current tasks...')
+        self.stopping.set()
+
+    def maintain(self):
+        # Keep this process's claims, running or waiting in a batch, from looking stale
+        heartbeat(self.worker_id)
+        reclaimed = reclaim_stale()
+        pruned = prune_finished()
+        if reclaimed or pruned:
+            self.stdout.write(f'Requeued {reclaimed} stale task(s), pruned {pruned} finished task(s).')
+        close_old_connections()
+
+    def work(self, n, options):
+        worker_id = f'{self.worker_id}:{n}'
+        try:
+            while not self.stopping.is_set():
+                close_old_connections()
+                try:
+                    token, task_ids = claim(worker_id, options['batch'])
+                except DatabaseError as exc:
+                    # e.g. a lock timeout under contention; nothing was claimed, so just try again
+                    self.stderr.write(f'[{worker_id}] claim failed: {exc}')
+                    self.stopping.wait(options['poll_interval'])
+                    continue
+                if not task_ids:
+                    if options['once']:
+                        return
+                    self.stopping.wait(options['poll_interval'])
+                    continue
+                for task_id in task_ids:
+                    try:
+                        status = run_task(task_id, token)
+                    except DatabaseError as exc:
+                        # The task stays 'running' and is requeued by reclaim_stale()
+                        self.stderr.write(f'[{worker_id}] task #{task_id} could not be recorded: {exc}')
+                        continue
+                    if status is None:
+                        # Reclaimed by another worker, which runs and records it
+                        continue
+                    with self.lock:
+                        self.processed += 1
+                    if options['verbosity'] > 1:
+                        self.stdout.write(f'[{worker_id}] task #{task_id}: {status}')
+        finally:
+            connections.close_all()
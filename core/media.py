@@ -0,0 +1,151 @@
+"""
+Reference counts and garbage collection for media files (core.storage).
+
+Content-addressed files are shared, so each one has a MediaFile row counting
+the database rows that point at it: every FileField value, plus the resized
+variants core.images records in <field>_variants. core.signals keeps the
+counts current as rows are saved and deleted, at the cost of one query of
+the file columns on a save that may change them. Counts move with
+UPDATE ... SET ref_count = ref_count + n, one statement per distinct n.
+
+When a count drops to zero a collection is queued. It deletes the files
+that are unreferenced and were not stored within GC_GRACE, the window in
+which a new upload may not have been saved to its row yet. Bulk .update()
+calls bypass the signals; `manage.py gc_media --recount` rebuilds every
+count from the rows.
+"""
+from collections import Counter, defaultdict
+from datetime import timedelta
+from functools import lru_cache
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.db import models, transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+from .counters import decrement
+from .images import image_fields, variant_names, variants_field
+from .models import MediaFile
+
+GC_GRACE = timedelta(hours=6)
+GC_BATCH = 500
+
+
+@lru_cache(maxsize=None)
+def file_fields(model):
+    return tuple(field.name for field in model._meta.concrete_fields if isinstance(field, models.FileField))
+
+
+@lru_cache(maxsize=None)
+def media_columns(model):
+    """Columns of `model` that hold media file names: file fields and their variants records"""
+    return file_fields(model) + tuple(variants_field(field_name) for field_name in image_fields(model))
+
+
+def names_from_values(model, values):
+    """The file names one row references, given its media_columns() values"""
+    names = [values[field_name] for field_name in file_fields(model) if values[field_name]]
+    for field_name in image_fields(model):
+        names.extend(variant_names(values[variants_field(field_name)]))
+    return names
+
+
+def referenced_names(instance):
+    """The file names an instance references as it is in memory"""
+    model = type(instance)
+    values = {field_name: getattr(instance, field_name).name for field_name in file_fields(model)}
+    for field_name in image_fields(model):
+        values[variants_field(field_name)] = getattr(instance, variants_field(field_name))
+    return names_from_values(model, values)
+
+
+def stored_names(instance):
+    """The file names an instance's row references in the database"""
+    model = type(instance)
+    values = model._base_manager.filter(pk=instance.pk).values(*media_columns(model)).first()
+    return names_from_values(model, values) if values else []
+
+
+def _by_amount(counts):
+    by_amount = defaultdict(list)
+    for name, amount in counts.items():
+        by_amount[amount].append(name)
+    return by_amount.items()
+
+
+def add_refs(names):
+    counts = Counter(names)
+    if not counts:
+        return
+    MediaFile.objects.bulk_create([MediaFile(name=name) for name in counts], ignore_conflicts=True)
+    for amount, batch in _by_amount(counts):
+        MediaFile.objects.filter(name__in=batch).update(ref_count=F('ref_count') + amount)
+
+
+def drop_refs(names):
+    from .tasks import schedule_media_collection
+    counts = Counter(names)
+    if not counts:
+        return
+    for amount, batch in _by_amount(counts):
+        MediaFile.objects.filter(name__in=batch).update(ref_count=decrement('ref_count', amount))
+    transaction.on_commit(schedule_media_collection)
+
+
+def replace_refs(old_names, new_names):
+    """Move references from `old_names` to `new_names`, touching only the difference"""
+    old_names, new_names = Counter(old_names), Counter(new_names)
+    add_refs((new_names - old_names).elements())
+    drop_refs((old_names - new_names).elements())
+
+
+def record_stored(name, size):
+    """Note that `name` was just written (or re-uploaded), restarting its grace period"""
+    if not MediaFile.objects.filter(name=name).update(stored_at=timezone.now(), size=size):
+        MediaFile.objects.bulk_create([MediaFile(name=name, size=size)], ignore_conflicts=True)
+
+
+def collectable():
+    return MediaFile.objects.filter(ref_count=0, stored_at__lt=timezone.now() - GC_GRACE)
+
+
+def collect_garbage(storage=None):
+    """Delete unreferenced files past their grace period; returns (files, bytes) removed"""
+    storage = storage or default_storage
+    files = freed = 0
+    while True:
+        with transaction.atomic():
+            batch = list(collectable().select_for_update().order_by('pk').values_list('pk', 'name', 'size')[:GC_BATCH])
+            if not batch:
+                return files, freed
+            MediaFile.objects.filter(pk__in=[pk for pk, name, size in batch]).delete()
+            for pk, name, size in batch:
+                storage.delete(name)
+                files += 1
+                freed += size
+
+
+def collectable_totals():
+    """(files, bytes) that collect_garbage() would remove now"""
+    totals = collectable().aggregate(files=Count('pk'), size=Sum('size'))
+    return totals['files'], totals['size'] or 0
+
+
+def recount(dry_run=False):
+    """Rebuild every reference count from the rows; returns how many counts were wrong"""
+    counts = Counter()
+    for model in apps.get_models():
+        columns = media_columns(model)
+        if columns:
+            for values in model._base_manager.values(*columns).iterator():
+                counts.update(names_from_values(model, values))
+    stored = dict(MediaFile.objects.values_list('name', 'ref_count'))
+    wrong = {name: counts[name] for name in set(counts) | set(stored) if counts[name] != stored.get(name)}
+    if not dry_run:
+        with transaction.atomic():
+            MediaFile.objects.bulk_create(
+                [MediaFile(name=name) for name in wrong if name not in stored], ignore_conflicts=True,
+            )
+            for amount, batch in _by_amount(wrong):
+                for start in range(0, len(batch), GC_BATCH):
+                    MediaFile.objects.filter(name__in=batch[start:start + GC_BATCH]).update(ref_count=amount)
+    return len(wrong)
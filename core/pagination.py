@@ -0,0 +1,160 @@
+"""
+Keyset (cursor) pagination for the list views.
+
+django.core.paginator.Paginator runs a COUNT(*) and then OFFSET n, so deep
+pages get slower the further you go. CursorPaginator instead remembers the
+ordering values of the last row it returned and asks for rows strictly after
+them, which stays an index range scan no matter how deep the page is.
+
+Cursors are opaque signed tokens; a tampered or stale token just yields the
+first page.
+"""
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+CURSOR_PARAM = 'cursor'
+CURSOR_SALT = 'core.pagination.cursor'
+
+# Orderings used by the list views; each ends in pk so every key is unique
+POST_ORDERING = ('-is_pinned', '-created_at', '-pk')
+JOB_ORDERING = ('-created_at', '-pk')
+EVENT_ORDERING = ('start_datetime', 'pk')
+
+
+def wants_cursor(request, default=False):
+    """
+    Whether to paginate by cursor: always with a ?cursor= parameter, never
+    with ?page=, and otherwise `default`. The feed defaults to cursors so its
+    first page already hands infinite scroll a cursor; the numbered job and
+    event lists opt in per request.
+    """
+    if CURSOR_PARAM in request.GET:
+        return True
+    if 'page' in request.GET:
+        return False
+    return default
+
+
+class CursorPage:
+    """One page of results, shaped enough like a Paginator page for the templates"""
+
+    is_cursor = True
+
+    def __init__(self, object_list, next_cursor, previous_cursor, query_params):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self._query_params = query_params
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def _querystring(self, cursor):
+        params = self._query_params.copy()
+        params.pop('page', None)
+        params[CURSOR_PARAM] = cursor
+        return params.urlencode()
+
+    @property
+    def next_querystring(self):
+        return self._querystring(self.next_cursor) if self.next_cursor else ''
+
+    @property
+    def previous_querystring(self):
+        return self._querystring(self.previous_cursor) if self.previous_cursor else ''
+
+
+class CursorPaginator:
+    """
+    Paginate a queryset by keyset on the given ordering.
+
+    ordering is a sequence of field names (optionally prefixed with '-') and
+    must end with a unique column, normally 'pk' or '-pk'.
+    """
+
+    def __init__(self, queryset, ordering, per_page):
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.per_page = per_page
+        self.model = queryset.model
+
+    def _fields(self, reverse=False):
+        for spec in self.ordering:
+            descending = spec.startswith('-')
+            yield spec.lstrip('-'), descending != reverse
+
+    def _model_field(self, name):
+        return self.model._meta.pk if name == 'pk' else self.model._meta.get_field(name)
+
+    def _encode(self, obj, direction):
+        values = [self._model_field(name).value_to_string(obj) for name, _ in self._fields()]
+        return signing.dumps({'d': direction, 'v': values}, salt=CURSOR_SALT, compress=True)
+
+    def _decode(self, cursor):
+        try:
+            payload = signing.loads(cursor, salt=CURSOR_SALT)
+            direction, raw_values = payload['d'], payload['v']
+            if direction not in ('next', 'prev') or len(raw_values) != len(self.ordering):
+                return None, None
+            values = [
+                self._model_field(name).to_python(raw)
+                for (name, _), raw in zip(self._fields(), raw_values)
+            ]
+        except (signing.BadSignature, KeyError, TypeError, ValueError, ValidationError):
+            return None, None
+        return direction, values
+
+    def _after(self, values, reverse):
+        """Q matching rows strictly after `values` in (possibly reversed) ordering"""
+        condition = Q()
+        equal = Q()
+        for (name, descending), value in zip(self._fields(reverse), values):
+            lookup = 'lt' if descending else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def page(self, cursor, query_params):
+        direction, values = self._decode(cursor) if cursor else (None, None)
+        backwards = direction == 'prev'
+
+        queryset = self.queryset
+        if values is not None:
+            queryset = queryset.filter(self._after(values, reverse=backwards))
+        order = [
+            f"{'-' if descending else ''}{name}"
+            for name, descending in self._fields(reverse=backwards)
+        ]
+        rows = list(queryset.order_by(*order)[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backwards:
+            rows.reverse()
+
+        if not rows:
+            return CursorPage(rows, None, None, query_params)
+
+        if backwards:
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+
+        return CursorPage(
+            rows,
+            self._encode(rows[-1], 'next') if has_next else None,
+            self._encode(rows[0], 'prev') if has_previous else None,
+            query_params,
+        )
@@ -0,0 +1,57 @@
+"""
+Cached panels for the home page and dashboard.
+
+The views hand the templates lazy querysets; the templates wrap each panel
+in a {% cache %} fragment keyed on a per-panel version number, so on a cache
+hit the queries never run. Saving or deleting a Job, Event or Post bumps only
+that panel's version (see core.signals), and per-user bits such as the
+dashboard stats are keyed on a per-user version instead.
+"""
+from django.core.cache import cache
+
+PANEL_TIMEOUT = 60 * 5
+SHARED_PANELS = ('jobs', 'events', 'posts')
+
+
+def _panel_key(name):
+    return f'core:panel:{name}:version'
+
+
+def _user_key(user_id):
+    return f'core:user_panel:{user_id}:version'
+
+
+def _get_versions(keys):
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, 1, None)
+            versions[key] = cache.get(key, 1)
+    return versions
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def panel_versions():
+    """Current version of every shared panel, for use as {% cache %} vary-on keys"""
+    versions = _get_versions([_panel_key(name) for name in SHARED_PANELS])
+    return {name: versions[_panel_key(name)] for name in SHARED_PANELS}
+
+
+def bump_panel(name):
+    _bump(_panel_key(name))
+
+
+def user_panel_version(user_id):
+    key = _user_key(user_id)
+    return _get_versions([key])[key]
+
+
+def bump_user_panel(*user_ids):
+    for user_id in user_ids:
+        _bump(_user_key(user_id))
@@ -0,0 +1,233 @@
+"""
+Opt-in per-request profiling.
+
+ProfilingMiddleware is listed in MIDDLEWARE but switches itself off (Django's
+MiddlewareNotUsed) unless PROFILING_ENABLED is set. When on, it records for
+each sampled request:
+
+- total wall time;
+- SQL query count and time, via a connection execute wrapper on every
+  database alias, plus duplicate queries (same SQL and parameters run more
+  than once) and the query shapes repeated most often, which is the usual
+  signature of an N+1;
+- time spent rendering templates;
+- cache hits and misses.
+
+The numbers go out as a Server-Timing header, so they show up in the
+browser's network panel, and as one JSON line per request in a rotating
+log file (PROFILING_LOG_FILE).
+
+Template and cache timings are collected by wrapping Template.render and the
+configured cache backends' get/get_many. The wrappers are installed once, the
+first time the middleware is built, and only record while a profiled
+request is in progress on the current thread or task.
+"""
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.backends.django import Template as DjangoTemplate
+from django.utils import timezone
+
+SQL_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+# Shapes repeated at least this often in one request are reported as likely N+1s
+REPEATED_SHAPE_THRESHOLD = 5
+
+_current = ContextVar('core_profiling_request', default=None)
+_MISSING = object()
+
+
+def query_shape(sql):
+    """SQL with literals replaced by ?, so one query run with different ids counts as one shape"""
+    return SQL_LITERAL_RE.sub('?', sql)
+
+
+class RequestProfile:
+    """Measurements for one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.query_time = 0.0
+        self.query_keys = Counter()
+        self.query_shapes = Counter()
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def record_query(self, sql, params, elapsed):
+        self.query_count += 1
+        self.query_time += elapsed
+        self.query_keys[(sql, repr(params))] += 1
+        self.query_shapes[query_shape(sql)] += 1
+
+    @property
+    def duplicate_queries(self):
+        return sum(count - 1 for count in self.query_keys.values() if count > 1)
+
+    def repeated_shapes(self):
+        return [
+            {'sql': shape[:300], 'count': count}
+            for shape, count in self.query_shapes.most_common(5)
+            if count >= REPEATED_SHAPE_THRESHOLD
+        ]
+
+
+def _execute_wrapper(execute, sql, params, many, context):
+    profile = _current.get()
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        if profile is not None:
+            profile.record_query(sql, params, time.perf_counter() - started)
+
+
+def _install_template_timing():
+    original = DjangoTemplate.render
+    if getattr(original, '_profiled', False):
+        return
+
+    def render(self, context=None, request=None):
+        profile = _current.get()
+        if profile is None:
+            return original(self, context, request)
+        # Count only the outermost render; nested renders are inside its time already
+        profile.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return original(self, context, request)
+        finally:
+            profile.template_depth -= 1
+            if profile.template_depth == 0:
+                profile.template_time += time.perf_counter() - started
+
+    render._profiled = True
+    DjangoTemplate.render = render
+
+
+def _install_cache_counting():
+    for alias in settings.CACHES:
+        backend_class = type(caches[alias])
+        if getattr(backend_class.get, '_profiled', False):
+            continue
+        original_get = backend_class.get
+        original_get_many = backend_class.get_many
+
+        def get(self, key, default=None, version=None, _original=original_get):
+            profile = _current.get()
+            if profile is None:
+                return _original(self, key, default, version)
+            value = _original(self, key, _MISSING, version)
+            if value is _MISSING:
+                profile.cache_misses += 1
+                return default
+            profile.cache_hits += 1
+            return value
+
+        def get_many(self, keys, version=None, _original=original_get_many):
+            profile = _current.get()
+            if profile is None:
+                return _original(self, keys, version)
+            keys = list(keys)
+            # BaseCache.get_many loops over get(); count the keys once, here
+            token = _current.set(None)
+            try:
+                found = _original(self, keys, version)
+            finally:
+                _current.reset(token)
+            profile.cache_hits += len(found)
+            profile.cache_misses += len(keys) - len(found)
+            return found
+
+        get._profiled = True
+        backend_class.get = get
+        backend_class.get_many = get_many
+
+
+def _build_logger():
+    log_file = Path(getattr(settings, 'PROFILING_LOG_FILE', settings.BASE_DIR / 'logs' / 'profiling.jsonl'))
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    logger = logging.getLogger('gradlink.profiling')
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    if not logger.handlers:
+        handler = RotatingFileHandler(
+            log_file,
+            maxBytes=getattr(settings, 'PROFILING_LOG_MAX_BYTES', 10 * 1024 * 1024),
+            backupCount=getattr(settings, 'PROFILING_LOG_BACKUPS', 5),
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+    return logger
+
+
+class ProfilingMiddleware:
+    """Adds a Server-Timing header and a JSONL log line to each sampled request"""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'PROFILING_SAMPLE_RATE', 1.0)
+        self.logger = _build_logger()
+        _install_template_timing()
+        _install_cache_counting()
+
+    def __call__(self, request):
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        token = _current.set(profile)
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(_execute_wrapper))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        total = time.perf_counter() - profile.started
+        response['Server-Timing'] = self.server_timing(profile, total)
+        self.logger.info(json.dumps(self.record(request, response, profile, total)))
+        return response
+
+    def server_timing(self, profile, total):
+        return ', '.join([
+            f'total;dur={total * 1000:.1f}',
+            f'db;dur={profile.query_time * 1000:.1f};desc="{profile.query_count} queries, '
+            f'{profile.duplicate_queries} duplicate"',
+            f'tpl;dur={profile.template_time * 1000:.1f}',
+            f'cache;desc="{profile.cache_hits} hits, {profile.cache_misses} misses"',
+        ])
+
+    def record(self, request, response, profile, total):
+        match = getattr(request, 'resolver_match', None)
+        return {
+            'ts': timezone.now().isoformat(),
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 2),
+            'db_ms': round(profile.query_time * 1000, 2),
+            'queries': profile.query_count,
+            'duplicate_queries': profile.duplicate_queries,
+            'repeated_queries': profile.repeated_shapes(),
+            'template_ms': round(profile.template_time * 1000, 2),
+            'cache_hits': profile.cache_hits,
+            'cache_misses': profile.cache_misses,
+        }
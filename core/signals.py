@@ -0,0 +1,69 @@
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from alumni.models import Connection
+from community.models import Post, Message
+from events.models import Event
+from jobs.models import Job
+from .images import image_fields, is_current, variants_field
+from .media import drop_refs, media_columns, referenced_names, replace_refs, stored_names
+from .panels import bump_panel, bump_user_panel
+from .tasks import schedule_image_processing
+
+SHARED_PANEL_MODELS = {
+    Job: 'jobs',
+    Event: 'events',
+    Post: 'posts',
+}
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_shared_panel(sender, **kwargs):
+    panel = SHARED_PANEL_MODELS.get(sender)
+    if panel:
+        bump_panel(panel)
+
+@receiver(post_save, sender=Connection)
+@receiver(post_delete, sender=Connection)
+@receiver(post_save, sender=Message)
+@receiver(post_delete, sender=Message)
+def invalidate_user_panels(sender, instance, **kwargs):
+    bump_user_panel(instance.sender_id, instance.receiver_id)
+
+@receiver(pre_save)
+def clear_image_variants(sender, instance, **kwargs):
+    # A removed image takes its variants with it
+    for field_name in image_fields(sender):
+        if not getattr(instance, field_name) and getattr(instance, variants_field(field_name)):
+            setattr(instance, variants_field(field_name), {})
+
+@receiver(post_save)
+def queue_image_variants(sender, instance, raw=False, **kwargs):
+    # Resizing happens in the task queue, never in the request that uploaded the image
+    if raw:
+        return
+    for field_name in image_fields(sender):
+        if not is_current(instance, field_name):
+            schedule_image_processing(instance, field_name)
+
+@receiver(pre_save)
+def remember_stored_media(sender, instance, raw=False, update_fields=None, **kwargs):
+    columns = media_columns(sender)
+    if not columns:
+        return
+    if raw or (update_fields is not None and not set(update_fields) & set(columns)):
+        instance._stored_media = None
+    else:
+        instance._stored_media = [] if instance._state.adding else stored_names(instance)
+
+@receiver(post_save)
+def count_media_references(sender, instance, **kwargs):
+    previous = getattr(instance, '_stored_media', None)
+    if previous is not None:
+        replace_refs(previous, referenced_names(instance))
+        instance._stored_media = None
+
+@receiver(pre_delete)
+def release_media_references(sender, instance, **kwargs):
+    # Read from the row: the worker may have recorded variants since this instance was loaded
+    if media_columns(sender):
+        drop_refs(stored_names(instance))
@@ -0,0 +1,48 @@
+"""
+Content-addressed media storage.
+
+The default file storage (settings.STORAGES). Every saved file is named
+after the SHA-256 of its content, <upload_to>/<2 hex>/<sha256><ext>,
+whatever name the uploader gave it, so the same bytes are stored once
+however often they are uploaded, and a URL always serves the same bytes
+and can be cached forever. The content is hashed in chunks before it is
+written, so large uploads never sit in memory.
+
+Files are shared between rows, so deleting a row must not delete its file.
+core.media keeps a reference count per file (core.MediaFile) and deletes
+files nobody references any more; saving a file records it there, which
+also protects a fresh upload from collection until its row is saved.
+"""
+import hashlib
+import posixpath
+from django.core.files.storage import FileSystemStorage
+
+# Longer "extensions" are more likely part of the name than a file type
+MAX_EXTENSION_LENGTH = 10
+
+
+class ContentAddressedStorage(FileSystemStorage):
+
+    def content_name(self, name, content):
+        """The name `content` is stored under when saved as `name`"""
+        directory, basename = posixpath.split(name)
+        extension = posixpath.splitext(basename)[1].lower()
+        if len(extension) > MAX_EXTENSION_LENGTH:
+            extension = ''
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk if isinstance(chunk, bytes) else chunk.encode())
+        digest = digest.hexdigest()
+        return posixpath.join(directory, digest[:2], f'{digest}{extension}')
+
+    def _save(self, name, content):
+        from .media import record_stored
+        name = self.content_name(name, content)
+        # Record the file before checking for it, so a collection running
+        # now either sees it as freshly stored or has already removed it
+        record_stored(name, content.size)
+        if self.exists(name):
+            return name
+        # Two uploads of the same new file racing here both write; the
+        # loser gets a suffixed name, which is wasteful but still correct
+        return super()._save(name, content)
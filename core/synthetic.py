@@ -0,0 +1,663 @@
+"""
+Synthetic data generator for load testing and benchmarks.
+
+generate() fills the database with users, profiles, connections, mentorship
+requests, jobs, applications, events, registrations, posts, likes, comments
+and private messages, in whatever volumes it is given: a few hundred rows
+for the view-budget suite, or millions for a load test.
+
+Rows are produced in independent chunks. Each chunk has its own
+deterministically seeded RNG and writes its rows with bulk_create in
+batches, so nothing ever holds a whole table in memory. The same seed gives
+the same dataset however many worker processes share the chunks. Chunks
+are split by the owning row (a connection by its sender, a like by its
+post), so the unique constraints hold without coordination between workers.
+
+Activity is heavy-tailed, as in production: a few users post, connect, like
+and message far more than the rest (Zipf-weighted picks), and a few posts,
+jobs and events collect most of the likes, applications and sign-ups
+(Pareto-distributed fan-out). Timestamps lean towards the recent past.
+
+bulk_create skips model signals, so the denormalized counters, the search
+index and the mentor and job recommendations are rebuilt at the end with the same management
+commands used to repair them in production.
+
+Every synthetic username starts with SYNTHETIC_PREFIX. The first user is
+the "primary" user: they post jobs, organize events, mentor and look for a
+mentor, and sit in the middle of the connection and message graph. That gives
+the per-user pages something to render when a benchmark logs in as them.
+"""
+import io
+import itertools
+import multiprocessing
+import random
+from datetime import timedelta
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import connection, connections
+from django.db.models import Max, Q
+from django.urls import reverse
+from django.utils import timezone
+from accounts.models import (
+    User, University, UserProfile, Skill, Interest, ProfileSkill, ProfileInterest,
+)
+from accounts.tags import normalize_tag
+from alumni.models import Connection, MentorshipRequest
+from community.models import Post, PostLike, Comment, Conversation, ConversationParticipant, Message
+from events.models import Event, EventCategory, EventRegistration
+from jobs.models import Job, JobCategory, JobApplication
+from notifications.delivery import notify
+from notifications.models import Notification
+
+SYNTHETIC_PREFIX = 'synthetic_'
+SYNTHETIC_PASSWORD = 'synthetic-password'
+DEFAULT_BATCH_SIZE = 1000
+
+# Row totals; the per-parent fan-outs (likes per post, ...) follow from them
+DEFAULT_VOLUMES = {
+    'users': 1000,
+    'universities': 50,
+    'connections': 10000,
+    'mentorship_requests': 250,
+    'jobs': 500,
+    'applications': 5000,
+    'events': 200,
+    'registrations': 4000,
+    'posts': 2000,
+    'likes': 20000,
+    'comments': 8000,
+    'conversations': 2000,
+    'messages': 20000,
+}
+
+# The view-budget suite's dataset: seeds in seconds, yet fills every page
+BENCHMARK_VOLUMES = {
+    'users': 200,
+    'universities': 10,
+    'connections': 600,
+    'mentorship_requests': 50,
+    'jobs': 120,
+    'applications': 720,
+    'events': 60,
+    'registrations': 600,
+    'posts': 300,
+    'likes': 1800,
+    'comments': 1300,
+    'conversations': 400,
+    'messages': 2400,
+}
+
+# The primary user's share of the dataset
+PRIMARY_JOBS = 10
+PRIMARY_EVENTS = 5
+PRIMARY_POSTS = 10
+PRIMARY_MIN_DEGREE = 30
+
+# How often each User.USER_TYPES value is drawn; a type added there must be given a weight here
+USER_TYPE_WEIGHTS = {'student': 35, 'alumni': 50, 'university': 5, 'company': 10}
+USER_TYPES = [user_type for user_type, _ in User.USER_TYPES]
+
+# A typical resume's size, so the download budget covers several blocks of streaming
+SAMPLE_RESUME = b'%PDF-1.4\n%' + b'0' * (256 * 1024) + b'\n%%EOF\n'
+
+FIRST_NAMES = ['Aarav', 'Maya', 'Liam', 'Sofia', 'Noah', 'Priya', 'Ethan', 'Zara', 'Lucas', 'Ananya',
+               'Omar', 'Chloe', 'Ravi', 'Emma', 'Kenji', 'Isla', 'Diego', 'Fatima', 'Leo', 'Hana']
+LAST_NAMES = ['Sharma', 'Garcia', 'Chen', 'Okafor', 'Smith', 'Patel', 'Kim', 'Rossi', 'Nguyen', 'Mehta',
+              'Silva', 'Khan', 'Muller', 'Ivanova', 'Brown', 'Tanaka', 'Singh', 'Lopez', 'Ahmed', 'Cohen']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Hooli', 'Stark Industries',
+             'Wayne Enterprises', 'Vandelay Imports', 'Soylent', 'Tyrell Systems']
+POSITIONS = ['Software Engineer', 'Data Scientist', 'Product Manager', 'Designer', 'Analyst',
+             'Consultant', 'Research Scientist', 'Marketing Lead', 'DevOps Engineer', 'Founder']
+INDUSTRIES = ['Technology', 'Finance', 'Healthcare', 'Education', 'Consulting', 'Media', 'Energy']
+SKILLS = ['Python', 'Django', 'JavaScript', 'React', 'SQL', 'Machine Learning', 'Data Analysis',
+          'Project Management', 'Product Design', 'Public Speaking', 'AWS', 'Docker', 'Kubernetes',
+          'Statistics', 'Marketing', 'Sales', 'Leadership', 'Java', 'Go', 'Rust', 'Figma', 'Excel',
+          'Negotiation', 'Research', 'Writing', 'Finance', 'Accounting', 'Cloud Architecture',
+          'Cybersecurity', 'UX Research']
+INTERESTS = ['Startups', 'Open Source', 'Mentoring', 'Hiking', 'Photography', 'AI Ethics',
+             'Investing', 'Music', 'Travel', 'Volunteering', 'Chess', 'Reading']
+CITIES = ['Bangalore', 'New York', 'London', 'Berlin', 'Remote', 'San Francisco', 'Toronto',
+          'Singapore', 'Sydney', 'Mumbai']
+JOB_CATEGORIES = ['Software Engineering', 'Data Science', 'Product Management', 'Marketing',
+                  'Finance', 'Consulting', 'Healthcare', 'Education']
+EVENT_CATEGORIES = ['Networking', 'Career Development', 'Technical Workshops', 'Industry Insights',
+                    'Social Events']
+WORDS = ('alumni network career growth team project launch mentor event hiring remote data '
+         'design product research community workshop opportunity experience learning').split()
+
+# Per-phase state shared with the chunk functions; workers receive it once, via the pool initializer
+_state = {}
+
+
+class SeedResult:
+    """Row counts plus the objects a benchmark needs to build URLs"""
+
+    def __init__(self, counts, primary_user, samples):
+        self.counts = counts
+        self.primary_user = primary_user
+        self.samples = samples
+
+
+# Distributions
+
+def _rng(name, start):
+    return random.Random(f"{_state['seed']}:{name}:{start}")
+
+
+def _sentence(rng, words=12):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def _recent(rng, now, days=730):
+    """A moment in the last `days`, denser towards now"""
+    return now - timedelta(days=days * rng.random() ** 2, seconds=rng.randint(0, 86399))
+
+
+def _fan_out(rng, mean, cap):
+    """Heavy-tailed child count with the given mean (Pareto, alpha=2)"""
+    if mean <= 0:
+        return 0
+    value = mean * 0.5 * rng.paretovariate(2)
+    # Round up with probability equal to the fraction, so small means keep their total
+    count = int(value) + (rng.random() < value % 1)
+    return min(cap, count)
+
+
+def _zipf_weights(n):
+    """Cumulative Zipf weights: position 0 is the most active"""
+    return list(itertools.accumulate(1 / (rank ** 0.8) for rank in range(1, n + 1)))
+
+
+def _pick_users(rng, k, exclude=None):
+    """k distinct user pks, activity-weighted"""
+    user_pks = _state['user_pks']
+    k = min(k, len(user_pks) - (1 if exclude is not None else 0))
+    chosen = set()
+    for _ in range(k * 4):
+        if len(chosen) >= k:
+            break
+        pk = rng.choices(user_pks, cum_weights=_state['user_weights'])[0]
+        if pk != exclude:
+            chosen.add(pk)
+    return chosen
+
+
+def _owns_pair(a, b):
+    """Exactly one orientation of every unordered pair is allowed, so a->b and b->a never both exist"""
+    return ((a + b) % 2 == 0) == (a < b)
+
+
+def _insert(model, objs, ignore_conflicts=False):
+    model.objects.bulk_create(objs, batch_size=_state['batch_size'], ignore_conflicts=ignore_conflicts)
+    return len(objs)
+
+
+# Chunk functions: each creates the rows owned by indexes [start, stop) of its parent list
+
+def _users_chunk(start, stop):
+    rng = _rng('users', start)
+    now = _state['now']
+    password = _state['password']
+    return _insert(User, [
+        User(
+            username=f'{SYNTHETIC_PREFIX}{i}',
+            email=f'{SYNTHETIC_PREFIX}{i}@example.com',
+            first_name=rng.choice(FIRST_NAMES),
+            last_name=rng.choice(LAST_NAMES),
+            user_type='alumni' if i == 0 else rng.choices(
+                USER_TYPES, weights=[USER_TYPE_WEIGHTS[user_type] for user_type in USER_TYPES]
+            )[0],
+            location=rng.choice(CITIES),
+            bio=_sentence(rng, 20),
+            password=password,
+            date_joined=_recent(rng, now, days=1500),
+        )
+        for i in range(start, stop)
+    ])
+
+
+def _profiles_chunk(start, stop):
+    rng = _rng('profiles', start)
+    user_pks = _state['user_pks'][start:stop]
+    skills, interests = _state['skill_pks'], _state['interest_pks']
+    chosen = {}
+    profiles = []
+    for offset, user_pk in enumerate(user_pks):
+        user_skills = rng.sample(skills, min(len(skills), rng.randint(2, 6)))
+        user_interests = rng.sample(interests, min(len(interests), rng.randint(1, 3)))
+        chosen[user_pk] = (user_skills, user_interests)
+        graduation_year = rng.randint(1990, timezone.now().year + 4)
+        profiles.append(UserProfile(
+            user_id=user_pk,
+            university_id=rng.choice(_state['university_pks']),
+            graduation_year=graduation_year,
+            degree=rng.choice(['B.Tech', 'B.Sc', 'B.A', 'M.Sc', 'MBA', 'PhD']),
+            major=rng.choice(['Computer Science', 'Economics', 'Design', 'Physics', 'Business']),
+            current_position=rng.choice(POSITIONS),
+            current_company=rng.choice(COMPANIES),
+            industry=rng.choice(INDUSTRIES),
+            experience_years=max(0, timezone.now().year - graduation_year),
+            skills=', '.join(_state['skill_names'][pk] for pk in user_skills),
+            interests=', '.join(_state['interest_names'][pk] for pk in user_interests),
+            is_mentor=start + offset == 0 or rng.random() < 0.15,
+            is_looking_for_mentor=start + offset == 0 or rng.random() < 0.3,
+        ))
+    created = _insert(UserProfile, profiles)
+
+    profile_pks = dict(UserProfile.objects.filter(user_id__in=user_pks).values_list('user_id', 'pk'))
+    created += _insert(ProfileSkill, [
+        ProfileSkill(profile_id=profile_pks[user_pk], skill_id=skill_pk)
+        for user_pk, (user_skills, _) in chosen.items() for skill_pk in user_skills
+    ])
+    created += _insert(ProfileInterest, [
+        ProfileInterest(profile_id=profile_pks[user_pk], interest_id=interest_pk)
+        for user_pk, (_, user_interests) in chosen.items() for interest_pk in user_interests
+    ])
+    return created
+
+
+def _connections_chunk(start, stop):
+    rng = _rng('connections', start)
+    now = _state['now']
+    user_pks = _state['user_pks']
+    mean = _state['volumes']['connections'] / max(1, len(user_pks))
+    rows = []
+    for i in range(start, stop):
+        sender = user_pks[i]
+        degree = _fan_out(rng, mean, cap=len(user_pks) - 1)
+        if i == 0:
+            degree = max(degree, PRIMARY_MIN_DEGREE)
+        # Half of all candidates fall to the other orientation, so draw twice as many
+        for receiver in _pick_users(rng, degree * 2, exclude=sender):
+            if _owns_pair(sender, receiver):
+                rows.append(Connection(
+                    sender_id=sender,
+                    receiver_id=receiver,
+                    status=rng.choices(['accepted', 'pending', 'declined'], weights=[70, 20, 10])[0],
+                    message=_sentence(rng, 8) if rng.random() < 0.4 else '',
+                    created_at=_recent(rng, now),
+                ))
+    return _insert(Connection, rows, ignore_conflicts=True)
+
+
+def _mentorship_chunk(start, stop):
+    rng = _rng('mentorship', start)
+    user_pks = _state['user_pks']
+    mentors = _state['mentor_pks']
+    rows = []
+    for i in range(start, stop):
+        mentee = user_pks[(i * 7919) % len(user_pks)]
+        mentor = user_pks[0] if i < 5 else rng.choice(mentors)
+        if mentee == mentor:
+            continue
+        rows.append(MentorshipRequest(
+            mentee_id=mentee,
+            mentor_id=mentor,
+            subject=_sentence(rng, 4),
+            message=_sentence(rng, 20),
+            status=rng.choices(['pending', 'accepted', 'declined', 'completed'], weights=[40, 30, 15, 15])[0],
+        ))
+    return _insert(MentorshipRequest, rows)
+
+
+def _jobs_chunk(start, stop):
+    rng = _rng('jobs', start)
+    now = _state['now']
+    rows = []
+    for i in range(start, stop):
+        salary_min = rng.randint(30, 150) * 1000
+        rows.append(Job(
+            title=f'{rng.choice(POSITIONS)} {i}',
+            company=rng.choice(COMPANIES),
+            location=rng.choice(CITIES),
+            job_type=rng.choices([value for value, _ in Job.JOB_TYPES], weights=[55, 10, 10, 20, 5])[0],
+            experience_level=rng.choices([value for value, _ in Job.EXPERIENCE_LEVELS], weights=[35, 35, 25, 5])[0],
+            category_id=rng.choice(_state['job_category_pks']),
+            description=_sentence(rng, 60),
+            requirements=_sentence(rng, 30),
+            salary_min=salary_min,
+            salary_max=salary_min + rng.randint(10, 80) * 1000,
+            posted_by_id=_state['user_pks'][0] if i < PRIMARY_JOBS else next(iter(_pick_users(rng, 1))),
+            is_active=rng.random() < 0.85,
+            application_deadline=now + timedelta(days=rng.randint(5, 60)),
+            created_at=_recent(rng, now, days=180),
+        ))
+    return _insert(Job, rows)
+
+
+def _events_chunk(start, stop):
+    rng = _rng('events', start)
+    now = _state['now']
+    rows = []
+    for i in range(start, stop):
+        start_at = now + timedelta(days=rng.randint(-60, 120), hours=rng.randint(0, 23))
+        event_type, event_label = rng.choice(Event.EVENT_TYPES)
+        is_free = rng.random() < 0.7
+        rows.append(Event(
+            title=f'{rng.choice(WORDS).capitalize()} {event_label} {i}',
+            description=_sentence(rng, 50),
+            event_type=event_type,
+            category_id=rng.choice(_state['event_category_pks']),
+            organizer_id=_state['user_pks'][0] if i < PRIMARY_EVENTS else next(iter(_pick_users(rng, 1))),
+            start_datetime=start_at,
+            end_datetime=start_at + timedelta(hours=rng.randint(1, 8)),
+            location=rng.choice(CITIES),
+            is_virtual=rng.random() < 0.3,
+            max_attendees=rng.choice([None, None, 20, 50, 100, 500]),
+            is_free=is_free,
+            price=None if is_free else rng.randint(5, 100),
+        ))
+    return _insert(Event, rows)
+
+
+def _posts_chunk(start, stop):
+    rng = _rng('posts', start)
+    now = _state['now']
+    return _insert(Post, [
+        Post(
+            author_id=_state['user_pks'][0] if i < PRIMARY_POSTS else next(iter(_pick_users(rng, 1))),
+            post_type=rng.choices([value for value, _ in Post.POST_TYPES], weights=[50, 10, 10, 20, 10])[0],
+            title=_sentence(rng, 6) if rng.random() < 0.6 else '',
+            content=_sentence(rng, rng.randint(10, 80)),
+            tags=', '.join(rng.sample(SKILLS, rng.randint(0, 3))),
+            is_pinned=i < 2,
+            created_at=_recent(rng, now),
+        )
+        for i in range(start, stop)
+    ])
+
+
+def _applications_chunk(start, stop):
+    rng = _rng('applications', start)
+    statuses = [value for value, _ in JobApplication.STATUS_CHOICES]
+    mean = _state['volumes']['applications'] / max(1, len(_state['parents']))
+    rows = []
+    for job_pk, created_at in _state['parents'][start:stop]:
+        for applicant in _pick_users(rng, _fan_out(rng, mean, cap=len(_state['user_pks']))):
+            rows.append(JobApplication(
+                job_id=job_pk,
+                applicant_id=applicant,
+                cover_letter=_sentence(rng, 40),
+                status=rng.choices(statuses, weights=[50, 20, 10, 5, 15])[0],
+                applied_at=created_at + timedelta(hours=rng.randint(1, 24 * 30)),
+            ))
+    return _insert(JobApplication, rows, ignore_conflicts=True)
+
+
+def _registrations_chunk(start, stop):
+    rng = _rng('registrations', start)
+    mean = _state['volumes']['registrations'] / max(1, len(_state['parents']))
+    rows = []
+    for event_pk, max_attendees in _state['parents'][start:stop]:
+        attendees = _pick_users(rng, _fan_out(rng, mean, cap=len(_state['user_pks'])))
+        for position, user_pk in enumerate(sorted(attendees)):
+            full = max_attendees is not None and position >= max_attendees
+            rows.append(EventRegistration(
+                event_id=event_pk, user_id=user_pk, status='waitlisted' if full else 'registered',
+            ))
+    return _insert(EventRegistration, rows, ignore_conflicts=True)
+
+
+def _likes_chunk(start, stop):
+    rng = _rng('likes', start)
+    mean = _state['volumes']['likes'] / max(1, len(_state['parents']))
+    rows = []
+    for post_pk, created_at in _state['parents'][start:stop]:
+        for user_pk in _pick_users(rng, _fan_out(rng, mean, cap=len(_state['user_pks']))):
+            rows.append(PostLike(
+                post_id=post_pk, user_id=user_pk, created_at=created_at + timedelta(minutes=rng.randint(1, 4320)),
+            ))
+    return _insert(PostLike, rows, ignore_conflicts=True)
+
+
+def _comments_chunk(start, stop):
+    rng = _rng('comments', start)
+    parents = _state['parents'][start:stop]
+    mean = _state['volumes']['comments'] / max(1, len(_state['parents']))
+    # About a third of comments are replies, some of them nested a level deeper
+    top_level = []
+    for post_pk, created_at in parents:
+        for n in range(_fan_out(rng, mean * 0.65, cap=1000)):
+            top_level.append(Comment(
+                post_id=post_pk, author_id=next(iter(_pick_users(rng, 1))),
+                content=_sentence(rng, rng.randint(5, 40)),
+                created_at=created_at + timedelta(minutes=rng.randint(1, 4320)),
+            ))
+    created = _insert(Comment, top_level)
+
+    post_pks = [post_pk for post_pk, _ in parents]
+    for depth, share in ((1, 0.4), (2, 0.3)):
+        level = Comment.objects.filter(post_id__in=post_pks)
+        level = level.filter(parent__isnull=True) if depth == 1 else level.filter(parent__parent__isnull=True, parent__isnull=False)
+        replies = [
+            Comment(
+                post_id=post_pk, author_id=next(iter(_pick_users(rng, 1))), parent_id=parent_pk,
+                content=_sentence(rng, rng.randint(3, 20)),
+                created_at=created_at + timedelta(minutes=rng.randint(1, 600)),
+            )
+            for parent_pk, post_pk, created_at in level.values_list('pk', 'post_id', 'created_at').iterator()
+            if rng.random() < share
+        ]
+        created += _insert(Comment, replies)
+    return created
+
+
+def _conversations_chunk(start, stop):
+    rng = _rng('conversations', start)
+    now = _state['now']
+    user_pks = _state['user_pks']
+    mean = _state['volumes']['conversations'] / max(1, len(user_pks))
+    rows = []
+    for i in range(start, stop):
+        user = user_pks[i]
+        count = _fan_out(rng, mean, cap=len(user_pks) - 1)
+        if i == 0:
+            count = max(count, PRIMARY_MIN_DEGREE)
+        for other in _pick_users(rng, count * 2, exclude=user):
+            if _owns_pair(user, other):
+                user_one, user_two = Conversation.ordered_pair(user, other)
+                rows.append(Conversation(user_one_id=user_one, user_two_id=user_two, created_at=_recent(rng, now)))
+    return _insert(Conversation, rows, ignore_conflicts=True)
+
+
+def _messages_chunk(start, stop):
+    rng = _rng('messages', start)
+    now = _state['now']
+    parents = _state['parents'][start:stop]
+    mean = _state['volumes']['messages'] / max(1, len(_state['parents']))
+    created = _insert(ConversationParticipant, [
+        ConversationParticipant(conversation_id=conversation_pk, user_id=user_pk)
+        for conversation_pk, user_one, user_two, _ in parents for user_pk in (user_one, user_two)
+    ])
+    rows = []
+    for conversation_pk, user_one, user_two, started_at in parents:
+        sent_at = started_at
+        for _ in range(max(1, _fan_out(rng, mean, cap=5000))):
+            sender, receiver = (user_one, user_two) if rng.random() < 0.5 else (user_two, user_one)
+            sent_at = min(now, sent_at + timedelta(minutes=rng.randint(1, 2880)))
+            rows.append(Message(
+                conversation_id=conversation_pk,
+                sender_id=sender,
+                receiver_id=receiver,
+                subject=_sentence(rng, 4) if rng.random() < 0.3 else '',
+                content=_sentence(rng, rng.randint(3, 60)),
+                is_read=rng.random() < 0.7,
+                created_at=sent_at,
+            ))
+    return created + _insert(Message, rows)
+
+
+# Orchestration
+
+def _init_worker(state):
+    django.setup()
+    _state.clear()
+    _state.update(state)
+
+
+def _run_phase(func, total, workers, log, label, **state):
+    """Run func over [0, total) in chunks of batch_size, in-process or on a worker pool"""
+    _state.update(state)
+    chunk = _state['batch_size']
+    tasks = [(start, min(start + chunk, total)) for start in range(0, total, chunk)]
+    if workers > 1 and len(tasks) > 1:
+        # Each worker opens its own database connection; never share the parent's
+        connections.close_all()
+        with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(dict(_state),)) as pool:
+            created = sum(pool.starmap(func, tasks))
+    else:
+        created = sum(func(start, stop) for start, stop in tasks)
+    log(f'{label}: {created} row(s)')
+    return created
+
+
+def _new_rows(model, since, fields):
+    return list(model.objects.filter(pk__gt=since).order_by('pk').values_list(*fields))
+
+
+def _max_pk(model):
+    return model.objects.aggregate(top=Max('pk'))['top'] or 0
+
+
+def _reference_data(volumes):
+    universities = [
+        University.objects.get_or_create(name=f'{CITIES[i % len(CITIES)]} University {i // len(CITIES) + 1}',
+                                         defaults={'location': CITIES[i % len(CITIES)]})[0].pk
+        for i in range(volumes['universities'])
+    ]
+    skills = {Skill.objects.get_or_create(slug=normalize_tag(name), defaults={'name': name})[0].pk: name
+              for name in SKILLS}
+    interests = {Interest.objects.get_or_create(slug=normalize_tag(name), defaults={'name': name})[0].pk: name
+                 for name in INTERESTS}
+    return {
+        'university_pks': universities,
+        'skill_pks': sorted(skills),
+        'skill_names': skills,
+        'interest_pks': sorted(interests),
+        'interest_names': interests,
+        'job_category_pks': [JobCategory.objects.get_or_create(name=name)[0].pk for name in JOB_CATEGORIES],
+        'event_category_pks': [EventCategory.objects.get_or_create(name=name)[0].pk for name in EVENT_CATEGORIES],
+    }
+
+
+def rebuild_denormalized(log=None):
+    """Rebuild everything bulk_create skipped: counters, connection edges, search index and recommendations"""
+    commands = (
+        ('recount_post_counters', {}),
+        ('recount_event_registrations', {}),
+        ('recount_conversations', {}),
+        ('rebuild_connection_graph', {}),
+        ('rebuild_search_index', {}),
+        ('refresh_mentor_matches', {'full': True}),
+        ('refresh_job_recommendations', {'full': True}),
+    )
+    for command, options in commands:
+        call_command(command, stdout=io.StringIO(), **options)
+        if log:
+            log(f'{command}: done')
+
+
+def generate(volumes=None, seed=0, workers=1, batch_size=DEFAULT_BATCH_SIZE, rebuild=True, log=None):
+    """
+    Generate a synthetic dataset and return the number of rows created per
+    table. The database must not already contain synthetic users.
+    """
+    log = log or (lambda message: None)
+    volumes = dict(DEFAULT_VOLUMES, **(volumes or {}))
+    if connection.vendor == 'sqlite' and workers > 1:
+        # SQLite takes one writer at a time, so extra processes would only queue on its lock
+        log('SQLite allows a single writer; generating in one process.')
+        workers = 1
+
+    _state.clear()
+    _state.update(
+        seed=seed,
+        batch_size=batch_size,
+        volumes=volumes,
+        now=timezone.now(),
+        password=make_password(SYNTHETIC_PASSWORD),
+        **_reference_data(volumes),
+    )
+    created = {}
+
+    created['users'] = _run_phase(_users_chunk, volumes['users'], workers, log, 'users')
+    users = sorted(
+        User.objects.filter(username__startswith=SYNTHETIC_PREFIX).values_list('username', 'pk'),
+        key=lambda row: int(row[0][len(SYNTHETIC_PREFIX):]),
+    )
+    user_pks = [pk for _, pk in users]
+    _state.update(user_pks=user_pks, user_weights=_zipf_weights(len(user_pks)))
+
+    created['profiles'] = _run_phase(_profiles_chunk, len(user_pks), workers, log, 'profiles and tags')
+    created['connections'] = _run_phase(_connections_chunk, len(user_pks), workers, log, 'connections')
+    mentors = list(UserProfile.objects.filter(user_id__in=user_pks[:50000], is_mentor=True)
+                   .values_list('user_id', flat=True)) or user_pks[:1]
+    created['mentorship_requests'] = _run_phase(
+        _mentorship_chunk, volumes['mentorship_requests'], workers, log, 'mentorship requests', mentor_pks=mentors
+    )
+
+    since = _max_pk(Job)
+    created['jobs'] = _run_phase(_jobs_chunk, volumes['jobs'], workers, log, 'jobs')
+    jobs = _new_rows(Job, since, ('pk', 'created_at'))
+    created['applications'] = _run_phase(_applications_chunk, len(jobs), workers, log, 'applications', parents=jobs)
+
+    since = _max_pk(Event)
+    created['events'] = _run_phase(_events_chunk, volumes['events'], workers, log, 'events')
+    events = _new_rows(Event, since, ('pk', 'max_attendees'))
+    created['registrations'] = _run_phase(
+        _registrations_chunk, len(events), workers, log, 'registrations', parents=events
+    )
+
+    since = _max_pk(Post)
+    created['posts'] = _run_phase(_posts_chunk, volumes['posts'], workers, log, 'posts')
+    posts = _new_rows(Post, since, ('pk', 'created_at'))
+    created['likes'] = _run_phase(_likes_chunk, len(posts), workers, log, 'likes', parents=posts)
+    created['comments'] = _run_phase(_comments_chunk, len(posts), workers, log, 'comments', parents=posts)
+
+    since = _max_pk(Conversation)
+    created['conversations'] = _run_phase(_conversations_chunk, len(user_pks), workers, log, 'conversations')
+    conversations = _new_rows(Conversation, since, ('pk', 'user_one_id', 'user_two_id', 'created_at'))
+    created['messages'] = _run_phase(
+        _messages_chunk, len(conversations), workers, log, 'participants and messages', parents=conversations
+    )
+
+    if rebuild:
+        rebuild_denormalized(log)
+    _state.clear()
+    return created
+
+
+def seed_dataset(scale=1, seed=0):
+    """Seed an empty database with the benchmark dataset, times scale, and return a SeedResult"""
+    generate({name: max(1, int(count * scale)) for name, count in BENCHMARK_VOLUMES.items()}, seed=seed)
+
+    primary = User.objects.get(username=f'{SYNTHETIC_PREFIX}0')
+    samples = {
+        'user': User.objects.get(username=f'{SYNTHETIC_PREFIX}1'),
+        'post': Post.objects.filter(author=primary).order_by('pk').first(),
+        'job': Job.objects.filter(posted_by=primary).order_by('pk').first(),
+        'application': JobApplication.objects.filter(job__posted_by=primary).order_by('pk').first(),
+        'event': Event.objects.filter(organizer=primary).order_by('pk').first(),
+        'connection': Connection.objects.filter(Q(receiver=primary) | Q(sender=primary)).order_by('pk').first(),
+        'conversation': Conversation.objects.filter(participants__user=primary).order_by('pk').first(),
+        'message': Message.objects.filter(receiver=primary).order_by('pk').first(),
+        'mentorship_request': MentorshipRequest.objects.filter(mentor=primary).order_by('pk').first(),
+    }
+    # Generated applications have no files; give the sample one so resume downloads stream something
+    if samples['application'] is not None:
+        samples['application'].resume.save('sample-resume.pdf', ContentFile(SAMPLE_RESUME))
+    # Nothing generated notifies anyone; an unread one lets opening a notification be measured
+    notify(
+        primary.pk, 'connection_request', f"{samples['user'].get_full_name()} wants to connect with you.",
+        url=reverse('accounts:user_profile', kwargs={'username': samples['user'].username}),
+        actor_id=samples['user'].pk,
+    )
+    samples['notification'] = Notification.objects.filter(recipient=primary).order_by('-pk').first()
+    row_counts = {
+        model._meta.label: model.objects.count()
+        for model in (User, Connection, Job, JobApplication, Event, EventRegistration,
+                      Post, PostLike, Comment, Conversation, Message)
+    }
+    return SeedResult(row_counts, primary, samples)
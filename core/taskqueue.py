@@ -0,0 +1,199 @@
+"""
+Database-backed background task queue.
+
+Side effects that do not have to finish inside the request (emails, fan-out,
+recomputing derived data) are registered with @task in an app's tasks.py
+and queued with `func.enqueue(...)`. Each call writes one core.Task row in
+the caller's transaction, so a task is queued exactly when the write that
+caused it commits, and no broker beyond the database is needed.
+`manage.py run_worker` runs the queue.
+
+Claiming is a compare-and-set UPDATE from 'queued' to 'running' under a
+per-claim token, with SELECT ... FOR UPDATE SKIP LOCKED where the database
+supports it, so any number of worker threads and processes can share the
+table. A task that raises is retried with exponential backoff
+(backoff * 2 ** (attempt - 1) seconds plus jitter) until max_attempts, then
+left as 'failed' with its traceback. A task whose worker died is reclaimed
+after CLAIM_TIMEOUT. Live workers refresh their claims every few minutes
+(heartbeat()), and run_task() checks that the claim is still its own both
+before starting and when recording the outcome. So a task that was reclaimed
+is neither started nor recorded by the worker that lost it.
+
+An idempotency key makes enqueue a no-op while a task with the same key
+exists, including finished ones until they are pruned after RETENTION, so
+"send the welcome email for user 42" is queued once however often the
+caller asks. debounce_key() builds keys that coalesce a burst of requests
+into one run instead. Task bodies should still be safe to run twice: a
+worker that dies after the work but before marking it done gets it again.
+
+With TASKS_ALWAYS_EAGER the task runs in-process right after the commit
+instead, for development without a worker.
+"""
+import logging
+import random
+import traceback
+import uuid
+from datetime import timedelta
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from .models import Task
+
+logger = logging.getLogger('gradlink.tasks')
+
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_BACKOFF = 30
+MAX_BACKOFF = 60 * 60 * 6
+CLAIM_TIMEOUT = timedelta(minutes=15)
+RETENTION = timedelta(days=7)
+
+_registry = {}
+
+
+class TaskFunction:
+    """A registered task: call it to run inline, or enqueue() it for a worker"""
+
+    def __init__(self, func, name, max_attempts, backoff):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.__doc__ = func.__doc__
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def enqueue(self, *args, idempotency_key=None, delay=None, **kwargs):
+        """Queue one run with JSON-serialisable arguments; returns the Task row"""
+        fields = {
+            'name': self.name,
+            'payload': {'args': list(args), 'kwargs': kwargs},
+            'max_attempts': self.max_attempts,
+            'run_after': timezone.now() + (delay or timedelta()),
+        }
+        if idempotency_key is None:
+            queued = Task.objects.create(**fields)
+        else:
+            queued, created = Task.objects.get_or_create(idempotency_key=idempotency_key, defaults=fields)
+            if not created:
+                return queued
+        if getattr(settings, 'TASKS_ALWAYS_EAGER', False):
+            transaction.on_commit(lambda: run_task(queued.pk))
+        return queued
+
+
+def task(name=None, max_attempts=DEFAULT_MAX_ATTEMPTS, backoff=DEFAULT_BACKOFF):
+    """Register a function as a background task under `name` (default: module.function)"""
+    def register(func):
+        task_name = name or f'{func.__module__}.{func.__name__}'
+        registered = TaskFunction(func, task_name, max_attempts, backoff)
+        _registry[task_name] = registered
+        return registered
+    return register
+
+
+def debounce_key(name, window):
+    """
+    Idempotency key shared by every enqueue of `name` within one `window`.
+    Enqueued with delay=window, a burst of requests becomes one run after the burst.
+    """
+    bucket = int(timezone.now().timestamp() // window.total_seconds())
+    return f'{name}:{bucket}'
+
+
+def retry_delay(attempts, backoff):
+    """Seconds to wait before attempt number `attempts` + 1"""
+    delay = min(backoff * 2 ** (attempts - 1), MAX_BACKOFF)
+    return delay + random.uniform(0, delay / 10)
+
+
+def claim(worker_id, limit=1):
+    """Mark up to `limit` due tasks as running for this worker; returns the claim token and their ids"""
+    now = timezone.now()
+    token = f'{worker_id}:{uuid.uuid4().hex[:8]}'
+    due = Task.objects.filter(status='queued', run_after__lte=now).order_by('run_after', 'pk')
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        ids = list(due.values_list('pk', flat=True)[:limit])
+        if not ids:
+            return token, []
+        # status='queued' again in the WHERE makes this a compare-and-set on databases without row locks
+        Task.objects.filter(pk__in=ids, status='queued').update(
+            status='running', claimed_by=token, claimed_at=now,
+        )
+    claimed = Task.objects.filter(pk__in=ids, claimed_by=token, status='running')
+    return token, list(claimed.values_list('pk', flat=True))
+
+
+def run_task(task_id, token=None):
+    """
+    Run one task and record the outcome; returns the new status. A worker
+    passes the token it claimed the task under, and gets None back if the
+    claim was reclaimed in the meantime. Without a token (eager mode) the
+    task runs unconditionally.
+    """
+    mine = Task.objects.filter(pk=task_id)
+    if token is not None:
+        mine = mine.filter(claimed_by=token, status='running')
+        # Restart the claim's clock: earlier tasks in the batch may have taken a while
+        if not mine.update(claimed_at=timezone.now()):
+            logger.warning('Task #%s was reclaimed before it started; skipping it', task_id)
+            return None
+    queued = Task.objects.get(pk=task_id)
+    registered = _registry.get(queued.name)
+    attempts = queued.attempts + 1
+    try:
+        if registered is None:
+            raise LookupError(f'No task registered as {queued.name!r}')
+        registered.func(*queued.payload.get('args', ()), **queued.payload.get('kwargs', {}))
+    except Exception:
+        error = traceback.format_exc()
+        backoff = registered.backoff if registered else DEFAULT_BACKOFF
+        if registered is not None and attempts < queued.max_attempts:
+            status = 'queued'
+            updates = {'run_after': timezone.now() + timedelta(seconds=retry_delay(attempts, backoff))}
+            logger.warning('Task %s #%s failed (attempt %s), retrying', queued.name, task_id, attempts)
+        else:
+            status = 'failed'
+            updates = {'finished_at': timezone.now()}
+            logger.error('Task %s #%s failed permanently after %s attempt(s)', queued.name, task_id, attempts)
+        recorded = mine.update(
+            status=status, attempts=attempts, last_error=error, claimed_by='', claimed_at=None, **updates,
+        )
+    else:
+        status = 'done'
+        recorded = mine.update(
+            status=status, attempts=attempts, finished_at=timezone.now(), claimed_by='', claimed_at=None,
+        )
+    if not recorded:
+        # Another worker reclaimed it mid-run and owns the outcome now
+        logger.warning('Task %s #%s finished after its claim was lost; outcome not recorded', queued.name, task_id)
+        return None
+    return status
+
+
+def heartbeat(worker_id):
+    """Refresh every claim held by a live worker process, so reclaim_stale() leaves them alone"""
+    return Task.objects.filter(status='running', claimed_by__startswith=f'{worker_id}:').update(
+        claimed_at=timezone.now(),
+    )
+
+
+def reclaim_stale():
+    """Requeue tasks whose worker stopped without finishing them"""
+    return Task.objects.filter(status='running', claimed_at__lt=timezone.now() - CLAIM_TIMEOUT).update(
+        status='queued', claimed_by='', claimed_at=None,
+    )
+
+
+def prune_finished():
+    """Delete finished tasks older than RETENTION, releasing their idempotency keys"""
+    deleted, _ = Task.objects.filter(
+        status__in=('done', 'failed'), finished_at__lt=timezone.now() - RETENTION,
+    ).delete()
+    return deleted
+
+
+def registered_tasks():
+    return dict(_registry)
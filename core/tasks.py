@@ -0,0 +1,47 @@
+from datetime import timedelta
+from django.apps import apps
+from .images import process
+from .media import GC_GRACE, collect_garbage
+from .models import MediaFile
+from .panels import bump_panel, bump_user_panel
+from .taskqueue import debounce_key, task
+
+# Unreferenced media is collected at most once per window
+MEDIA_GC_WINDOW = timedelta(minutes=30)
+
+# Cached panels that show each model's images, refreshed once variants exist
+IMAGE_PANELS = {
+    'events.Event': 'events',
+    'community.Post': 'posts',
+}
+
+@task()
+def process_image(model_label, pk, field_name):
+    """Generate the resized and WebP variants of one uploaded image"""
+    instance = apps.get_model(model_label)._default_manager.filter(pk=pk).first()
+    if instance is None or not process(instance, field_name):
+        return
+    if model_label in IMAGE_PANELS:
+        bump_panel(IMAGE_PANELS[model_label])
+    elif model_label == 'accounts.User':
+        bump_user_panel(pk)
+
+def schedule_image_processing(instance, field_name):
+    name = getattr(instance, field_name).name
+    process_image.enqueue(
+        instance._meta.label, instance.pk, field_name,
+        idempotency_key=f'image:{instance._meta.label}:{instance.pk}:{field_name}:{name}',
+    )
+
+@task()
+def collect_media_garbage():
+    """Delete media files no row references any more"""
+    collect_garbage()
+    # Unreferenced files still inside their grace period need a later run
+    if MediaFile.objects.filter(ref_count=0).exists():
+        schedule_media_collection(GC_GRACE)
+
+def schedule_media_collection(delay=MEDIA_GC_WINDOW):
+    collect_media_garbage.enqueue(
+        idempotency_key=debounce_key(collect_media_garbage.name, delay), delay=delay,
+    )
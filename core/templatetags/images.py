@@ -0,0 +1,27 @@
+from django import template
+from django.utils.html import format_html
+from core.images import ready_variant, variant_url
+
+register = template.Library()
+
+@register.simple_tag
+def image_url(field_file, size, fmt='webp'):
+    """
+    URL of a resized variant of an image field, e.g.
+    {% image_url member.profile_picture 'md' %}. fmt is 'webp' or 'fallback'
+    (JPEG/PNG); the original's URL is used until the variant exists.
+    """
+    return variant_url(field_file, size, fmt)
+
+
+@register.simple_tag
+def webp_source(field_file, size):
+    """
+    The WebP <source> for a <picture> whose <img> uses the fallback, e.g.
+    <picture>{% webp_source post.image 'md' %}
+    <img src="{% image_url post.image 'md' 'fallback' %}"></picture>.
+    Empty until the variant exists, leaving the <img> on the original.
+    """
+    if ready_variant(field_file, size) is None:
+        return ''
+    return format_html('<source type="image/webp" srcset="{}">', variant_url(field_file, size))
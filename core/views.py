@@ -1,9 +1,17 @@
+from functools import partial
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
 from jobs.models import Job
+from jobs.recommendations import recommended_jobs
 from events.models import Event
+from community.conversations import unread_total
 from community.models import Post
+from alumni.models import ConnectionEdge
 from django.utils import timezone
+from .panels import PANEL_TIMEOUT, panel_versions, user_panel_version
+
+# Querysets below stay lazy: the templates only evaluate them when their
+# {% cache %} fragment misses.
 
 def home_view(request):
     """Home page view"""
@@ -13,20 +21,30 @@ def home_view(request):
             start_datetime__gt=timezone.now(),
             is_active=True
         )[:4],
-        'recent_posts': Post.objects.filter(is_active=True)[:5],
+        'recent_posts': Post.objects.filter(is_active=True).select_related('author')[:5],
+        'panel_versions': panel_versions(),
+        'panel_timeout': PANEL_TIMEOUT,
     }
     return render(request, 'core/home.html', context)
 
 @login_required
 def dashboard_view(request):
     """User dashboard"""
+    user = request.user
     context = {
-        'user': request.user,
+        'user': user,
         'recent_jobs': Job.objects.filter(is_active=True)[:5],
         'upcoming_events': Event.objects.filter(
             start_datetime__gt=timezone.now(),
             is_active=True
         )[:3],
-        'recent_posts': Post.objects.filter(is_active=True)[:4],
+        'recent_posts': Post.objects.filter(is_active=True).select_related('author')[:4],
+        # Bound .count methods, so the template only runs them on a cache miss
+        'connection_count': ConnectionEdge.objects.filter(user=user).count,
+        'recommended_jobs': recommended_jobs(user)[:5],
+        'unread_message_count': partial(unread_total, user),
+        'panel_versions': panel_versions(),
+        'user_panel_version': user_panel_version(user.pk),
+        'panel_timeout': PANEL_TIMEOUT,
     }
-    return render(request, 'accounts\dashboard.html', context)
+    return render(request, 'accounts/dashboard.html', context)
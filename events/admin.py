@@ -8,7 +8,7 @@ class EventCategoryAdmin(admin.ModelAdmin):
 
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
-    list_display = ('title', 'event_type', 'organizer', 'start_datetime', 'location', 'is_active')
+    list_display = ('title', 'event_type', 'organizer', 'start_datetime', 'location', 'registered_count', 'max_attendees', 'is_active')
     list_filter = ('event_type', 'is_active', 'is_virtual', 'is_free', 'start_datetime')
     search_fields = ('title', 'description', 'location', 'organizer__username')
     readonly_fields = ('created_at', 'updated_at')
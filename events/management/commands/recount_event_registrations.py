@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from events.models import Event, EventRegistration
+
+UPDATE_BATCH = 1000
+
+
+def _registered_subquery():
+    counts = (
+        EventRegistration.objects.filter(event=OuterRef('pk'), status='registered')
+        .order_by()
+        .values('event')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+class Command(BaseCommand):
+    help = 'Reconcile Event.registered_count with the actual registrations'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many events have drifted counters',
+        )
+
+    def handle(self, *args, **options):
+        drifted = (
+            Event.objects.annotate(actual=_registered_subquery())
+            .exclude(registered_count=F('actual'))
+            .order_by()
+        )
+
+        if options['dry_run']:
+            self.stdout.write(f'{drifted.count()} event(s) have drifted counters.')
+            return
+
+        # The ids are read first: MySQL refuses an UPDATE whose WHERE selects
+        # from the table being updated (error 1093)
+        drifted_ids = list(drifted.values_list('pk', flat=True))
+        drift_count = len(drifted_ids)
+        for start in range(0, drift_count, UPDATE_BATCH):
+            Event.objects.filter(pk__in=drifted_ids[start:start + UPDATE_BATCH]).update(
+                registered_count=_registered_subquery()
+            )
+        self.stdout.write(self.style.SUCCESS(f'Reconciled counters on {drift_count} event(s).'))
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:15
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_registered_count(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    EventRegistration = apps.get_model('events', 'EventRegistration')
+    counts = (
+        EventRegistration.objects.filter(event=OuterRef('pk'), status='registered')
+        .order_by().values('event').annotate(total=Count('pk')).values('total')
+    )
+    Event.objects.update(registered_count=Coalesce(Subquery(counts, output_field=IntegerField()), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='registered_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='eventregistration',
+            name='status',
+            field=models.CharField(choices=[('registered', 'Registered'), ('waitlisted', 'Waitlisted'), ('attended', 'Attended'), ('cancelled', 'Cancelled')], default='registered', max_length=20),
+        ),
+        migrations.RunPython(backfill_registered_count, migrations.RunPython.noop),
+    ]
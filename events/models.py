@@ -15,6 +15,13 @@ class EventCategory(models.Model):
     def __str__(self):
         return self.name
 
+class EventQuerySet(models.QuerySet):
+    def with_attendee_count(self):
+        """Annotate the live number of 'registered' attendees onto each event"""
+        return self.annotate(
+            annotated_attendee_count=models.Count('registrations', filter=models.Q(registrations__status='registered'))
+        )
+
 class Event(models.Model):
     """Events and meetups model"""
     
@@ -42,12 +49,21 @@ class Event(models.Model):
     is_free = models.BooleanField(default=True)
     price = models.DecimalField(max_digits=8, decimal_places=2, blank=True, null=True)
     image = models.ImageField(upload_to='event_images/', blank=True, null=True)
+    # Resized and WebP copies of image, written by core.images
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     is_active = models.BooleanField(default=True)
+    # Number of 'registered' rows, maintained under a row lock by events.registration
+    registered_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = EventQuerySet.as_manager()
+
     class Meta:
         ordering = ['start_datetime']
+        indexes = [
+            models.Index(fields=['is_active', 'start_datetime'], name='events_active_start_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -58,13 +74,20 @@ class Event(models.Model):
 
     @property
     def attendee_count(self):
-        return self.registrations.filter(status='registered').count()
+        # Prefer the exact count from EventQuerySet.with_attendee_count() when present
+        annotated = getattr(self, 'annotated_attendee_count', None)
+        return self.registered_count if annotated is None else annotated
+
+    @property
+    def is_full(self):
+        return bool(self.max_attendees) and self.registered_count >= self.max_attendees
 
 class EventRegistration(models.Model):
     """Event registrations model"""
     
     STATUS_CHOICES = (
         ('registered', 'Registered'),
+        ('waitlisted', 'Waitlisted'),
         ('attended', 'Attended'),
         ('cancelled', 'Cancelled'),
     )
@@ -77,6 +100,9 @@ class EventRegistration(models.Model):
 
     class Meta:
         unique_together = ('event', 'user')
+        indexes = [
+            models.Index(fields=['event', 'status'], name='events_reg_event_status_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} -> {self.event.title}"
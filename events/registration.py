@@ -0,0 +1,104 @@
+"""
+Registration engine for events.
+
+Every capacity decision happens inside a transaction holding a row lock on
+the Event (SELECT ... FOR UPDATE), so concurrent sign-ups are serialized per
+event and can never oversell it. Event.registered_count, which lets listings
+show attendance without a COUNT per card, is kept in step with the
+'registered' rows by events.signals, so registrations saved or deleted
+anywhere else (the admin, a deleted profile's cascade) are counted too.
+
+When an event is full, new sign-ups join a waitlist; a freed seat is handed
+to the earliest waitlisted user. Seats freed outside unregister() are
+refilled by events.signals once the deleting transaction commits.
+"""
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import Event, EventRegistration
+
+REGISTERED = 'registered'
+WAITLISTED = 'waitlisted'
+
+
+class RegistrationError(Exception):
+    """Raised when a user cannot register for an event; the message is user-facing"""
+
+
+def _lock_event(event_id):
+    return Event.objects.select_for_update().get(pk=event_id, is_active=True)
+
+
+def _promote_waitlisted(event, seats):
+    """Move up to `seats` waitlisted users onto the attendee list. Caller holds the event lock."""
+    if seats <= 0:
+        return []
+    promoted = list(
+        event.registrations.filter(status=WAITLISTED)
+        .order_by('registered_at', 'pk')
+        .values_list('pk', flat=True)[:seats]
+    )
+    if promoted:
+        # A bulk update, so no signals: the count is adjusted here
+        EventRegistration.objects.filter(pk__in=promoted).update(status=REGISTERED, updated_at=timezone.now())
+        Event.objects.filter(pk=event.pk).update(registered_count=F('registered_count') + len(promoted))
+    return promoted
+
+
+def register(event_id, user):
+    """
+    Register user for the event, or waitlist them if it is full.
+    Returns the resulting registration status.
+    """
+    with transaction.atomic():
+        event = _lock_event(event_id)
+
+        if event.organizer_id == user.pk:
+            raise RegistrationError('Event organizers cannot register for their own events.')
+        if event.registration_deadline and timezone.now() > event.registration_deadline:
+            raise RegistrationError('Registration for this event has closed.')
+        if EventRegistration.objects.filter(event=event, user=user).exists():
+            raise RegistrationError('You are already registered for this event.')
+
+        status = WAITLISTED if event.is_full else REGISTERED
+        EventRegistration.objects.create(event=event, user=user, status=status)
+        return status
+
+
+def unregister(event_id, user):
+    """
+    Remove the user's registration. If it held a seat, the seat goes to the
+    next waitlisted user. Returns False if the user had no registration.
+    """
+    with transaction.atomic():
+        event = _lock_event(event_id)
+        registration = EventRegistration.objects.filter(event=event, user=user).first()
+        if registration is None:
+            return False
+
+        # events.signals takes the seat off registered_count
+        registration.delete()
+        if registration.status == REGISTERED:
+            event.refresh_from_db(fields=['registered_count'])
+            _promote_waitlisted(event, 1)
+        return True
+
+
+def fill_from_waitlist(event_id):
+    """Promote waitlisted users into any free seats, e.g. after capacity was raised"""
+    with transaction.atomic():
+        event = _lock_event(event_id)
+        if not event.max_attendees:
+            seats = event.registrations.filter(status=WAITLISTED).count()
+        else:
+            seats = event.max_attendees - event.registered_count
+        return _promote_waitlisted(event, seats)
+
+
+def waitlist_position(registration):
+    """1-based position of a waitlisted registration"""
+    return EventRegistration.objects.filter(
+        event_id=registration.event_id,
+        status=WAITLISTED,
+        registered_at__lte=registration.registered_at,
+    ).exclude(registered_at=registration.registered_at, pk__gt=registration.pk).count()
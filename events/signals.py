@@ -0,0 +1,46 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from core.counters import decrement
+from .models import Event, EventRegistration
+from .registration import REGISTERED, fill_from_waitlist
+
+def _adjust_registered(event_id, delta):
+    value = F('registered_count') + delta if delta >= 0 else decrement('registered_count', -delta)
+    Event.objects.filter(pk=event_id).update(registered_count=value)
+
+def _refill(event_id):
+    try:
+        fill_from_waitlist(event_id)
+    except Event.DoesNotExist:
+        # Deleted along with its registrations, or deactivated
+        pass
+
+@receiver(pre_save, sender=EventRegistration)
+def remember_registration_status(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        instance._stored_status = None
+    else:
+        instance._stored_status = sender.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+
+@receiver(post_save, sender=EventRegistration)
+def count_saved_registration(sender, instance, raw=False, **kwargs):
+    # Covers admin edits as well as events.registration; its bulk promotions count themselves
+    if raw:
+        return
+    delta = (instance.status == REGISTERED) - (getattr(instance, '_stored_status', None) == REGISTERED)
+    if delta:
+        _adjust_registered(instance.event_id, delta)
+    if delta < 0:
+        transaction.on_commit(lambda: _refill(instance.event_id))
+
+@receiver(post_delete, sender=EventRegistration)
+def count_deleted_registration(sender, instance, origin=None, **kwargs):
+    # Cascades (a deleted profile) and admin deletes free the seat too, unless
+    # the event itself is what is being deleted
+    if isinstance(origin, Event) or getattr(origin, 'model', None) is Event:
+        return
+    if instance.status == REGISTERED:
+        _adjust_registered(instance.event_id, -1)
+        transaction.on_commit(lambda: _refill(instance.event_id))
@@ -4,8 +4,10 @@ from django.contrib import messages
 from django.db.models import Q
 from django.core.paginator import Paginator
 from django.utils import timezone
+from core.pagination import CursorPaginator, EVENT_ORDERING, wants_cursor
 from .models import Event, EventCategory, EventRegistration
 from .forms import EventForm
+from . import registration
 
 def event_list_view(request):
     """Events listing with search and filtering"""
@@ -45,9 +47,12 @@ def event_list_view(request):
         events = events.filter(is_virtual=False)
     
     # Pagination
-    paginator = Paginator(events, 12)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    if wants_cursor(request):
+        page_obj = CursorPaginator(events, EVENT_ORDERING, 12).page(request.GET.get('cursor'), request.GET)
+    else:
+        paginator = Paginator(events, 12)
+        page_number = request.GET.get('page')
+        page_obj = paginator.get_page(page_number)
     
     # Get filter options
     categories = EventCategory.objects.all().order_by('name')
@@ -71,51 +76,43 @@ def event_detail_view(request, event_id):
     
     # Check if user is registered
     is_registered = False
-    registration = None
+    user_registration = None
+    waitlist_position = None
     is_organizer = False
     if request.user.is_authenticated:
         is_organizer = event.organizer == request.user
         try:
-            registration = EventRegistration.objects.get(event=event, user=request.user)
+            user_registration = EventRegistration.objects.get(event=event, user=request.user)
             is_registered = True
+            if user_registration.status == registration.WAITLISTED:
+                waitlist_position = registration.waitlist_position(user_registration)
         except EventRegistration.DoesNotExist:
             pass
     
     context = {
         'event': event,
         'is_registered': is_registered,
-        'registration': registration,
+        'registration': user_registration,
+        'waitlist_position': waitlist_position,
         'is_organizer': is_organizer,  # Pass organizer status to template
     }
     return render(request, 'events/event_detail.html', context)
 
 @login_required
 def register_for_event(request, event_id):
-    """Register for an event"""
+    """Register for an event (or join its waitlist when full)"""
     event = get_object_or_404(Event, id=event_id, is_active=True)
     
-    if event.organizer == request.user:
-        messages.error(request, 'Event organizers cannot register for their own events.')
-        return redirect('events:event_detail', event_id=event.id)
-    
-    # Check if registration is still open
-    if event.registration_deadline and timezone.now() > event.registration_deadline:
-        messages.error(request, 'Registration for this event has closed.')
-        return redirect('events:event_detail', event_id=event.id)
-    
-    # Check if event is full
-    if event.max_attendees and event.attendee_count >= event.max_attendees:
-        messages.error(request, 'This event is full.')
-        return redirect('events:event_detail', event_id=event.id)
-    
-    # Check if user is already registered
-    if EventRegistration.objects.filter(event=event, user=request.user).exists():
-        messages.warning(request, 'You are already registered for this event.')
+    try:
+        status = registration.register(event.id, request.user)
+    except registration.RegistrationError as e:
+        messages.error(request, str(e))
         return redirect('events:event_detail', event_id=event.id)
     
-    # Create registration
-    EventRegistration.objects.create(event=event, user=request.user)
-    messages.success(request, 'You have successfully registered for this event!')
+    if status == registration.WAITLISTED:
+        messages.info(request, 'This event is full. You have been added to the waitlist.')
+    else:
+        messages.success(request, 'You have successfully registered for this event!')
     return redirect('events:event_detail', event_id=event.id)
 
 @login_required
@@ -123,11 +120,9 @@ def unregister_from_event(request, event_id):
     """Unregister from an event"""
     event = get_object_or_404(Event, id=event_id, is_active=True)
     
-    try:
-        registration = EventRegistration.objects.get(event=event, user=request.user)
-        registration.delete()
+    if registration.unregister(event.id, request.user):
         messages.success(request, 'You have successfully unregistered from this event.')
-    except EventRegistration.DoesNotExist:
+    else:
         messages.error(request, 'You are not registered for this event.')
     
     return redirect('events:event_detail', event_id=event.id)
@@ -160,6 +155,8 @@ def edit_event(request, event_id):
         form = EventForm(request.POST, request.FILES, instance=event)
         if form.is_valid():
             form.save()
+            # Raised (or removed) capacity may free seats for waitlisted users
+            registration.fill_from_waitlist(event.id)
             messages.success(request, 'Event updated successfully!')
             return redirect('events:event_detail', event_id=event.id)
     else:
@@ -175,7 +172,7 @@ def edit_event(request, event_id):
 @login_required
 def delete_event(request, event_id):
     """Delete an event"""
-    event = get_object_or_404(Event, id=event_id, organizer=request.user)
+    event = get_object_or_404(Event.objects.with_attendee_count(), id=event_id, organizer=request.user)
     
     if request.method == 'POST':
         event_title = event.title
@@ -192,13 +189,13 @@ def delete_event(request, event_id):
 def my_events(request):
     """View user's events (organized and registered)"""
     # Events organized by user
-    organized_events = Event.objects.filter(organizer=request.user).order_by('-created_at')
+    organized_events = Event.objects.filter(organizer=request.user).with_attendee_count().order_by('-created_at')
     
     # Events user is registered for
     registered_events = Event.objects.filter(
         registrations__user=request.user,
         registrations__status='registered'
-    ).order_by('start_datetime')
+    ).select_related('organizer').order_by('start_datetime')
     
     context = {
         'organized_events': organized_events,
@@ -31,10 +31,12 @@ INSTALLED_APPS = [
     'jobs',
     'events',
     'community',
+    'notifications',
     'core',
 ]
 
 MIDDLEWARE = [
+    'core.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -80,8 +82,27 @@ DATABASES = {
     }
 }
 
+# GRADLINK_SQLITE=1 swaps in a local SQLite file, e.g. to run
+# `manage.py check_view_budgets` without a MySQL server.
+if os.environ.get('GRADLINK_SQLITE'):
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+        }
+    }
+
 
 
+# Cache used for the home/dashboard panels and job facets. LocMemCache is
+# per-process; point this at a shared backend (Memcached/Redis) when running
+# more than one worker so invalidations reach every process.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'gradlink-default',
+    }
+}
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -116,6 +137,12 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Uploads are stored once per distinct content and garbage-collected (core.storage, core.media)
+STORAGES = {
+    'default': {'BACKEND': 'core.storage.ContentAddressedStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -129,3 +156,16 @@ LOGOUT_REDIRECT_URL = '/'
 
 # Email settings (for development)
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+
+# Background tasks (core.taskqueue) are run by `manage.py run_worker`.
+# GRADLINK_TASKS_EAGER=1 runs each task in-process right after its
+# transaction commits instead, for development without a worker.
+TASKS_ALWAYS_EAGER = os.environ.get('GRADLINK_TASKS_EAGER') == '1'
+
+# Request profiling (core.profiling). Off unless GRADLINK_PROFILING=1; when on,
+# each sampled request gets a Server-Timing header and a line in the JSONL log.
+PROFILING_ENABLED = os.environ.get('GRADLINK_PROFILING') == '1'
+PROFILING_SAMPLE_RATE = float(os.environ.get('GRADLINK_PROFILING_SAMPLE_RATE', '1.0'))
+PROFILING_LOG_FILE = BASE_DIR / 'logs' / 'profiling.jsonl'
+PROFILING_LOG_MAX_BYTES = 10 * 1024 * 1024
+PROFILING_LOG_BACKUPS = 5
@@ -14,6 +14,7 @@ urlpatterns = [
     path('jobs/', include('jobs.urls')),
     path('events/', include('events.urls')),
     path('community/', include('community.urls')),
+    path('notifications/', include('notifications.urls')),
 ]
 
 if settings.DEBUG:
@@ -1,5 +1,6 @@
-from django.contrib import admin
-from .models import JobCategory, Job, JobApplication
+from django.contrib import admin, messages
+from .models import ApplicationStatusChange, JobCategory, Job, JobApplication, JobRecommendation
+from .pipeline import transition
 
 @admin.register(JobCategory)
 class JobCategoryAdmin(admin.ModelAdmin):
@@ -13,8 +14,34 @@ class JobAdmin(admin.ModelAdmin):
     search_fields = ('title', 'company', 'location', 'description')
     readonly_fields = ('created_at', 'updated_at')
 
+def status_action(status, label):
+    """Admin action moving the selected applications to `status` in bulk"""
+    def action(modeladmin, request, queryset):
+        changed = transition(queryset, status, request.user)
+        modeladmin.message_user(request, f'Moved {changed} application(s) to {label}.', messages.SUCCESS)
+    action.__name__ = f'mark_{status}'
+    action.short_description = f'Move selected applications to {label}'
+    return action
+
 @admin.register(JobApplication)
 class JobApplicationAdmin(admin.ModelAdmin):
     list_display = ('applicant', 'job', 'status', 'applied_at')
     list_filter = ('status', 'applied_at')
     search_fields = ('applicant__username', 'job__title', 'job__company')
+    actions = [status_action(status, label) for status, label in JobApplication.STATUS_CHOICES]
+
+@admin.register(ApplicationStatusChange)
+class ApplicationStatusChangeAdmin(admin.ModelAdmin):
+    list_display = ('application', 'from_status', 'to_status', 'changed_by', 'changed_at')
+    list_filter = ('to_status', 'changed_at')
+    search_fields = ('application__applicant__username', 'application__job__title')
+    raw_id_fields = ('application', 'changed_by')
+    list_select_related = ('application__applicant', 'application__job', 'changed_by')
+    readonly_fields = ('changed_at',)
+
+@admin.register(JobRecommendation)
+class JobRecommendationAdmin(admin.ModelAdmin):
+    list_display = ('user', 'rank', 'job', 'score', 'computed_at')
+    search_fields = ('user__username', 'job__title')
+    raw_id_fields = ('user', 'job')
+    readonly_fields = ('computed_at',)
@@ -0,0 +1,137 @@
+"""
+Applicant exports for recruiters.
+
+A large posting has thousands of applicants, so nothing here builds a whole
+file in memory. The CSV is written row by row into a StreamingHttpResponse.
+The ZIP is produced by zipfile writing into a sink that is emptied after
+every block, so the response starts at once and memory stays at one
+COPY_BLOCK however many resumes there are. Members are STORED, not
+deflated: resumes are mostly PDFs, which are already compressed, and
+skipping compression keeps the export I/O-bound. Entries use data
+descriptors, which zipfile writes itself when the output is not seekable,
+and ZIP64 so archives over 4 GB stay valid.
+
+Applications are read with .iterator() in two passes, applicants.csv
+first and then the resumes, so neither pass caches the queryset.
+"""
+import csv
+import io
+import posixpath
+import zipfile
+from django.utils.text import slugify
+from .pipeline import applicants
+
+COPY_BLOCK = 64 * 1024
+ITERATOR_CHUNK = 500
+
+CSV_HEADER = [
+    'application_id', 'name', 'username', 'email', 'university', 'degree', 'major',
+    'graduation_year', 'status', 'applied_at', 'resume', 'cover_letter',
+]
+
+
+def resume_filename(application):
+    """A readable, unique file name for an application's resume"""
+    applicant = application.applicant
+    name = slugify(applicant.get_full_name()) or slugify(applicant.username) or 'applicant'
+    extension = posixpath.splitext(application.resume.name)[1].lower()
+    return f'{name}-{application.pk}{extension}'
+
+
+def export_applications(job, status=None):
+    """The applications an export covers, with what the CSV needs joined"""
+    return applicants(job, status).select_related('applicant__profile__university')
+
+
+def csv_rows(applications, resume_folder=''):
+    """The CSV header, then one row per application"""
+    labels = dict(applications.model.STATUS_CHOICES)
+    yield CSV_HEADER
+    for application in applications.iterator(chunk_size=ITERATOR_CHUNK):
+        applicant = application.applicant
+        profile = getattr(applicant, 'profile', None)
+        yield [
+            application.pk,
+            applicant.get_full_name(),
+            applicant.username,
+            applicant.email,
+            profile.university.name if profile and profile.university else '',
+            profile.degree if profile else '',
+            profile.major if profile else '',
+            (profile.graduation_year or '') if profile else '',
+            labels.get(application.status, application.status),
+            application.applied_at.isoformat(),
+            resume_folder + resume_filename(application) if application.resume else '',
+            application.cover_letter,
+        ]
+
+
+class Echo:
+    """A file-like object that hands back what is written to it, for csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def csv_stream(applications):
+    writer = csv.writer(Echo())
+    for row in csv_rows(applications):
+        yield writer.writerow(row)
+
+
+class _ZipSink:
+    """An unseekable output for zipfile whose contents are taken as they arrive"""
+
+    def __init__(self):
+        self.buffer = io.BytesIO()
+
+    def write(self, data):
+        return self.buffer.write(data)
+
+    def flush(self):
+        pass
+
+    def take(self):
+        data = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return data
+
+
+def zip_stream(applications):
+    """Yield a ZIP of applicants.csv and every resume, block by block"""
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_STORED) as archive:
+        with archive.open('applicants.csv', 'w', force_zip64=True) as entry:
+            text = io.TextIOWrapper(entry, encoding='utf-8', newline='')
+            writer = csv.writer(text)
+            for row in csv_rows(applications, resume_folder='resumes/'):
+                writer.writerow(row)
+                text.flush()
+                if sink.buffer.tell() >= COPY_BLOCK:
+                    yield sink.take()
+            text.flush()
+            text.detach()
+        yield sink.take()
+
+        for application in applications.exclude(resume='').exclude(resume__isnull=True).iterator(
+            chunk_size=ITERATOR_CHUNK
+        ):
+            try:
+                source = application.resume.open('rb')
+            except FileNotFoundError:
+                continue
+            with source, archive.open(f'resumes/{resume_filename(application)}', 'w', force_zip64=True) as entry:
+                for block in iter(lambda: source.read(COPY_BLOCK), b''):
+                    entry.write(block)
+                    yield sink.take()
+            yield sink.take()
+    # Closing the archive writes the central directory
+    yield sink.take()
+
+
+def export_filename(job, extension, status=None):
+    parts = [slugify(job.title) or f'job-{job.pk}', 'applicants']
+    if status:
+        parts.append(status)
+    return f'{"-".join(parts)}.{extension}'
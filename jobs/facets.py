@@ -0,0 +1,115 @@
+"""
+Facet counts for the job board filters.
+
+All four facets are computed from one GROUP BY over the search-filtered
+active jobs. Each facet's counts honour every *other* selected filter, so
+picking "Internship" still shows how many jobs the remaining job types have.
+Results are cached per filter signature and invalidated by bumping a version
+key whenever a Job is saved or deleted (see jobs.signals).
+"""
+import hashlib
+import json
+from django.core.cache import cache
+from django.db.models import Count
+from .models import Job
+
+FACET_FIELDS = ('category', 'job_type', 'experience_level', 'location')
+FACET_CACHE_TIMEOUT = 60 * 10
+MAX_LOCATIONS = 50
+VERSION_KEY = 'jobs:facets:version'
+
+
+def get_facet_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+def bump_facet_version():
+    """Invalidate every cached facet set"""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, None)
+
+
+def _cache_key(filters):
+    signature = json.dumps({key: filters.get(key) or '' for key in ('search',) + FACET_FIELDS}, sort_keys=True)
+    digest = hashlib.sha1(signature.encode('utf-8')).hexdigest()
+    return f'jobs:facets:{get_facet_version()}:{digest}'
+
+
+def _row_matches(row, filters, skip):
+    for field in FACET_FIELDS:
+        value = filters.get(field)
+        if field == skip or not value:
+            continue
+        if field == 'category':
+            if str(row['category_id']) != str(value):
+                return False
+        elif field == 'location':
+            # The view filters location with icontains; mirror that here
+            if value.lower() not in (row['location'] or '').lower():
+                return False
+        elif row[field] != value:
+            return False
+    return True
+
+
+def _compute_facets(base_jobs, filters):
+    rows = list(
+        base_jobs.order_by()
+        .values('category_id', 'category__name', 'job_type', 'experience_level', 'location')
+        .annotate(total=Count('id'))
+    )
+
+    counts = {field: {} for field in FACET_FIELDS}
+    category_names = {}
+    for row in rows:
+        category_names[row['category_id']] = row['category__name']
+        for field in FACET_FIELDS:
+            if not _row_matches(row, filters, skip=field):
+                continue
+            value = row['category_id'] if field == 'category' else row[field]
+            if value is None:
+                continue
+            counts[field][value] = counts[field].get(value, 0) + row['total']
+
+    job_type_counts = counts['job_type']
+    experience_counts = counts['experience_level']
+    return {
+        'category': sorted(
+            ({'value': pk, 'label': category_names[pk], 'count': total} for pk, total in counts['category'].items()),
+            key=lambda option: option['label'],
+        ),
+        'job_type': [
+            {'value': value, 'label': label, 'count': job_type_counts.get(value, 0)}
+            for value, label in Job.JOB_TYPES
+        ],
+        'experience_level': [
+            {'value': value, 'label': label, 'count': experience_counts.get(value, 0)}
+            for value, label in Job.EXPERIENCE_LEVELS
+        ],
+        'location': [
+            {'value': location, 'label': location, 'count': total}
+            for location, total in sorted(counts['location'].items(), key=lambda item: (-item[1], item[0]))[:MAX_LOCATIONS]
+        ],
+    }
+
+
+def get_job_facets(base_jobs, filters):
+    """
+    Return {facet: [{'value', 'label', 'count'}, ...]} for the job board.
+
+    base_jobs must be the active, search-filtered queryset *before* any facet
+    filter is applied; filters holds the raw request values keyed by 'search'
+    and the names in FACET_FIELDS.
+    """
+    key = _cache_key(filters)
+    facets = cache.get(key)
+    if facets is None:
+        facets = _compute_facets(base_jobs, filters)
+        cache.set(key, facets, FACET_CACHE_TIMEOUT)
+    return facets
@@ -33,3 +33,15 @@ class JobApplicationForm(forms.ModelForm):
             }),
             'resume': forms.FileInput(attrs={'class': 'form-control'})
         }
+
+class ApplicationStatusForm(forms.Form):
+    """Move a selection of one job's applications to a new status"""
+    applications = forms.ModelMultipleChoiceField(queryset=JobApplication.objects.none())
+    status = forms.ChoiceField(
+        choices=JobApplication.STATUS_CHOICES,
+        widget=forms.Select(attrs={'class': 'form-select form-select-sm'})
+    )
+
+    def __init__(self, job, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['applications'].queryset = job.applications.all()
@@ -0,0 +1,27 @@
+import time
+from django.core.management.base import BaseCommand
+from jobs.recommendations import process_queue, rebuild_index, refresh_recommendations
+
+
+class Command(BaseCommand):
+    help = (
+        'Fan queued jobs out to the users they suit and recompute queued users\' job '
+        'recommendations. Run it every few minutes; --full reindexes every job and '
+        'recomputes every list.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Reindex every job and rescore every user')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        log = self.stdout.write if options['verbosity'] > 1 else None
+        if options['full']:
+            indexed = rebuild_index()
+            self.stdout.write(f'Indexed {indexed} active job(s).')
+            rescored = refresh_recommendations(log=log)
+        else:
+            rescored = process_queue(log=log)
+        self.stdout.write(self.style.SUCCESS(
+            f'Rescored {rescored} user(s) in {time.monotonic() - started:.1f}s.'
+        ))
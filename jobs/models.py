@@ -51,6 +51,9 @@ class Job(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['is_active', '-created_at'], name='jobs_active_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} at {self.company}"
@@ -76,8 +79,62 @@ class JobApplication(models.Model):
 
     class Meta:
         unique_together = ('job', 'applicant')
+        indexes = [
+            # Per-status counts and the status-filtered applicant list in the recruiter pipeline
+            models.Index(fields=['job', 'status', '-applied_at'], name='jobs_app_job_status_idx'),
+        ]
 
     def __str__(self):
         return f"{self.applicant.username} -> {self.job.title}"
-    
-    
+
+class ApplicationStatusChange(models.Model):
+    """Audit trail of JobApplication status transitions"""
+    application = models.ForeignKey(JobApplication, on_delete=models.CASCADE, related_name='status_changes')
+    from_status = models.CharField(max_length=20, choices=JobApplication.STATUS_CHOICES)
+    to_status = models.CharField(max_length=20, choices=JobApplication.STATUS_CHOICES)
+    changed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.application_id}: {self.from_status} -> {self.to_status}"
+
+class JobTerm(models.Model):
+    """TF-IDF weight of one term in an active job's text, maintained by jobs.recommendations"""
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='terms')
+    term = models.CharField(max_length=50)
+    weight = models.FloatField()
+
+    class Meta:
+        unique_together = ('job', 'term')
+        indexes = [
+            models.Index(fields=['term', 'job'], name='jobs_term_job_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.term} in {self.job_id} ({self.weight:.3f})"
+
+class JobRecommendation(models.Model):
+    """Precomputed job recommendation for a user"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='job_recommendations')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ('user', 'job')
+        indexes = [
+            models.Index(fields=['user', 'rank'], name='jobs_rec_user_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.job} for {self.user.username} ({self.score:.3f})"
+
+class PendingRecommendationRefresh(models.Model):
+    """A new or edited job to fan out to users, or a user whose list needs recomputing"""
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    requested_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Refresh {'job ' + str(self.job_id) if self.job_id else 'user ' + str(self.user_id)}"
@@ -0,0 +1,70 @@
+"""
+Applicant emails and notifications for application status changes.
+
+A bulk transition can touch hundreds of applications at once, so nothing is
+sent per row: the transition queues one background task per NOTIFY_BATCH
+changed applications (jobs.tasks), and each batch loads its addresses and
+job titles in one query and is sent over one mail connection. Each email
+states the application's status at send time, so a later change made
+before the task runs is never reported out of order.
+
+Each applicant also gets an in-app notification. It is written already
+stamped as digested, since the email has gone out and the hourly digest
+should not repeat it.
+"""
+from django.core.mail import send_mass_mail
+from django.urls import reverse
+from django.utils import timezone
+from notifications.delivery import deliver
+from notifications.models import Notification
+from .models import JobApplication
+
+NOTIFY_BATCH = 100
+
+SUBJECT = 'Update on your application for {title}'
+BODY = (
+    'Hi {name},\n\n'
+    'Your application for {title} at {company} is now: {status}.\n\n'
+    'You can follow all of your applications under My Applications on GRADLINK.\n'
+)
+IN_APP_MESSAGE = 'Your application for {title} at {company} is now: {status}'
+
+
+def _batch(application_ids):
+    """(emails, unsaved Notifications) for one batch of applications"""
+    labels = dict(JobApplication.STATUS_CHOICES)
+    rows = JobApplication.objects.filter(pk__in=application_ids).values_list(
+        'status', 'applicant_id', 'applicant__email', 'applicant__first_name', 'applicant__username',
+        'job__title', 'job__company', 'job__posted_by_id',
+    )
+    url = reverse('jobs:my_applications')
+    now = timezone.now()
+    emails = []
+    in_app = []
+    for status, applicant_id, email, first_name, username, title, company, poster_id in rows:
+        label = labels[status]
+        if email:
+            emails.append((
+                SUBJECT.format(title=title),
+                BODY.format(name=first_name or username, title=title, company=company, status=label),
+                None,
+                [email],
+            ))
+        in_app.append(Notification(
+            recipient_id=applicant_id, actor_id=poster_id, kind='application_status', url=url,
+            message=IN_APP_MESSAGE.format(title=title, company=company, status=label)[:255],
+            digested_at=now,
+        ))
+    return emails, in_app
+
+
+def notify_status_changes(application_ids):
+    """Tell every applicant in `application_ids` their current status, in batches; returns emails sent"""
+    application_ids = list(application_ids)
+    sent = 0
+    for start in range(0, len(application_ids), NOTIFY_BATCH):
+        emails, in_app = _batch(application_ids[start:start + NOTIFY_BATCH])
+        deliver(in_app)
+        if emails:
+            sent += send_mass_mail(emails, fail_silently=True)
+    return sent
@@ -0,0 +1,105 @@
+"""
+Recruiter pipeline.
+
+A poster's jobs are listed with one count per application status, taken as
+conditional COUNTs in the same grouped query that loads the jobs, so the page
+costs the same whether a job has no applicants or thousands. The funnel
+across all of a poster's jobs is a second GROUP BY over status.
+
+Applicants of one job are paged with their profile joined in. A recruiter
+(or staff, through the admin action) moves any selection of applications
+to a new status with one UPDATE ... WHERE id IN, one bulk_create of audit
+rows, and one background task per batch of applicant emails
+(jobs.notifications).
+"""
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from .models import ApplicationStatusChange, Job, JobApplication
+from .notifications import NOTIFY_BATCH
+from .tasks import send_status_notifications
+
+STATUSES = [status for status, _ in JobApplication.STATUS_CHOICES]
+# Bootstrap badge colour per status, matching my_applications.html
+STATUS_BADGES = {
+    'applied': 'primary',
+    'reviewing': 'warning',
+    'interview': 'info',
+    'accepted': 'success',
+    'rejected': 'danger',
+}
+
+
+def count_field(status):
+    return f'{status}_count'
+
+
+def with_status_counts(jobs):
+    """Annotate each job with application_count and a <status>_count per status"""
+    return jobs.annotate(
+        application_count=Count('applications'),
+        **{
+            count_field(status): Count('applications', filter=Q(applications__status=status))
+            for status in STATUSES
+        },
+    )
+
+
+def status_rows(counts):
+    """One dict per status, in pipeline order, from a {status: count} dict"""
+    return [
+        {'status': status, 'label': label, 'count': counts.get(status, 0), 'badge': STATUS_BADGES[status]}
+        for status, label in JobApplication.STATUS_CHOICES
+    ]
+
+
+def job_status_counts(job):
+    """{status: count} read back from a job annotated by with_status_counts"""
+    return {status: getattr(job, count_field(status)) for status in STATUSES}
+
+
+def poster_funnel(user):
+    """{status: count} across every job `user` has posted"""
+    return dict(
+        JobApplication.objects.filter(job__posted_by=user)
+        .order_by()
+        .values_list('status')
+        .annotate(total=Count('pk'))
+    )
+
+
+def applicants(job, status=None):
+    """A job's applications, newest first, with applicant profiles joined"""
+    applications = job.applications.select_related('applicant__profile').order_by('-applied_at', '-pk')
+    if status:
+        applications = applications.filter(status=status)
+    return applications
+
+
+def transition(applications, status, changed_by=None):
+    """
+    Move a JobApplication queryset to `status` and return how many changed.
+    Applications already at `status` are left alone and get no audit row or email.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        changing = list(applications.exclude(status=status).select_for_update().values_list('pk', 'status'))
+        if not changing:
+            return 0
+        ids = [pk for pk, _ in changing]
+        JobApplication.objects.filter(pk__in=ids).update(status=status, updated_at=now)
+        ApplicationStatusChange.objects.bulk_create([
+            ApplicationStatusChange(
+                application_id=pk, from_status=from_status, to_status=status, changed_by=changed_by, changed_at=now,
+            )
+            for pk, from_status in changing
+        ], batch_size=1000)
+        for start in range(0, len(ids), NOTIFY_BATCH):
+            send_status_notifications.enqueue(ids[start:start + NOTIFY_BATCH])
+    return len(ids)
+
+
+def posted_jobs(user):
+    return with_status_counts(
+        Job.objects.filter(posted_by=user).select_related('category').order_by('-created_at', '-pk')
+    )
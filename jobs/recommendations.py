@@ -0,0 +1,337 @@
+"""
+Job recommendations.
+
+Every active job's title, requirements and description are indexed as a
+TF-IDF vector in JobTerm (its MAX_TERMS_PER_JOB heaviest terms, L2-normalised).
+A user's profile - skills, major and interests - is turned into a query
+vector over the same terms. A job's score is the dot product of the two,
+scaled by how well the job's experience level fits the user's
+experience_years and boosted when the job is where the user lives.
+
+Scores are never computed per request. Each user's TOP_N jobs are stored in
+JobRecommendation and the dashboard reads them in one query. Keeping the
+lists current:
+
+- saving a job reindexes its terms straight away and queues it in
+  PendingRecommendationRefresh; `manage.py refresh_job_recommendations`
+  later scores it against every user and recomputes only the users whose
+  list it would enter;
+- deactivating or deleting a job removes it from every list at once and
+  queues those users to be topped up;
+- saving a profile queues that user.
+
+IDF weights are taken from the index as it stands when a job is indexed, so
+they drift slowly; `--full` reindexes every job and recomputes every list.
+"""
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+from accounts.models import UserProfile
+from core.panels import bump_user_panel
+from .models import Job, JobApplication, JobRecommendation, JobTerm, PendingRecommendationRefresh
+
+TERM_RE = re.compile(r'[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]', re.UNICODE)
+MAX_TERM_LENGTH = 50
+STOP_WORDS = frozenset('''
+    a an and are as at be by for from has have in is it its of on or our that the their this to
+    we will with you your
+'''.split())
+
+TOP_N = 20
+MAX_TERMS_PER_JOB = 40
+JOB_FIELD_WEIGHTS = {
+    'title': 3,
+    'requirements': 2,
+    'description': 1,
+}
+PROFILE_FIELD_WEIGHTS = {
+    'skills': 3,
+    'major': 2,
+    'interests': 1,
+}
+RECOMMENDED_USER_TYPES = ('student', 'alumni')
+
+# Years of experience each level is meant for; jobs outside the range score lower
+EXPERIENCE_RANGES = {
+    'entry': (0, 2),
+    'mid': (2, 6),
+    'senior': (6, 12),
+    'executive': (12, None),
+}
+LEVEL_ORDER = list(EXPERIENCE_RANGES)
+# Score multiplier per level of distance from the user's own level
+LEVEL_DISTANCE_FACTORS = (1.0, 0.6, 0.25, 0.1)
+LOCATION_BOOST = 1.25
+
+# Users rescored and written per transaction
+USER_BATCH = 500
+
+
+def tokenize(text):
+    terms = TERM_RE.findall((text or '').lower())
+    return [term[:MAX_TERM_LENGTH] for term in terms if term not in STOP_WORDS]
+
+
+def experience_level(years):
+    """The EXPERIENCE_RANGES key that `years` falls into"""
+    for level, (low, high) in EXPERIENCE_RANGES.items():
+        if years >= low and (high is None or years < high):
+            return level
+    return 'entry'
+
+
+def level_fit(years, level):
+    distance = abs(LEVEL_ORDER.index(experience_level(years or 0)) - LEVEL_ORDER.index(level))
+    return LEVEL_DISTANCE_FACTORS[min(distance, len(LEVEL_DISTANCE_FACTORS) - 1)]
+
+
+def _idf(document_frequency, total):
+    return math.log((total + 1) / (document_frequency + 1)) + 1
+
+
+def job_term_counts(job):
+    """Field-weighted term frequencies for a job's text"""
+    counts = Counter()
+    for field, weight in JOB_FIELD_WEIGHTS.items():
+        for term in tokenize(getattr(job, field)):
+            counts[term] += weight
+    return counts
+
+
+def _job_vector(counts, frequencies, total):
+    vector = {
+        term: (1 + math.log(count)) * _idf(frequencies.get(term, 0), total)
+        for term, count in counts.items()
+    }
+    vector = dict(heapq.nlargest(MAX_TERMS_PER_JOB, vector.items(), key=lambda item: (item[1], item[0])))
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    return {term: weight / norm for term, weight in vector.items()} if norm else {}
+
+
+def _replace_terms(job_id, vector):
+    JobTerm.objects.filter(job_id=job_id).delete()
+    JobTerm.objects.bulk_create([JobTerm(job_id=job_id, term=term, weight=weight) for term, weight in vector.items()])
+
+
+def _drop_job(job_id):
+    """Take a job out of the index and every list, and queue those users to be topped up"""
+    users = list(JobRecommendation.objects.filter(job_id=job_id).values_list('user_id', flat=True))
+    JobTerm.objects.filter(job_id=job_id).delete()
+    JobRecommendation.objects.filter(job_id=job_id).delete()
+    queue_users(users)
+    bump_user_panel(*users)
+
+
+def index_job(job):
+    """Bring one job's index entry in line with the job and queue it for fan-out"""
+    if not job.is_active:
+        _drop_job(job.pk)
+        return
+    counts = job_term_counts(job)
+    frequencies = dict(
+        JobTerm.objects.filter(term__in=list(counts), job__is_active=True)
+        .exclude(job=job)
+        .order_by()
+        .values_list('term')
+        .annotate(jobs=Count('job_id'))
+    )
+    total = Job.objects.filter(is_active=True).count()
+    with transaction.atomic():
+        _replace_terms(job.pk, _job_vector(counts, frequencies, total))
+        PendingRecommendationRefresh.objects.create(job=job)
+
+
+def job_deleted(job):
+    """Queue the users whose list a deleted job was in; the rows themselves cascade"""
+    users = list(JobRecommendation.objects.filter(job=job).values_list('user_id', flat=True))
+    queue_users(users)
+    bump_user_panel(*users)
+
+
+def rebuild_index():
+    """Reindex every active job, with IDF taken over the whole active set"""
+    counts = {job.pk: job_term_counts(job) for job in Job.objects.filter(is_active=True).only(*JOB_FIELD_WEIGHTS)}
+    frequencies = Counter(term for job_counts in counts.values() for term in job_counts)
+    with transaction.atomic():
+        JobTerm.objects.all().delete()
+        rows = []
+        for job_id, job_counts in counts.items():
+            rows.extend(
+                JobTerm(job_id=job_id, term=term, weight=weight)
+                for term, weight in _job_vector(job_counts, frequencies, len(counts)).items()
+            )
+        JobTerm.objects.bulk_create(rows, batch_size=1000)
+    return len(counts)
+
+
+class JobIndex:
+    """Posting lists (term -> jobs) over indexed jobs, for scoring a profile against all of them"""
+
+    def __init__(self, jobs):
+        self.postings = defaultdict(list)
+        self.jobs = {}
+        for job_id, level, location, posted_by_id in jobs.values_list('pk', 'experience_level', 'location', 'posted_by_id'):
+            self.jobs[job_id] = (level, set(tokenize(location)), posted_by_id)
+        terms = JobTerm.objects.filter(job__in=jobs).values_list('term', 'job_id', 'weight')
+        for term, job_id, weight in terms.iterator():
+            if job_id in self.jobs:
+                self.postings[term].append((job_id, weight))
+
+    def scores(self, profile):
+        """{job id: score} for every job sharing a term with the profile"""
+        vector, years, location, user_id = profile
+        scores = defaultdict(float)
+        for term, weight in vector.items():
+            for job_id, job_weight in self.postings.get(term, ()):
+                scores[job_id] += weight * job_weight
+        for job_id in list(scores):
+            level, job_location, posted_by_id = self.jobs[job_id]
+            if posted_by_id == user_id:
+                del scores[job_id]
+                continue
+            scores[job_id] *= level_fit(years, level)
+            if location & job_location:
+                scores[job_id] *= LOCATION_BOOST
+        return scores
+
+
+def recommended_users():
+    return UserProfile.objects.filter(user__user_type__in=RECOMMENDED_USER_TYPES, user__is_active=True)
+
+
+def load_profiles(profiles, idf):
+    """{user id: (query vector, experience years, location terms, user id)}"""
+    loaded = {}
+    rows = profiles.values_list('user_id', 'skills', 'major', 'interests', 'experience_years', 'user__location')
+    for user_id, skills, major, interests, years, location in rows.iterator():
+        counts = Counter()
+        for field, text in (('skills', skills), ('major', major), ('interests', interests)):
+            for term in tokenize(text):
+                if term in idf:
+                    counts[term] += PROFILE_FIELD_WEIGHTS[field]
+        vector = {term: count * idf[term] for term, count in counts.items()}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        if norm:
+            vector = {term: weight / norm for term, weight in vector.items()}
+        loaded[user_id] = (vector, years, set(tokenize(location)), user_id)
+    return loaded
+
+
+def _index_idf(index):
+    total = len(index.jobs)
+    return {term: _idf(len(postings), total) for term, postings in index.postings.items()}
+
+
+def _chunks(ids, size=USER_BATCH):
+    ids = list(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def _store(ranked):
+    applied = set(
+        JobApplication.objects.filter(applicant_id__in=list(ranked)).values_list('applicant_id', 'job_id')
+    )
+    now = timezone.now()
+    with transaction.atomic():
+        JobRecommendation.objects.filter(user_id__in=list(ranked)).delete()
+        JobRecommendation.objects.bulk_create([
+            JobRecommendation(user_id=user_id, job_id=job_id, score=score, rank=rank, computed_at=now)
+            for user_id, scores in ranked.items()
+            for rank, (job_id, score) in enumerate(
+                [(job_id, score) for job_id, score in scores if (user_id, job_id) not in applied][:TOP_N], start=1
+            )
+        ], batch_size=1000)
+    bump_user_panel(*ranked)
+
+
+def _top(scores):
+    # Over-fetch so jobs the user already applied to can be dropped in _store
+    return heapq.nsmallest(TOP_N * 2, ((job_id, score) for job_id, score in scores.items() if score > 0),
+                           key=lambda item: (-item[1], item[0]))
+
+
+def _fanned_out_users(job_ids, idf):
+    """Users whose stored list holds one of `job_ids` or that one would now enter"""
+    # Holders are rescored whatever the edit did: the job may have dropped or fallen out of their list
+    affected = set(JobRecommendation.objects.filter(job_id__in=job_ids).values_list('user_id', flat=True))
+    new_jobs = JobIndex(Job.objects.filter(pk__in=job_ids, is_active=True))
+    if not new_jobs.jobs:
+        return affected
+    user_ids = recommended_users().order_by('user_id').values_list('user_id', flat=True)
+    for chunk in _chunks(user_ids):
+        profiles = load_profiles(recommended_users().filter(user_id__in=chunk), idf)
+        floors = {
+            row['user_id']: (row['listed'], row['floor'])
+            for row in JobRecommendation.objects.filter(user_id__in=chunk).order_by()
+            .values('user_id').annotate(listed=Count('pk'), floor=Min('score'))
+        }
+        for user_id, profile in profiles.items():
+            best = max(new_jobs.scores(profile).values(), default=0)
+            listed, floor = floors.get(user_id, (0, 0))
+            if best > 0 and (listed < TOP_N or best > floor):
+                affected.add(user_id)
+    return affected
+
+
+def refresh_recommendations(user_ids=None, job_ids=(), log=None):
+    """
+    Recompute stored recommendations and return how many users were rescored.
+    With user_ids=None every user is rebuilt; otherwise `user_ids` plus the
+    users who list a job in `job_ids` or whom it would now reach.
+    """
+    index = JobIndex(Job.objects.filter(is_active=True))
+    idf = _index_idf(index)
+
+    current_users = recommended_users().values('user_id')
+    if user_ids is None:
+        JobRecommendation.objects.exclude(user_id__in=current_users).delete()
+        affected = list(current_users.order_by('user_id').values_list('user_id', flat=True))
+    else:
+        affected = set(user_ids)
+        if job_ids:
+            affected |= _fanned_out_users(job_ids, idf)
+        affected = sorted(affected)
+
+    rescored = 0
+    for chunk in _chunks(affected):
+        # Users who no longer get recommendations keep no list
+        JobRecommendation.objects.filter(user_id__in=chunk).exclude(user_id__in=current_users).delete()
+        profiles = load_profiles(recommended_users().filter(user_id__in=chunk), idf)
+        _store({user_id: _top(index.scores(profile)) for user_id, profile in profiles.items()})
+        rescored += len(profiles)
+        if log:
+            log(f'{rescored} user(s) rescored')
+    return rescored
+
+
+def queue_users(user_ids):
+    PendingRecommendationRefresh.objects.bulk_create(
+        [PendingRecommendationRefresh(user_id=user_id) for user_id in set(user_ids)], batch_size=1000,
+    )
+
+
+def process_queue(log=None):
+    """Fan out queued jobs and recompute queued users"""
+    queued = list(PendingRecommendationRefresh.objects.values_list('pk', 'job_id', 'user_id'))
+    if not queued:
+        return 0
+    job_ids = {job_id for _, job_id, _ in queued if job_id}
+    user_ids = {user_id for _, _, user_id in queued if user_id}
+    rescored = refresh_recommendations(user_ids, job_ids, log=log)
+    # Rows queued while this ran have higher ids and wait for the next pass
+    PendingRecommendationRefresh.objects.filter(pk__lte=max(pk for pk, _, _ in queued)).delete()
+    return rescored
+
+
+def recommended_jobs(user):
+    """A user's stored recommendations, best first, with each job and its category joined"""
+    return (
+        JobRecommendation.objects.filter(user=user, job__is_active=True)
+        .select_related('job__category')
+        .order_by('rank')
+    )
@@ -0,0 +1,34 @@
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from accounts.models import UserProfile
+from core.panels import bump_user_panel
+from .facets import bump_facet_version
+from .models import Job, JobApplication, JobRecommendation
+from .recommendations import index_job, job_deleted, queue_users
+from .tasks import schedule_recommendation_refresh
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_job_facets(sender, **kwargs):
+    bump_facet_version()
+
+@receiver(post_save, sender=Job)
+def reindex_job(sender, instance, **kwargs):
+    index_job(instance)
+    schedule_recommendation_refresh()
+
+@receiver(pre_delete, sender=Job)
+def drop_job_recommendations(sender, instance, **kwargs):
+    job_deleted(instance)
+    schedule_recommendation_refresh()
+
+@receiver(post_save, sender=UserProfile)
+def queue_recommendation_refresh(sender, instance, **kwargs):
+    queue_users([instance.user_id])
+    schedule_recommendation_refresh()
+
+@receiver(post_save, sender=JobApplication)
+def drop_applied_recommendation(sender, instance, created, **kwargs):
+    # Jobs the user has applied to are never recommended back to them
+    if created and JobRecommendation.objects.filter(user_id=instance.applicant_id, job_id=instance.job_id).delete()[0]:
+        bump_user_panel(instance.applicant_id)
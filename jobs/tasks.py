@@ -0,0 +1,53 @@
+from datetime import timedelta
+from django.core.mail import send_mail
+from core.taskqueue import debounce_key, task
+from .models import JobApplication
+from .notifications import notify_status_changes
+from .recommendations import process_queue
+
+# Queued recommendation refreshes are drained at most once per window
+REFRESH_WINDOW = timedelta(minutes=2)
+
+NEW_APPLICATION_SUBJECT = 'New application for {title}'
+NEW_APPLICATION_BODY = (
+    'Hi {name},\n\n'
+    '{applicant} applied for {title} at {company}. Review your applicants under '
+    'My Posted Jobs on GRADLINK.\n'
+)
+
+@task()
+def send_status_notifications(application_ids):
+    """Email one batch of applicants about their application's new status"""
+    notify_status_changes(application_ids)
+
+@task()
+def send_new_application_email(application_id):
+    """Tell a job's poster that someone applied"""
+    application = (
+        JobApplication.objects.select_related('job__posted_by', 'applicant')
+        .filter(pk=application_id).exclude(job__posted_by__email='').first()
+    )
+    if application is None:
+        return
+    poster = application.job.posted_by
+    send_mail(
+        NEW_APPLICATION_SUBJECT.format(title=application.job.title),
+        NEW_APPLICATION_BODY.format(
+            name=poster.first_name or poster.username,
+            applicant=application.applicant.get_full_name() or application.applicant.username,
+            title=application.job.title,
+            company=application.job.company,
+        ),
+        None,
+        [poster.email],
+    )
+
+@task()
+def refresh_recommendations():
+    """Apply queued job and profile changes to the stored recommendations"""
+    process_queue()
+
+def schedule_recommendation_refresh():
+    refresh_recommendations.enqueue(
+        idempotency_key=debounce_key(refresh_recommendations.name, REFRESH_WINDOW), delay=REFRESH_WINDOW,
+    )
@@ -10,4 +10,8 @@ urlpatterns = [
     path('post/', views.post_job, name='post_job'),
     path('my-applications/', views.my_applications, name='my_applications'),
     path('my-posted-jobs/', views.my_posted_jobs, name='my_posted_jobs'),
+    path('<int:job_id>/applicants/', views.job_pipeline, name='job_pipeline'),
+    path('<int:job_id>/applicants/resumes.zip', views.export_resumes, name='export_resumes'),
+    path('<int:job_id>/applicants/applicants.csv', views.export_applicants_csv, name='export_applicants_csv'),
+    path('applications/<int:application_id>/resume/', views.download_resume, name='download_resume'),
 ]
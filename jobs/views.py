@@ -1,10 +1,16 @@
 from django.shortcuts import render, get_object_or_404, redirect
+from django.http import Http404, StreamingHttpResponse
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.db.models import Q
 from django.core.paginator import Paginator
-from .models import Job, JobCategory, JobApplication
-from .forms import JobForm, JobApplicationForm
+from core.downloads import file_response
+from core.pagination import CursorPaginator, JOB_ORDERING, wants_cursor
+from .models import Job, JobApplication
+from .forms import JobForm, JobApplicationForm, ApplicationStatusForm
+from .facets import get_job_facets
+from . import exports, pipeline
+from .tasks import send_new_application_email
 
 def job_list_view(request):
     """Job board with search and filtering"""
@@ -20,6 +26,9 @@ def job_list_view(request):
             Q(description__icontains=search_query)
         )
     
+    # Facet counts are taken before the facet filters below narrow the set
+    base_jobs = jobs
+    
     # Filter by category
     category_id = request.GET.get('category')
     if category_id:
@@ -41,23 +50,29 @@ def job_list_view(request):
         jobs = jobs.filter(location__icontains=location)
     
     # Pagination
-    paginator = Paginator(jobs, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-    
-    # Get filter options
-    categories = JobCategory.objects.all().order_by('name')
-    job_types = Job.JOB_TYPES
-    experience_levels = Job.EXPERIENCE_LEVELS
-    locations = Job.objects.values_list('location', flat=True).distinct().order_by('location')
+    if wants_cursor(request):
+        page_obj = CursorPaginator(jobs, JOB_ORDERING, 10).page(request.GET.get('cursor'), request.GET)
+    else:
+        paginator = Paginator(jobs, 10)
+        page_number = request.GET.get('page')
+        page_obj = paginator.get_page(page_number)
+    
+    # Get filter options with per-option counts
+    facets = get_job_facets(base_jobs, {
+        'search': search_query,
+        'category': category_id,
+        'job_type': job_type,
+        'experience_level': experience_level,
+        'location': location,
+    })
     
     context = {
         'page_obj': page_obj,
         'search_query': search_query,
-        'categories': categories,
-        'job_types': job_types,
-        'experience_levels': experience_levels,
-        'locations': locations,
+        'categories': facets['category'],
+        'job_types': facets['job_type'],
+        'experience_levels': facets['experience_level'],
+        'locations': facets['location'],
         'selected_category': category_id,
         'selected_job_type': job_type,
         'selected_experience_level': experience_level,
@@ -97,6 +112,7 @@ def apply_for_job(request, job_id):
             application.job = job
             application.applicant = request.user
             application.save()
+            send_new_application_email.enqueue(application.pk)
             messages.success(request, 'Your application has been submitted successfully!')
             return redirect('jobs:job_detail', job_id=job.id)
     else:
@@ -141,10 +157,95 @@ def my_applications(request):
 
 @login_required
 def my_posted_jobs(request):
-    """View jobs posted by user"""
-    jobs = Job.objects.filter(posted_by=request.user).order_by('-created_at')
+    """Recruiter pipeline: the user's posted jobs with per-status application counts"""
+    jobs = pipeline.posted_jobs(request.user)
+    
+    paginator = Paginator(jobs, 20)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    for job in page_obj:
+        job.pipeline = pipeline.status_rows(pipeline.job_status_counts(job))
     
     context = {
-        'jobs': jobs,
+        'page_obj': page_obj,
+        'jobs': page_obj,
+        'funnel': pipeline.status_rows(pipeline.poster_funnel(request.user)),
     }
     return render(request, 'jobs/my_posted_jobs.html', context)
+
+@login_required
+def job_pipeline(request, job_id):
+    """One posted job's applicants, filterable by status, with bulk status changes"""
+    job = get_object_or_404(pipeline.with_status_counts(Job.objects.all()), id=job_id, posted_by=request.user)
+    status = request.GET.get('status', '')
+    if status not in pipeline.STATUSES:
+        status = ''
+    
+    if request.method == 'POST':
+        form = ApplicationStatusForm(job, request.POST)
+        if form.is_valid():
+            new_status = form.cleaned_data['status']
+            changed = pipeline.transition(form.cleaned_data['applications'], new_status, request.user)
+            label = dict(JobApplication.STATUS_CHOICES)[new_status]
+            messages.success(request, f'Moved {changed} application{"s" if changed != 1 else ""} to {label}.')
+        else:
+            messages.error(request, 'Select at least one applicant and a status.')
+        return redirect(request.get_full_path())
+    
+    paginator = Paginator(pipeline.applicants(job, status), 25)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    
+    context = {
+        'job': job,
+        'page_obj': page_obj,
+        'funnel': pipeline.status_rows(pipeline.job_status_counts(job)),
+        'selected_status': status,
+        'status_choices': JobApplication.STATUS_CHOICES,
+    }
+    return render(request, 'jobs/job_pipeline.html', context)
+
+@login_required
+def download_resume(request, application_id):
+    """Stream one application's resume to the job's poster or the applicant, with range support"""
+    application = get_object_or_404(
+        JobApplication.objects.select_related('applicant', 'job'),
+        Q(job__posted_by=request.user) | Q(applicant=request.user),
+        id=application_id,
+    )
+    if not application.resume:
+        raise Http404('This application has no resume.')
+    try:
+        return file_response(request, application.resume, exports.resume_filename(application))
+    except FileNotFoundError:
+        raise Http404('The resume file is missing.')
+
+def _export_status(request):
+    status = request.GET.get('status', '')
+    return status if status in pipeline.STATUSES else ''
+
+@login_required
+def export_resumes(request, job_id):
+    """A ZIP of applicants.csv and every resume for one posted job, streamed as it is built"""
+    job = get_object_or_404(Job, id=job_id, posted_by=request.user)
+    status = _export_status(request)
+    response = StreamingHttpResponse(
+        exports.zip_stream(exports.export_applications(job, status)), content_type='application/zip',
+    )
+    response['Content-Disposition'] = f'attachment; filename="{exports.export_filename(job, "zip", status)}"'
+    response['Cache-Control'] = 'no-store'
+    # Let nginx pass blocks through as they are produced instead of buffering the export
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+@login_required
+def export_applicants_csv(request, job_id):
+    """One posted job's applicants as CSV, streamed row by row"""
+    job = get_object_or_404(Job, id=job_id, posted_by=request.user)
+    status = _export_status(request)
+    response = StreamingHttpResponse(
+        exports.csv_stream(exports.export_applications(job, status)), content_type='text/csv; charset=utf-8',
+    )
+    response['Content-Disposition'] = f'attachment; filename="{exports.export_filename(job, "csv", status)}"'
+    response['Cache-Control'] = 'no-store'
+    # Let nginx pass blocks through as they are produced instead of buffering the export
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,19 @@
+from django.contrib import admin
+from .models import Notification, NotificationCounter
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ('recipient', 'kind', 'message', 'is_read', 'created_at', 'digested_at')
+    list_filter = ('kind', 'is_read', 'created_at')
+    search_fields = ('recipient__username', 'message')
+    raw_id_fields = ('recipient', 'actor')
+    list_select_related = ('recipient',)
+    readonly_fields = ('created_at', 'digested_at')
+
+@admin.register(NotificationCounter)
+class NotificationCounterAdmin(admin.ModelAdmin):
+    list_display = ('user', 'unread_count')
+    search_fields = ('user__username',)
+    raw_id_fields = ('user',)
+    list_select_related = ('user',)
+    readonly_fields = ('unread_count',)
@@ -0,0 +1,106 @@
+"""
+Writing notifications and keeping unread counts.
+
+Notifications are fanned out on write: a change that concerns many users
+(an edited event, a batch of application updates) becomes one bulk_create
+of Notification rows per DELIVERY_BATCH recipients, and each recipient's
+NotificationCounter is bumped in the same transaction with UPDATE ... SET
+unread_count = unread_count + n, one statement per distinct n. Reading is
+then cheap: the navbar badge is a cache hit, or on a miss one primary-key
+lookup of the counter row. Cached counts are dropped whenever the counter
+changes rather than updated in place, and expire after UNREAD_CACHE_TIMEOUT,
+so a count cached by a read racing a write is wrong for a minute at most.
+`manage.py recount_notifications` repairs counter drift.
+
+Large fan-outs (event attendees) run in the background task queue; small
+ones, like a single connection request, are written inline.
+"""
+from collections import Counter, defaultdict
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from core.counters import decrement
+from .models import Notification, NotificationCounter
+
+DELIVERY_BATCH = 500
+UNREAD_CACHE_TIMEOUT = 60
+
+
+def _unread_key(user_id):
+    return f'notifications:unread:{user_id}'
+
+
+def forget_counts(user_ids):
+    """Drop cached unread counts so the next read goes to the counter rows"""
+    cache.delete_many([_unread_key(user_id) for user_id in user_ids])
+
+
+def deliver(notifications):
+    """Save unsaved Notification objects in bulk and bump their recipients' unread counts"""
+    notifications = list(notifications)
+    for start in range(0, len(notifications), DELIVERY_BATCH):
+        batch = notifications[start:start + DELIVERY_BATCH]
+        per_recipient = Counter(notification.recipient_id for notification in batch)
+        by_amount = defaultdict(list)
+        for user_id, amount in per_recipient.items():
+            by_amount[amount].append(user_id)
+        with transaction.atomic():
+            Notification.objects.bulk_create(batch)
+            NotificationCounter.objects.bulk_create(
+                [NotificationCounter(user_id=user_id) for user_id in per_recipient], ignore_conflicts=True,
+            )
+            for amount, user_ids in by_amount.items():
+                NotificationCounter.objects.filter(user_id__in=user_ids).update(
+                    unread_count=F('unread_count') + amount
+                )
+        transaction.on_commit(lambda user_ids=list(per_recipient): forget_counts(user_ids))
+    return len(notifications)
+
+
+def notify_many(recipient_ids, kind, message, url='', actor_id=None):
+    """Send the same notification to every recipient except the actor; returns how many were written"""
+    recipients = {user_id for user_id in recipient_ids if user_id and user_id != actor_id}
+    return deliver(
+        Notification(recipient_id=user_id, actor_id=actor_id, kind=kind, message=message[:255], url=url)
+        for user_id in sorted(recipients)
+    )
+
+
+def notify(recipient_id, kind, message, url='', actor_id=None):
+    return notify_many([recipient_id], kind, message, url, actor_id)
+
+
+def unread_count(user_id):
+    """The user's unread notification count: a cache hit, or one primary-key lookup"""
+    key = _unread_key(user_id)
+    count = cache.get(key)
+    if count is None:
+        count = (
+            NotificationCounter.objects.filter(user_id=user_id).values_list('unread_count', flat=True).first() or 0
+        )
+        cache.set(key, count, UNREAD_CACHE_TIMEOUT)
+    return count
+
+
+def recent(user):
+    """The user's notifications, newest first"""
+    return Notification.objects.filter(recipient=user).order_by('-created_at', '-pk')
+
+
+def mark_read(user, notification_ids=None):
+    """
+    Mark the user's unread notifications (only `notification_ids` when given)
+    as read and take them off the counter. Returns the number marked.
+    """
+    unread = Notification.objects.filter(recipient=user, is_read=False)
+    if notification_ids is not None:
+        unread = unread.filter(pk__in=notification_ids)
+    with transaction.atomic():
+        # Lock the counter so notifications arriving mid-way are not zeroed away
+        list(NotificationCounter.objects.filter(user=user).select_for_update().values_list('pk'))
+        marked = unread.update(is_read=True)
+        if marked:
+            NotificationCounter.objects.filter(user=user).update(unread_count=decrement('unread_count', marked))
+    if marked:
+        transaction.on_commit(lambda: forget_counts([user.pk]))
+    return marked
@@ -0,0 +1,77 @@
+"""
+Email digests of unread notifications.
+
+Nobody gets one email per notification. A notification still unread
+DIGEST_DELAY after it was written goes into the recipient's next digest: one
+email listing everything unread since their previous digest. Digests are
+built DIGEST_BATCH recipients at a time; one query loads a batch's
+notifications with the recipients' addresses, one mail connection sends
+them, and one UPDATE stamps them as digested.
+
+notifications.tasks schedules a run whenever notifications are written,
+coalesced so at most one is pending per DIGEST_DELAY;
+`manage.py send_notification_digests` runs one on demand.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from django.core.mail import send_mass_mail
+from django.utils import timezone
+from .models import Notification
+
+DIGEST_DELAY = timedelta(hours=1)
+DIGEST_BATCH = 200
+MAX_ITEMS = 20
+
+SUBJECT = 'You have {count} new notification{plural} on GRADLINK'
+
+
+def pending(cutoff):
+    """Unread notifications written before `cutoff` that no digest has carried yet"""
+    return Notification.objects.filter(is_read=False, digested_at__isnull=True, created_at__lte=cutoff)
+
+
+def _body(name, messages, total):
+    lines = [f'Hi {name},', '', 'Here is what happened while you were away:', '']
+    lines.extend(f'- {message}' for message in messages)
+    if total > len(messages):
+        lines.append(f'- ...and {total - len(messages)} more')
+    lines.extend(['', 'See everything under Notifications on GRADLINK.'])
+    return '\n'.join(lines) + '\n'
+
+
+def send_digests(log=None):
+    """Send every due digest and return how many emails went out"""
+    now = timezone.now()
+    cutoff = now - DIGEST_DELAY
+    recipients = list(pending(cutoff).order_by().values_list('recipient_id', flat=True).distinct())
+    sent = 0
+    for start in range(0, len(recipients), DIGEST_BATCH):
+        chunk = recipients[start:start + DIGEST_BATCH]
+        rows = (
+            pending(cutoff).filter(recipient_id__in=chunk).exclude(recipient__email='')
+            .order_by('recipient_id', '-created_at')
+            .values_list('recipient_id', 'recipient__email', 'recipient__first_name', 'recipient__username', 'message')
+        )
+        digests = defaultdict(lambda: {'messages': [], 'total': 0})
+        for user_id, email, first_name, username, message in rows:
+            digest = digests[user_id]
+            digest.update(email=email, name=first_name or username)
+            digest['total'] += 1
+            if len(digest['messages']) < MAX_ITEMS:
+                digest['messages'].append(message)
+        emails = [
+            (
+                SUBJECT.format(count=digest['total'], plural='s' if digest['total'] != 1 else ''),
+                _body(digest['name'], digest['messages'], digest['total']),
+                None,
+                [digest['email']],
+            )
+            for digest in digests.values()
+        ]
+        if emails:
+            sent += send_mass_mail(emails, fail_silently=True)
+        # Recipients without an address are stamped too, so they are not looked at again
+        pending(cutoff).filter(recipient_id__in=chunk).update(digested_at=now)
+        if log:
+            log(f'{min(start + DIGEST_BATCH, len(recipients))}/{len(recipients)} recipient(s) processed')
+    return sent
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from accounts.models import User
+from notifications.delivery import forget_counts
+from notifications.models import Notification, NotificationCounter
+
+
+def _unread_subquery(user_ref):
+    counts = (
+        Notification.objects.filter(recipient=user_ref, is_read=False)
+        .order_by()
+        .values('recipient')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+class Command(BaseCommand):
+    help = 'Reconcile per-user unread notification counters with the notifications themselves'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many counters have drifted',
+        )
+
+    def handle(self, *args, **options):
+        # Users with unread notifications but no counter row yet
+        missing = User.objects.filter(notifications__is_read=False, notification_counter__isnull=True).distinct()
+        drifted = (
+            NotificationCounter.objects.annotate(actual=_unread_subquery(OuterRef('user')))
+            .filter(~Q(unread_count=F('actual')))
+            .order_by()
+        )
+
+        if options['dry_run']:
+            self.stdout.write(
+                f'{drifted.count()} counter(s) have drifted, {missing.count()} user(s) have no counter.'
+            )
+            return
+
+        NotificationCounter.objects.bulk_create(
+            [NotificationCounter(user_id=user_id) for user_id in missing.values_list('pk', flat=True)],
+            ignore_conflicts=True, batch_size=1000,
+        )
+        drifted_ids = list(drifted.values_list('user_id', flat=True))
+        if drifted_ids:
+            NotificationCounter.objects.filter(user_id__in=drifted_ids).update(
+                unread_count=_unread_subquery(OuterRef('user'))
+            )
+            forget_counts(drifted_ids)
+        self.stdout.write(self.style.SUCCESS(f'Reconciled {len(drifted_ids)} notification counter(s).'))
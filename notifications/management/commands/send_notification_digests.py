@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from notifications.digest import send_digests
+
+
+class Command(BaseCommand):
+    help = (
+        'Email every user a digest of their notifications that have stayed unread '
+        'for more than an hour. The background worker does this on its own; run it '
+        'by hand to flush digests now.'
+    )
+
+    def handle(self, *args, **options):
+        log = self.stdout.write if options['verbosity'] > 1 else None
+        sent = send_digests(log=log)
+        self.stdout.write(self.style.SUCCESS(f'Sent {sent} digest(s).'))
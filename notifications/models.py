@@ -0,0 +1,44 @@
+from django.db import models
+from django.utils import timezone
+from accounts.models import User
+
+class Notification(models.Model):
+    """Something that happened that a user should know about"""
+
+    KIND_CHOICES = (
+        ('connection_request', 'Connection Request'),
+        ('connection_accepted', 'Connection Accepted'),
+        ('mentorship_request', 'Mentorship Request'),
+        ('mentorship_response', 'Mentorship Response'),
+        ('comment', 'Comment'),
+        ('application_status', 'Application Status'),
+        ('event_updated', 'Event Updated'),
+        ('event_cancelled', 'Event Cancelled'),
+    )
+
+    recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
+    actor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    message = models.CharField(max_length=255)
+    url = models.CharField(max_length=255, blank=True)
+    is_read = models.BooleanField(default=False)
+    created_at = models.DateTimeField(default=timezone.now)
+    # Set once the notification went out in an email digest (notifications.digest)
+    digested_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['recipient', '-created_at'], name='notif_recipient_created_idx'),
+            models.Index(fields=['is_read', 'digested_at', 'created_at'], name='notif_digest_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.recipient.username}: {self.message}"
+
+class NotificationCounter(models.Model):
+    """A user's unread notification count, maintained by notifications.delivery"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='notification_counter')
+    unread_count = models.PositiveIntegerField(default=0, editable=False)
+
+    def __str__(self):
+        return f"{self.user.username}: {self.unread_count} unread"
@@ -0,0 +1,110 @@
+from django.db.models.signals import pre_save, post_save, pre_delete
+from django.dispatch import receiver
+from django.urls import reverse
+from alumni.models import Connection, MentorshipRequest
+from community.models import Comment
+from events.models import Event
+from .delivery import notify
+from .tasks import notify_event_attendees, schedule_digests
+
+# Event fields whose change is worth telling attendees about
+EVENT_NOTIFY_FIELDS = {
+    'title': 'title',
+    'start_datetime': 'start time',
+    'end_datetime': 'end time',
+    'location': 'location',
+    'is_virtual': 'format',
+    'virtual_link': 'meeting link',
+}
+
+def _name(user):
+    return user.get_full_name() or user.username
+
+def _remember_previous(instance, fields):
+    """Stash the stored values of `fields` on the instance before it is saved"""
+    previous = None
+    if instance.pk:
+        previous = type(instance)._default_manager.filter(pk=instance.pk).values(*fields).first()
+    instance._previous_values = previous
+
+@receiver(pre_save, sender=Connection)
+@receiver(pre_save, sender=MentorshipRequest)
+def remember_previous_status(sender, instance, **kwargs):
+    _remember_previous(instance, ['status'])
+
+@receiver(pre_save, sender=Event)
+def remember_previous_event(sender, instance, **kwargs):
+    _remember_previous(instance, list(EVENT_NOTIFY_FIELDS) + ['is_active'])
+
+def _status_changed_to(instance, status):
+    previous = getattr(instance, '_previous_values', None)
+    return instance.status == status and previous is not None and previous['status'] != status
+
+@receiver(post_save, sender=Connection)
+def connection_notifications(sender, instance, created, **kwargs):
+    if created and instance.status == 'pending':
+        notify(instance.receiver_id, 'connection_request', f'{_name(instance.sender)} wants to connect with you',
+               reverse('alumni:my_connections'), instance.sender_id)
+    elif _status_changed_to(instance, 'accepted'):
+        notify(instance.sender_id, 'connection_accepted', f'{_name(instance.receiver)} accepted your connection request',
+               reverse('accounts:user_profile', args=[instance.receiver.username]), instance.receiver_id)
+    else:
+        return
+    schedule_digests()
+
+@receiver(post_save, sender=MentorshipRequest)
+def mentorship_notifications(sender, instance, created, **kwargs):
+    url = reverse('alumni:mentorship_requests')
+    if created:
+        notify(instance.mentor_id, 'mentorship_request',
+               f'{_name(instance.mentee)} asked you to be their mentor: {instance.subject}', url, instance.mentee_id)
+    elif _status_changed_to(instance, 'accepted') or _status_changed_to(instance, 'declined'):
+        notify(instance.mentee_id, 'mentorship_response',
+               f'{_name(instance.mentor)} {instance.status} your mentorship request', url, instance.mentor_id)
+    else:
+        return
+    schedule_digests()
+
+@receiver(post_save, sender=Comment)
+def comment_notifications(sender, instance, created, **kwargs):
+    if not created:
+        return
+    post = instance.post
+    url = reverse('community:post_detail', args=[post.pk])
+    name = _name(instance.author)
+    notify(post.author_id, 'comment', f'{name} commented on your post', url, instance.author_id)
+    if instance.parent_id:
+        parent_author_id = Comment.objects.filter(pk=instance.parent_id).values_list('author_id', flat=True).first()
+        if parent_author_id != post.author_id:
+            notify(parent_author_id, 'comment', f'{name} replied to your comment', url, instance.author_id)
+    schedule_digests()
+
+@receiver(post_save, sender=Event)
+def event_notifications(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_values', None)
+    if created or previous is None:
+        return
+    if previous['is_active'] and not instance.is_active:
+        notify_event_attendees.enqueue(
+            instance.pk, 'event_cancelled', f'"{instance.title}" has been cancelled',
+            reverse('events:event_list'), instance.organizer_id,
+        )
+        return
+    changed = [label for field, label in EVENT_NOTIFY_FIELDS.items() if previous[field] != getattr(instance, field)]
+    if changed and instance.is_active:
+        notify_event_attendees.enqueue(
+            instance.pk, 'event_updated', f'"{instance.title}" changed: {", ".join(changed)}',
+            reverse('events:event_detail', args=[instance.pk]), instance.organizer_id,
+        )
+
+@receiver(pre_delete, sender=Event)
+def event_deleted_notifications(sender, instance, **kwargs):
+    # Registrations cascade away with the event, so collect the attendees now
+    attendees = list(
+        instance.registrations.filter(status__in=('registered', 'waitlisted')).values_list('user_id', flat=True)
+    )
+    if attendees and instance.is_active:
+        notify_event_attendees.enqueue(
+            None, 'event_cancelled', f'"{instance.title}" has been cancelled',
+            reverse('events:event_list'), instance.organizer_id, recipient_ids=attendees,
+        )
@@ -0,0 +1,25 @@
+from core.taskqueue import debounce_key, task
+from events.models import EventRegistration
+from .delivery import notify_many
+from .digest import DIGEST_DELAY, send_digests
+
+@task()
+def notify_event_attendees(event_id, kind, message, url, actor_id, recipient_ids=None):
+    """Fan a notification out to an event's registered and waitlisted users"""
+    if recipient_ids is None:
+        recipient_ids = EventRegistration.objects.filter(
+            event_id=event_id, status__in=('registered', 'waitlisted')
+        ).values_list('user_id', flat=True)
+    if notify_many(recipient_ids, kind, message, url, actor_id):
+        schedule_digests()
+
+@task()
+def send_notification_digests():
+    """Email every due notification digest"""
+    send_digests()
+
+def schedule_digests():
+    # Run two delays after the window opens, so everything written in the window is due by then
+    send_notification_digests.enqueue(
+        idempotency_key=debounce_key(send_notification_digests.name, DIGEST_DELAY), delay=DIGEST_DELAY * 2,
+    )
@@ -0,0 +1,11 @@
+from django.urls import path
+from . import views
+
+app_name = 'notifications'
+
+urlpatterns = [
+    path('', views.notification_list, name='notification_list'),
+    path('unread-count/', views.unread_count_view, name='unread_count'),
+    path('<int:notification_id>/', views.open_notification, name='open_notification'),
+    path('read/', views.mark_all_read, name='mark_all_read'),
+]
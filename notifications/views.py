@@ -0,0 +1,43 @@
+from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib.auth.decorators import login_required
+from django.contrib import messages
+from django.core.paginator import Paginator
+from django.http import JsonResponse
+from django.utils.http import url_has_allowed_host_and_scheme
+from .delivery import mark_read, recent, unread_count
+from .models import Notification
+
+@login_required
+def notification_list(request):
+    """The user's notifications, newest first"""
+    paginator = Paginator(recent(request.user), 20)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    
+    context = {
+        'page_obj': page_obj,
+        'unread_count': unread_count(request.user.pk),
+    }
+    return render(request, 'notifications/notification_list.html', context)
+
+@login_required
+def unread_count_view(request):
+    """Navbar badge count (AJAX)"""
+    return JsonResponse({'unread': unread_count(request.user.pk)})
+
+@login_required
+def open_notification(request, notification_id):
+    """Mark one notification read and follow its link"""
+    notification = get_object_or_404(Notification, id=notification_id, recipient=request.user)
+    if not notification.is_read:
+        mark_read(request.user, [notification.pk])
+    if notification.url and url_has_allowed_host_and_scheme(notification.url, allowed_hosts={request.get_host()}):
+        return redirect(notification.url)
+    return redirect('notifications:notification_list')
+
+@login_required
+def mark_all_read(request):
+    """Mark every unread notification read"""
+    if request.method == 'POST':
+        marked = mark_read(request.user)
+        messages.success(request, f'Marked {marked} notification{"s" if marked != 1 else ""} as read.')
+    return redirect('notifications:notification_list')
@@ -145,12 +145,13 @@ document.addEventListener("DOMContentLoaded", () => {
     })
   })
 
-  // Infinite scroll for feeds
+  // Infinite scroll for feeds (keyset pagination via ?cursor=)
   let loading = false
-  const page = 1
 
   function loadMoreContent() {
-    if (loading) return
+    const feedContainer = document.getElementById("feedContainer")
+    const nextCursor = feedContainer && feedContainer.dataset.nextCursor
+    if (loading || !nextCursor) return
     loading = true
 
     const loadMoreBtn = document.getElementById("loadMoreBtn")
@@ -158,19 +159,42 @@ document.addEventListener("DOMContentLoaded", () => {
       loadMoreBtn.innerHTML = '<span class="spinner-border spinner-border-sm me-2"></span>Loading...'
     }
 
-    // Implement your load more logic here
-    setTimeout(() => {
-      loading = false
-      if (loadMoreBtn) {
-        loadMoreBtn.innerHTML = "Load More"
-      }
-    }, 1000)
+    const params = new URLSearchParams(window.location.search)
+    params.set("cursor", nextCursor)
+    params.delete("page")
+
+    fetch(`${window.location.pathname}?${params.toString()}`, {
+      headers: { "X-Requested-With": "XMLHttpRequest" },
+    })
+      .then((response) => response.json())
+      .then((data) => {
+        feedContainer.insertAdjacentHTML("beforeend", data.html)
+        if (data.next_cursor) {
+          feedContainer.dataset.nextCursor = data.next_cursor
+          if (loadMoreBtn) {
+            params.set("cursor", data.next_cursor)
+            loadMoreBtn.href = `?${params.toString()}`
+          }
+        } else {
+          delete feedContainer.dataset.nextCursor
+          if (loadMoreBtn) loadMoreBtn.remove()
+        }
+      })
+      .catch((error) => console.error("Error:", error))
+      .finally(() => {
+        loading = false
+        const btn = document.getElementById("loadMoreBtn")
+        if (btn) btn.innerHTML = "Load More"
+      })
   }
 
   // Load more button click handler
   const loadMoreBtn = document.getElementById("loadMoreBtn")
   if (loadMoreBtn) {
-    loadMoreBtn.addEventListener("click", loadMoreContent)
+    loadMoreBtn.addEventListener("click", (e) => {
+      e.preventDefault()
+      loadMoreContent()
+    })
   }
 
   // Auto-scroll to load more content
@@ -259,3 +283,24 @@ function debounce(func, wait) {
     timeout = setTimeout(later, wait)
   }
 }
+
+// Navbar notification badge: one cheap JSON request on load, then once a minute while the tab is visible
+function refreshNotificationBadge() {
+  const bell = document.getElementById("notification-bell")
+  const badge = document.getElementById("notification-badge")
+  if (!bell || !badge || document.hidden) return
+  fetch(bell.dataset.countUrl, { headers: { "X-Requested-With": "XMLHttpRequest" } })
+    .then((response) => (response.ok ? response.json() : null))
+    .then((data) => {
+      if (!data) return
+      badge.textContent = data.unread > 99 ? "99+" : data.unread
+      badge.classList.toggle("d-none", data.unread === 0)
+    })
+    .catch(() => {})
+}
+
+document.addEventListener("DOMContentLoaded", () => {
+  refreshNotificationBadge()
+  setInterval(refreshNotificationBadge, 60000)
+  document.addEventListener("visibilitychange", refreshNotificationBadge)
+})